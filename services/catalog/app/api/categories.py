@@ -1,17 +1,27 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
-from app.deps import get_db, get_current_username
+from app.core.etag import etag_matches, make_etag, not_modified
+from app.deps import get_async_db, get_db, get_current_username
 
 router = APIRouter()
+async_router = APIRouter()                      # lecturas con DB_ASYNC=true
 
 
 @router.get("/", response_model=List[schemas.CategoryOut])
-def list_categories(db: Session = Depends(get_db)):
-    return crud.get_categories(db)
+def list_categories(
+    request: Request, response: Response, db: Session = Depends(get_db)
+):
+    version = crud.get_version(db, "categories")
+    etag = make_etag("categories", version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return crud.category_registry.ensure(db, version).categories
 
 
 @router.post(
@@ -26,8 +36,54 @@ def create_category(
 
 
 @router.get("/{cat_id}", response_model=schemas.CategoryOut)
-def get_category(cat_id: int, db: Session = Depends(get_db)):
+def get_category(
+    cat_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    # existencia antes que el ETag: una categoría inexistente da 404, no 304
+    # (con el registro en memoria al día, resolverla no consulta la BD)
+    version = crud.get_version(db, "categories")
+    crud.category_registry.ensure(db, version)
     cat = crud.get_category(db, cat_id)
     if not cat:
         raise HTTPException(404, "Categoría no encontrada")
-    return cat
\ No newline at end of file
+    etag = make_etag("category", cat_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return cat
+
+
+# ───────── lecturas async (DB_ASYNC) ──────────────────────────────────────
+@async_router.get("/", response_model=List[schemas.CategoryOut])
+async def list_categories_async(
+    request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+):
+    version = await crud.aio.get_version(db, "categories")
+    etag = make_etag("categories", version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    snap = await db.run_sync(crud.category_registry.ensure, version)
+    return snap.categories
+
+
+@async_router.get("/{cat_id:int}", response_model=schemas.CategoryOut)
+async def get_category_async(
+    cat_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    version = await crud.aio.get_version(db, "categories")
+    await db.run_sync(crud.category_registry.ensure, version)
+    cat = await crud.aio.get_category(db, cat_id)
+    if not cat:
+        raise HTTPException(404, "Categoría no encontrada")
+    etag = make_etag("category", cat_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return cat
@@ -0,0 +1,19 @@
+"""Sondas de vida y de disponibilidad (orquestador / balanceador)."""
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.api.warmup import warmup_state
+
+router = APIRouter()
+
+
+@router.get("/live")
+def live():
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready():
+    """503 mientras dura el precalentamiento (como mucho WARMUP_DEADLINE_SECONDS)."""
+    body = {"status": "ready" if warmup_state.ready else "warming", "warmup": warmup_state.as_dict()}
+    return JSONResponse(body, status_code=200 if warmup_state.ready else 503)
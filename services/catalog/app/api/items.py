@@ -1,39 +1,297 @@
-from typing import List, Optional
+import io
+from typing import List, Literal, Optional
 from urllib.parse import urlencode
 
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     HTTPException,
     Query,
     Request,
     Response,
+    UploadFile,
     status,
 )
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
-from app.deps import get_db, get_current_username
+from app.core.cache import (
+    CachedResponse,
+    normalize_params,
+    params_digest,
+    response_cache,
+)
+from app.core.config import settings
+from app.core.serialization import dump_row, dump_rows
+from app.core.etag import etag_matches, make_etag, not_modified
+from app.deps import get_async_db, get_db, get_current_username
+from app.models.database import SessionLocal
 
 router = APIRouter()
+# lecturas sobre el motor async; main.py lo monta delante de `router` con
+# DB_ASYNC=true y sus rutas tienen prioridad sobre las síncronas
+async_router = APIRouter()
+
+_ITEM_LIST = TypeAdapter(List[schemas.ItemOut])
+
+_CURSOR_DOC = (
+    "Paginación por cursor: vacío para la primera página, después el valor "
+    "de `cursor` del enlace rel=\"next\". Ignora `skip` y no devuelve X-Total-Count."
+)
+
+
+def _out(db: Session, item) -> schemas.ItemOut:
+    """ItemOut con las categorías resueltas en memoria (sin JOIN a categories)."""
+    return schemas.ItemOut.from_item(item, crud.category_registry.resolve(db, item.category_ids))
+
+
+def _dump_items(db: Session, items) -> bytes:
+    """JSON de una lista de ítems: filas (FAST_SERIALIZATION) o entidades."""
+    if settings.FAST_SERIALIZATION:
+        return dump_rows(items)
+    return _ITEM_LIST.dump_json([_out(db, i) for i in items])
+
+
+# ───────── filtros comunes (listado / exportación) ───────────────────────
+def _item_filters(
+    name: Optional[str] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    available: Optional[bool] = None,
+    categories: Optional[List[int]] = Query(None),
+    category_match: Optional[str] = Query(None, pattern="^(any|all)$"),
+    order_by: Optional[str] = Query(None, pattern="^(price|name|id|relevance|popular)$"),
+    order_dir: Optional[str] = Query(None, pattern="^(asc|desc)$"),
+) -> dict:
+    return dict(
+        name=name,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        categories=categories,
+        # "any" es el valor por defecto: None mantiene las claves de caché
+        category_match=category_match if category_match == "all" else None,
+        order_by=order_by,
+        order_dir=order_dir,
+    )
+
 
 # ───────── helpers paginación RFC-5988 ────────────────────────────────────
-def _pagination_links(request: Request, skip: int, limit: int, total: int, **flt):
+def _pagination_links(
+    request: Request,
+    skip: int,
+    limit: int,
+    total: Optional[int],
+    next_cursor: Optional[str] = None,
+    **flt,
+):
     links: list[str] = []
-    base = request.url.remove_query_params("skip").remove_query_params("limit")
+    # relativos (RFC 8288): sin host, la misma entrada de caché vale para
+    # cualquier Host por el que llegue la petición (y para el precalentamiento)
+    base = request.url.path
 
-    def _url(new_skip: int):
+    def _url(**page):
         params = {k: v for k, v in flt.items() if v is not None}
-        params.update({"skip": new_skip, "limit": limit})
+        params.update(page, limit=limit)
         return f"<{base}?{urlencode(params, doseq=True)}>"
 
+    # modo cursor: sólo hay "next" (el cursor no permite retroceder)
+    if next_cursor:
+        links.append(f'{_url(cursor=next_cursor)}; rel="next"')
+        return ", ".join(links)
+    if total is None:
+        return ""
+
     if skip + limit < total:
-        links.append(f'{_url(skip + limit)}; rel="next"')
+        links.append(f'{_url(skip=skip + limit)}; rel="next"')
     if skip > 0:
-        links.append(f'{_url(max(skip - limit,0))}; rel="prev"')
+        links.append(f'{_url(skip=max(skip - limit, 0))}; rel="prev"')
     return ", ".join(links)
 
 
+# ───────── cuerpos compartidos por los endpoints sync y async ───────────
+# (los async los ejecutan con AsyncSession.run_sync)
+def _list_response(
+    db: Session,
+    request: Request,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    flt: dict,
+    warmup: bool = False,
+) -> Response:
+    # los listados filtrados por categoría dependen también de "categories";
+    # los ordenados por popularidad, de los volcados de contadores ("stats")
+    key = normalize_params(skip=skip, limit=limit, cursor=cursor, **flt)
+    depends_on = (("categories",) if flt["categories"] else ()) + (
+        ("stats",) if flt["order_by"] == "popular" else ()
+    )
+    # frecuencias para el precalentamiento: ni él mismo ni páginas por cursor
+    if not warmup and not cursor:
+        crud.query_log.record("items", key)
+
+    # las versiones del ETag también van en la clave de la caché: el cuerpo
+    # servido es siempre el de esas versiones, aunque otro worker escriba
+    versions = crud.get_versions(db)
+    seen = [versions.get(ns, 0) for ns in ("items", *depends_on)]
+    etag = make_etag("items", *seen, params_digest(key)[:16])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # el índice de categorías sin avisos de otros workers puede ir por detrás
+    # de `seen`: lo que devuelva no se guarda bajo esas versiones
+    cacheable = (
+        not (flt["categories"] and settings.CATEGORY_INDEX) or crud.category_index.tracks_remote
+    )
+    cache_key = response_cache.key("items", {**key, "versions": seen}, depends_on)
+    cached = response_cache.get(cache_key) if cacheable else None
+    if cached is not None:
+        return cached.to_response({"ETag": etag})
+
+    headers: dict[str, str] = {}
+    if cursor is not None:
+        try:
+            items, next_cursor = crud.get_items_after(
+                db, limit, cursor, rows=settings.FAST_SERIALIZATION, **flt
+            )
+        except ValueError as exc:
+            raise HTTPException(400, str(exc))
+        if next_cursor:
+            headers["Link"] = _pagination_links(
+                request, 0, limit, None, next_cursor=next_cursor, **flt
+            )
+    else:
+        items, total, count_method = crud.get_items(
+            db, skip, limit, rows=settings.FAST_SERIALIZATION, **flt
+        )
+        headers["X-Total-Count"] = str(total)
+        headers["X-Total-Count-Estimated"] = count_method
+        if total:
+            link = _pagination_links(request, skip, limit, total, **flt)
+            if link:
+                headers["Link"] = link
+
+    entry = CachedResponse(_dump_items(db, items), headers)
+    if cacheable:
+        response_cache.set(cache_key, entry)
+    return entry.to_response({"ETag": etag})
+
+
+def _my_items(db: Session, username: str) -> Response:
+    items = crud.get_items_by_owner(db, username, rows=settings.FAST_SERIALIZATION)
+    return Response(_dump_items(db, items), media_type="application/json")
+
+
+def _batch_response(db: Session, ids: str) -> schemas.ItemBatchOut:
+    try:
+        wanted = list(dict.fromkeys(int(x) for x in ids.split(",") if x.strip()))
+    except ValueError:
+        raise HTTPException(400, "ids debe ser una lista de enteros separados por comas")
+    if len(wanted) > settings.ITEM_BATCH_MAX:
+        raise HTTPException(400, f"Máximo {settings.ITEM_BATCH_MAX} ids por lote")
+
+    items = crud.get_items_by_ids(db, wanted)
+    found = {i.id for i in items}
+    return schemas.ItemBatchOut(
+        items=[_out(db, i) for i in items],
+        missing=[i for i in wanted if i not in found],
+    )
+
+
+def _detail_body(db: Session, item_id: int) -> Optional[bytes]:
+    if settings.FAST_SERIALIZATION:
+        row = crud.get_item_row(db, item_id)
+        return dump_row(row) if row else None
+    db_item = crud.get_item(db, item_id)
+    return _out(db, db_item).model_dump_json().encode() if db_item else None
+
+
+def _detail_response(
+    db: Session, request: Request, item_id: int, warmup: bool = False
+) -> Response:
+    # caché de ítems (LFU por worker, invalidada entre workers): un acierto
+    # no consulta la BD, ni siquiera la versión
+    hit = crud.item_cache.get(item_id)
+    if hit is not None:
+        version, body = hit
+    else:
+        token = crud.item_cache.token()
+        version = crud.get_item_version(db, item_id)
+        if version is None:
+            raise HTTPException(404, "Item no encontrado")
+        body = None
+    if not warmup:
+        crud.stats_buffer.record_view(item_id)   # también los 304: es una visita
+    etag = make_etag("item", item_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if body is not None:
+        return CachedResponse(body).to_response({"ETag": etag})
+
+    if crud.item_cache.usable:
+        body = _detail_body(db, item_id)
+        if body is None:
+            raise HTTPException(404, "Item no encontrado")
+        crud.item_cache.set(item_id, (version, body), token)
+        return CachedResponse(body).to_response({"ETag": etag})
+
+    # sin caché de ítems: la de respuestas (por proceso con CACHE_BACKEND=memory)
+    cache_key = response_cache.key("item", {"id": item_id, "version": version})
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached.to_response({"ETag": etag})
+    body = _detail_body(db, item_id)
+    if body is None:
+        raise HTTPException(404, "Item no encontrado")
+    entry = CachedResponse(body)
+    response_cache.set(cache_key, entry)
+    return entry.to_response({"ETag": etag})
+
+
+def _facets_response(
+    db: Session, request: Request, bins: int, flt: dict, warmup: bool = False
+) -> Response:
+    # el orden no cambia las facetas: fuera de la clave
+    flt = {k: v for k, v in flt.items() if k not in ("order_by", "order_dir")}
+    key = normalize_params(bins=bins, **flt)
+    depends_on = ("items", "categories")
+    if not warmup:
+        crud.query_log.record("facets", key)
+
+    versions = crud.get_versions(db)
+    seen = [versions.get(ns, 0) for ns in depends_on]
+    etag = make_etag("facets", *seen, params_digest(key)[:16])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    cache_key = response_cache.key("facets", {**key, "versions": seen}, depends_on)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached.to_response({"ETag": etag})
+
+    entry = CachedResponse(crud.get_facets(db, bins=bins, **flt).model_dump_json().encode())
+    response_cache.set(cache_key, entry)
+    return entry.to_response({"ETag": etag})
+
+
+def _similar_response(
+    db: Session, item_id: int, limit: int, same_category: bool, price_ratio: Optional[float]
+) -> Response:
+    ids = crud.get_similar(db, item_id, limit, same_category, price_ratio)
+    if ids is None:
+        raise HTTPException(404, "Item no encontrado")
+    items = crud.get_items_by_ids(db, ids, rows=settings.FAST_SERIALIZATION)
+    return Response(_dump_items(db, items), media_type="application/json")
+
+
+_SAME_CATEGORY_DOC = "Sólo ítems que comparten alguna categoría"
+_PRICE_RATIO_DOC = "Precio entre p / r y p · r (p = precio del ítem); vacío = sin filtro"
+
+
 # ───────────── crear ─────────────────────────────────────────────────────
 @router.post("/", response_model=schemas.ItemOut, status_code=status.HTTP_201_CREATED)
 def create_item(
@@ -41,55 +299,45 @@ def create_item(
     db: Session = Depends(get_db),
     username: str = Depends(get_current_username),
 ):
-    return crud.create_item(db, item_in, owner_username=username)
+    try:
+        db_item = crud.create_item(db, item_in, owner_username=username)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
+    return _out(db, db_item)
+
+
+# ───────────── importación masiva ────────────────────────────────────────
+@router.post("/import", response_model=schemas.ItemImportReport)
+def import_items(
+    file: UploadFile,
+    format: Optional[Literal["csv", "ndjson"]] = Query(
+        None, description="Por defecto se deduce de la extensión del fichero"
+    ),
+    db: Session = Depends(get_db),
+    username: str = Depends(get_current_username),
+):
+    """
+    Carga un CSV (name, description, price_per_h, image_urls, categories;
+    listas separadas por "|") o NDJSON con objetos `ItemCreate`.
+
+    Se procesa en streaming y por lotes; devuelve el informe por fila.
+    """
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    return crud.import_items(db, crud.iter_import_rows(stream, fmt), owner_username=username)
 
 
 # ───────────── listar público ────────────────────────────────────────────
 @router.get("/", response_model=List[schemas.ItemOut])
 def list_items(
     request: Request,
-    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    name: Optional[str] = None,
-    min_price: Optional[float] = Query(None, ge=0),
-    max_price: Optional[float] = Query(None, ge=0),
-    available: Optional[bool] = None,
-    categories: Optional[List[int]] = Query(None),
-    order_by: Optional[str] = Query(None, pattern="^(price|name|id)$"),
-    order_dir: Optional[str] = Query(None, pattern="^(asc|desc)$"),
+    flt: dict = Depends(_item_filters),
+    cursor: Optional[str] = Query(None, description=_CURSOR_DOC),
     db: Session = Depends(get_db),
 ):
-    items, total = crud.get_items(
-        db,
-        skip,
-        limit,
-        name=name,
-        min_price=min_price,
-        max_price=max_price,
-        available=available,
-        categories=categories,
-        order_by=order_by,
-        order_dir=order_dir,
-    )
-    response.headers["X-Total-Count"] = str(total)
-    if total:
-        link = _pagination_links(
-            request,
-            skip,
-            limit,
-            total,
-            name=name,
-            min_price=min_price,
-            max_price=max_price,
-            available=available,
-            categories=categories,
-            order_by=order_by,
-            order_dir=order_dir,
-        )
-        if link:
-            response.headers["Link"] = link
-    return items
+    return _list_response(db, request, skip, limit, cursor, flt)
 
 
 # ───────────── mis ítems ────────────────────────────────────────────────
@@ -98,7 +346,104 @@ def my_items(
     db: Session = Depends(get_db),
     username: str = Depends(get_current_username),
 ):
-    return crud.get_items_by_owner(db, username)
+    return _my_items(db, username)
+
+
+# ───────────── lote (servicio a servicio) ───────────────────────────────
+@router.get("/batch", response_model=schemas.ItemBatchOut)
+def get_items_batch(
+    ids: str = Query(..., description="IDs separados por comas, p. ej. 1,2,3"),
+    db: Session = Depends(get_db),
+):
+    """
+    Varios ítems en una sola consulta, en el orden pedido.
+
+    Los ids inexistentes se devuelven en `missing`.
+    """
+    return _batch_response(db, ids)
+
+
+# ───────────── facetas (barra de filtros) ──────────────────────────────
+@router.get("/facets", response_model=schemas.ItemFacetsOut)
+def get_item_facets(
+    request: Request,
+    bins: int = Query(10, ge=1, le=50, description="Intervalos del histograma de precios"),
+    flt: dict = Depends(_item_filters),
+    db: Session = Depends(get_db),
+):
+    """
+    Nº de ítems por categoría, disponibles / no disponibles e histograma de
+    precios para los filtros del listado, en una sola consulta.
+    """
+    return _facets_response(db, request, bins, flt)
+
+
+# ───────────── autocompletado ───────────────────────────────────────────
+# async y sin sesión: el índice está en memoria, no hace falta el threadpool
+@router.get("/suggest", response_model=List[schemas.Suggestion])
+async def suggest_items(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=settings.SUGGEST_LIMIT_MAX),
+):
+    """
+    Nombres de ítem y de categoría que empiezan (en cualquier palabra) por
+    `q`, sin distinguir mayúsculas ni tildes; los más populares primero.
+    """
+    return crud.suggest_index.suggest(q, limit)
+
+
+# ───────────── cambios en vivo (SSE) ────────────────────────────────────
+@router.get("/stream")
+async def stream_items(
+    ids: Optional[List[int]] = Query(None, description="Sólo estos ítems"),
+    categories: Optional[List[int]] = Query(None, description="Sólo ítems de estas categorías"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Server-Sent Events con los cambios de precio y disponibilidad (y altas
+    / bajas) de los ítems; con `ids` y/o `categories` sólo los que
+    coincidan con alguno.  Eventos ``item`` con el delta en JSON; ``reset``
+    si no se pueden reenviar los perdidos desde `Last-Event-ID` (hay que
+    recargar el listado).
+    """
+    if ids and len(ids) > settings.STREAM_IDS_MAX:
+        raise HTTPException(400, f"Como mucho {settings.STREAM_IDS_MAX} ids")
+    if crud.change_feed.clients >= settings.STREAM_MAX_CLIENTS:
+        raise HTTPException(503, "Demasiadas conexiones abiertas")
+    return StreamingResponse(
+        crud.change_feed.stream(last_event_id, ids, categories),
+        media_type="text/event-stream",
+        # sin buffer en nginx: cada evento sale en cuanto se escribe
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ───────────── exportación ──────────────────────────────────────────────
+_EXPORT_MEDIA = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+@router.get("/export")
+def export_items(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    flt: dict = Depends(_item_filters),
+):
+    """
+    Catálogo completo (con los filtros del listado) en NDJSON o CSV.
+
+    Se emite en streaming desde un cursor de servidor: la memoria no
+    depende del número de ítems.  El CSV se puede volver a importar.
+    """
+    # sesión propia: la de Depends(get_db) se cierra antes de que termine
+    # el streaming
+    def _chunks():
+        with SessionLocal() as db:
+            yield from crud.export_items(db, format, **flt)
+
+    return StreamingResponse(
+        _chunks(),
+        media_type=_EXPORT_MEDIA[format],
+        headers={"Content-Disposition": f'attachment; filename="items.{format}"'},
+    )
 
 
 # ───────────── actualizar ───────────────────────────────────────────────
@@ -112,7 +457,10 @@ def patch_item(
     db_item = crud.get_item(db, item_id)
     if not db_item or db_item.owner_username != username:
         raise HTTPException(404, "Item no encontrado")
-    return crud.update_item(db, db_item, item_in)
+    try:
+        return _out(db, crud.update_item(db, db_item, item_in))
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
 
 
 @router.put("/{item_id}", response_model=schemas.ItemOut)
@@ -125,24 +473,52 @@ def put_item(
     db_item = crud.get_item(db, item_id)
     if not db_item or db_item.owner_username != username:
         raise HTTPException(404, "Item no encontrado")
-    return crud.update_item(db, db_item, schemas.ItemUpdate(**item_in.model_dump()))
+    try:
+        return _out(db, crud.update_item(db, db_item, schemas.ItemUpdate(**item_in.model_dump())))
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
 
 # ───────────── obtener 1 ítem ────────────────────────────────────────────
 @router.get("/{item_id}", response_model=schemas.ItemOut)
 def get_item(
     item_id: int,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """
     Devuelve un único ítem por *ID*.
 
-    404 si no existe.
+    404 si no existe; 304 si `If-None-Match` coincide con su versión.
     """
-    db_item = crud.get_item(db, item_id)
-    if not db_item:
+    return _detail_response(db, request, item_id)
+
+
+# ───────────── interés de alquiler ───────────────────────────────────────
+@router.post("/{item_id}/interest", status_code=status.HTTP_204_NO_CONTENT)
+def register_interest(item_id: int, db: Session = Depends(get_db)):
+    """
+    El cliente abrió el formulario de alquiler del ítem.  Sólo suma en
+    memoria; cuenta para ``order_by=popular`` tras el siguiente volcado.
+    """
+    if crud.get_item_version(db, item_id) is None:
         raise HTTPException(404, "Item no encontrado")
-    return db_item
+    crud.stats_buffer.record_interest(item_id)
+
 
+# ───────────── ítems parecidos ───────────────────────────────────────────
+@router.get("/{item_id}/similar", response_model=List[schemas.ItemOut])
+def get_similar_items(
+    item_id: int,
+    limit: int = Query(8, ge=1, le=settings.SIMILAR_LIMIT_MAX),
+    same_category: bool = Query(True, description=_SAME_CATEGORY_DOC),
+    price_ratio: Optional[float] = Query(None, ge=1, description=_PRICE_RATIO_DOC),
+    db: Session = Depends(get_db),
+):
+    """
+    Ítems disponibles más parecidos por nombre, descripción y categorías
+    (coseno sobre el índice vectorial en memoria), de más a menos parecido.
+    """
+    return _similar_response(db, item_id, limit, same_category, price_ratio)
 
 
 # ───────────── eliminar ────────────────────────────────────────────────
@@ -155,4 +531,66 @@ def delete_item(
     db_item = crud.get_item(db, item_id)
     if not db_item or db_item.owner_username != username:
         raise HTTPException(404, "Item no encontrado")
-    crud.delete_item(db, db_item)
\ No newline at end of file
+    crud.delete_item(db, db_item)
+
+
+# ───────────── lecturas async (DB_ASYNC) ─────────────────────────────────
+# mismos cuerpos que las síncronas vía run_sync: la E/S de BD se espera en
+# el event loop en lugar de ocupar un hilo del threadpool
+@async_router.get("/", response_model=List[schemas.ItemOut])
+async def list_items_async(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    flt: dict = Depends(_item_filters),
+    cursor: Optional[str] = Query(None, description=_CURSOR_DOC),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(_list_response, request, skip, limit, cursor, flt)
+
+
+@async_router.get("/me", response_model=List[schemas.ItemOut])
+async def my_items_async(
+    db: AsyncSession = Depends(get_async_db),
+    username: str = Depends(get_current_username),
+):
+    return await db.run_sync(_my_items, username)
+
+
+@async_router.get("/batch", response_model=schemas.ItemBatchOut)
+async def get_items_batch_async(
+    ids: str = Query(..., description="IDs separados por comas, p. ej. 1,2,3"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(_batch_response, ids)
+
+
+@async_router.get("/facets", response_model=schemas.ItemFacetsOut)
+async def get_item_facets_async(
+    request: Request,
+    bins: int = Query(10, ge=1, le=50, description="Intervalos del histograma de precios"),
+    flt: dict = Depends(_item_filters),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(_facets_response, request, bins, flt)
+
+
+# `:int` para no tapar /export ni /import del router síncrono
+@async_router.get("/{item_id:int}", response_model=schemas.ItemOut)
+async def get_item_async(
+    item_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(_detail_response, request, item_id)
+
+
+@async_router.get("/{item_id:int}/similar", response_model=List[schemas.ItemOut])
+async def get_similar_items_async(
+    item_id: int,
+    limit: int = Query(8, ge=1, le=settings.SIMILAR_LIMIT_MAX),
+    same_category: bool = Query(True, description=_SAME_CATEGORY_DOC),
+    price_ratio: Optional[float] = Query(None, ge=1, description=_PRICE_RATIO_DOC),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(_similar_response, item_id, limit, same_category, price_ratio)
@@ -0,0 +1,21 @@
+"""Contadores internos del servicio (caché, …) para observabilidad."""
+from fastapi import APIRouter
+
+from app import crud
+from app.core.cache import count_cache, response_cache
+
+router = APIRouter()
+
+
+@router.get("/")
+def get_metrics():
+    return {
+        "response_cache": response_cache.stats(),
+        "count_cache": count_cache.stats(),
+        "item_stats": crud.stats_buffer.stats(),
+        "query_log": crud.query_log.stats(),
+        "category_index": crud.category_index.stats(),
+        "item_cache": crud.item_cache.stats(),
+        "stream": crud.change_feed.stats(),
+        "availability_sync": crud.sync_stats.stats(),
+    }
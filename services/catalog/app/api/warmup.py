@@ -0,0 +1,166 @@
+"""
+Precalentamiento al arrancar: tras un despliegue, deja en la caché de
+respuestas (y en la caché de páginas de Postgres) lo que más se pide antes
+de que /health/ready deje pasar tráfico.
+
+Qué se precalienta, en este orden:
+
+1. `WARMUP_LIST_PARAMS`: listados fijos ({} = portada, GET /api/items/).
+2. Los `WARMUP_TOP_QUERIES` listados y facetas más pedidos según
+   `query_frequencies` (ver crud/query_log.py).
+3. El detalle de los `WARMUP_TOP_ITEMS` ítems más populares (item_stats).
+
+Se usan los mismos cuerpos que los endpoints (`_list_response`, …), así
+que las entradas de caché son idénticas a las de una petición real.
+/health/ready responde 200 al terminar o al pasar
+`WARMUP_DEADLINE_SECONDS`, lo que antes ocurra; lo que quede pendiente
+se abandona.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.api import items
+from app.core.cache import normalize_params, params_digest
+from app.core.config import settings
+from app.models.database import SessionLocal
+
+log = logging.getLogger(__name__)
+
+# valores por defecto de GET /api/items y /api/items/facets
+_LIST_DEFAULTS = {"skip": 0, "limit": 100, "cursor": None}
+_FILTER_KEYS = (
+    "name", "min_price", "max_price", "available", "categories", "category_match",
+    "order_by", "order_dir",
+)
+_FACET_BINS = 10
+
+
+class WarmupState:
+    def __init__(self):
+        self.deadline: Optional[float] = None    # time.monotonic()
+        self.done = False
+        self.planned = 0
+        self.warmed = 0
+        self.failed = 0
+        self.seconds: Optional[float] = None
+
+    def start(self) -> None:
+        self.deadline = time.monotonic() + settings.WARMUP_DEADLINE_SECONDS
+        self.done = settings.WARMUP_DEADLINE_SECONDS <= 0
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def ready(self) -> bool:
+        return self.done or self.expired
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "done": self.done,
+            "planned": self.planned,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "seconds": self.seconds,
+        }
+
+
+warmup_state = WarmupState()
+
+
+# ───────── tareas ─────────────────────────────────────────────────────────
+def _request(path: str) -> Request:
+    """Petición mínima para los cuerpos de los endpoints (enlaces Link relativos)."""
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+        }
+    )
+
+
+def _list_args(params: Dict[str, Any]):
+    p = {**_LIST_DEFAULTS, **params}
+    return p["skip"], p["limit"], p["cursor"], {k: p.get(k) for k in _FILTER_KEYS}
+
+
+def _warm_list(db: Session, params: Dict[str, Any]) -> None:
+    items._list_response(db, _request("/api/items/"), *_list_args(params), warmup=True)
+
+
+def _warm_facets(db: Session, params: Dict[str, Any]) -> None:
+    bins = params.get("bins", _FACET_BINS)
+    flt = {k: params.get(k) for k in _FILTER_KEYS}
+    items._facets_response(db, _request("/api/items/facets"), bins, flt, warmup=True)
+
+
+def _warm_item(db: Session, item_id: int) -> None:
+    items._detail_response(db, _request(f"/api/items/{item_id}"), item_id, warmup=True)
+
+
+Task = Tuple[Callable[[Session, Any], None], Any]
+
+
+def _plan(db: Session) -> List[Task]:
+    tasks: List[Task] = []
+    seen = set()
+
+    def add_list(params: Dict[str, Any]) -> None:
+        skip, limit, cursor, flt = _list_args(params)
+        if cursor:                               # páginas siguientes: cursores caducados
+            return
+        key = ("items", params_digest(normalize_params(skip=skip, limit=limit, cursor=cursor, **flt)))
+        if key not in seen:
+            seen.add(key)
+            tasks.append((_warm_list, params))
+
+    for params in settings.WARMUP_LIST_PARAMS:
+        add_list(params)
+    for params in crud.top_queries(db, "items", settings.WARMUP_TOP_QUERIES):
+        add_list(params)
+    for params in crud.top_queries(db, "facets", settings.WARMUP_TOP_QUERIES):
+        tasks.append((_warm_facets, params))
+    for item_id in crud.top_item_ids(db, settings.WARMUP_TOP_ITEMS):
+        tasks.append((_warm_item, item_id))
+    return tasks
+
+
+def run_warmup() -> None:
+    """Se ejecuta una vez, en el threadpool, tras el arranque."""
+    state = warmup_state
+    if state.done:
+        return
+    t0 = time.monotonic()
+    try:
+        with SessionLocal() as db:
+            tasks = _plan(db)
+            state.planned = len(tasks)
+            for fn, arg in tasks:
+                if state.expired:
+                    log.warning(
+                        "precalentamiento: plazo agotado (%d de %d)", state.warmed, state.planned
+                    )
+                    break
+                try:
+                    fn(db, arg)
+                    state.warmed += 1
+                except Exception:                # noqa: BLE001
+                    db.rollback()
+                    state.failed += 1
+                    log.warning("precalentamiento: %s(%r) falló", fn.__name__, arg, exc_info=True)
+    finally:
+        state.seconds = round(time.monotonic() - t0, 3)
+        state.done = True
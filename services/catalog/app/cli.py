@@ -0,0 +1,79 @@
+"""
+Tareas de mantenimiento del catálogo desde la línea de comandos.
+
+    python -m app.cli import-items catalogo.csv --owner tienda
+    python -m app.cli rebuild-listings
+    python -m app.cli check-listings [--repair]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from app import crud
+from app.models.database import SessionLocal
+
+
+def _import_items(args: argparse.Namespace) -> int:
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    with open(args.path, encoding="utf-8", newline="") as stream, SessionLocal() as db:
+        report = crud.import_items(
+            db,
+            crud.iter_import_rows(stream, fmt),
+            owner_username=args.owner,
+            batch_size=args.batch_size,
+        )
+    print(json.dumps(report.model_dump(), ensure_ascii=False, indent=2))
+    return 1 if report.failed else 0
+
+
+def _rebuild_listings(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        total = crud.rebuild_listings(db, batch_size=args.batch_size)
+    print(f"item_listings regenerado: {total} ítems")
+    return 0
+
+
+def _check_listings(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        report = crud.check_listings(db, batch_size=args.batch_size)
+        bad = sorted({*report["missing"], *report["stale"], *report["orphaned"]})
+        if bad and args.repair:
+            crud.refresh_listings(db, bad)
+            db.commit()
+    print(json.dumps(report, indent=2))
+    if bad and args.repair:
+        print(f"reparados: {len(bad)} ítems", file=sys.stderr)
+        return 0
+    return 1 if bad else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import-items", help="importa ítems desde CSV / NDJSON")
+    imp.add_argument("path")
+    imp.add_argument("--owner", required=True, help="owner_username de los ítems")
+    imp.add_argument("--format", choices=("csv", "ndjson"))
+    imp.add_argument("--batch-size", type=int)
+    imp.set_defaults(func=_import_items)
+
+    reb = sub.add_parser("rebuild-listings", help="regenera el read model item_listings")
+    reb.add_argument("--batch-size", type=int, default=1000)
+    reb.set_defaults(func=_rebuild_listings)
+
+    chk = sub.add_parser(
+        "check-listings", help="compara item_listings con las tablas base (exit 1 si difiere)"
+    )
+    chk.add_argument("--batch-size", type=int, default=1000)
+    chk.add_argument("--repair", action="store_true", help="recalcula los ítems que difieran")
+    chk.set_defaults(func=_check_listings)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+"""
+Caché de respuestas del catálogo.
+
+Las entradas se guardan ya serializadas (cuerpo JSON + cabeceras) bajo una
+clave derivada de los parámetros normalizados de la petición.  La
+invalidación es por *namespace*: cada namespace tiene un contador de
+generación que forma parte de la clave, así que invalidar = incrementar el
+contador (las entradas viejas caducan solas o las expulsa el LRU).
+
+Backends:
+
+* ``memory`` → LRU en proceso con TTL y límite de bytes.
+* ``shared`` → cliente tipo Redis (``CACHE_REDIS_URL``); sin URL se usa
+  :class:`LocalKV`, un sustituto en memoria con la misma interfaz.
+* ``none``   → desactivada.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import Response
+
+from app.core.config import settings
+
+
+# ───────── normalización de claves ────────────────────────────────────────
+def normalize_params(**params: Any) -> Dict[str, Any]:
+    """Quita None, ordena/deduplica listas y recorta espacios en los textos."""
+    out: Dict[str, Any] = {}
+    for k, v in params.items():
+        if v is None:
+            continue
+        if isinstance(v, (list, tuple, set)):
+            v = sorted(set(v))
+        elif isinstance(v, str):
+            v = v.strip()
+        elif isinstance(v, float) and v.is_integer():
+            v = int(v)
+        out[k] = v
+    return out
+
+
+def params_digest(params: Dict[str, Any]) -> str:
+    raw = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+# ───────── respuesta cacheada ─────────────────────────────────────────────
+class CachedResponse:
+    __slots__ = ("body", "headers")
+
+    def __init__(self, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.body = body
+        self.headers = headers or {}
+
+    def to_bytes(self) -> bytes:
+        return json.dumps(self.headers).encode() + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        head, _, body = raw.partition(b"\n")
+        return cls(body, json.loads(head))
+
+    def to_response(self, extra_headers: Optional[Dict[str, str]] = None) -> Response:
+        return Response(
+            self.body,
+            media_type="application/json",
+            headers={**self.headers, **(extra_headers or {})},
+        )
+
+
+# ───────── backends ───────────────────────────────────────────────────────
+class LRUCache:
+    """LRU con TTL por entrada y límite de entradas y de bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._pop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._bytes += size
+            while self._data and (
+                len(self._data) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def incr(self, key: str) -> int:
+        # los contadores de generación no se expulsan nunca
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def _pop(self, key: str) -> None:
+        _, value = self._data.pop(key)
+        self._bytes -= len(key) + len(value)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._data),
+            "bytes": self._bytes,
+        }
+
+
+class LFUCache:
+    """
+    LFU con TTL por entrada y límite de entradas; O(1) por operación.
+
+    Expulsa el menos usado (a igualdad, el más antiguo de su frecuencia):
+    unas pocas lecturas masivas no desalojan los ítems calientes, como sí
+    pasaría con un LRU.  Guarda objetos, no bytes.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: Dict[Any, Tuple[float, int, Any]] = {}   # clave → (caduca, usos, valor)
+        self._by_freq: Dict[int, "OrderedDict[Any, None]"] = {}
+        self._min_freq = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, freq, value = entry
+            if expires_at < time.monotonic():
+                self._pop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._unlink(key, freq)
+            self._link(key, freq + 1)
+            self._data[key] = (expires_at, freq + 1, value)
+            self.hits += 1
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:                # sustituir: conserva su frecuencia
+                self._data[key] = (time.monotonic() + self.ttl, entry[1], value)
+                return
+            if len(self._data) >= self.max_entries:
+                victim, _ = self._by_freq[self._min_freq].popitem(last=False)
+                if not self._by_freq[self._min_freq]:
+                    del self._by_freq[self._min_freq]
+                del self._data[victim]
+                self.evictions += 1
+            self._data[key] = (time.monotonic() + self.ttl, 1, value)
+            self._link(key, 1)
+            self._min_freq = 1
+
+    def delete(self, key: Any) -> None:
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._by_freq.clear()
+            self._min_freq = 0
+
+    def _link(self, key: Any, freq: int) -> None:
+        self._by_freq.setdefault(freq, OrderedDict())[key] = None
+
+    def _unlink(self, key: Any, freq: int) -> None:
+        bucket = self._by_freq[freq]
+        del bucket[key]
+        if not bucket:
+            del self._by_freq[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+
+    def _pop(self, key: Any) -> None:
+        _, freq, _ = self._data.pop(key)
+        self._unlink(key, freq)
+        if not self._data:
+            self._min_freq = 0
+        elif self._min_freq not in self._by_freq:
+            self._min_freq = min(self._by_freq)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._data),
+        }
+
+
+class LocalKV:
+    """Sustituto en memoria del subconjunto de Redis que usa :class:`SharedCache`."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[name]
+                return None
+            return value
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> None:
+        with self._lock:
+            self._data[name] = (time.monotonic() + ex if ex else None, value)
+
+    def delete(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._data.pop(name, None)
+
+    def incr(self, name: str) -> int:
+        with self._lock:
+            _, value = self._data.get(name, (None, b"0"))
+            new = int(value) + 1
+            self._data[name] = (None, str(new).encode())
+            return new
+
+
+class SharedCache:
+    """Caché compartida entre workers sobre un cliente tipo Redis."""
+
+    def __init__(self, client, ttl: float, prefix: str = "catalog:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self.client.set(self.prefix + key, value, ex=int(ttl or self.ttl))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+    def counter(self, key: str) -> int:
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def stats(self) -> Dict[str, int]:
+        # las expulsiones las gestiona el servidor (maxmemory-policy)
+        return {"hits": self.hits, "misses": self.misses, "evictions": 0}
+
+
+class NullCache:
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def incr(self, key: str) -> int:
+        return 0
+
+    def counter(self, key: str) -> int:
+        return 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": 0, "misses": 0, "evictions": 0}
+
+
+# ───────── caché de respuestas ────────────────────────────────────────────
+class ResponseCache:
+    """
+    Respuestas por (namespace, parámetros normalizados).
+
+    ``depends_on`` añade a la clave la generación de otros namespaces, de
+    modo que invalidar cualquiera de ellos invalida la entrada.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.invalidations = 0
+
+    def key(self, namespace: str, params: Dict[str, Any], depends_on: Iterable[str] = ()) -> str:
+        """
+        Clave con las generaciones actuales.  Se calcula una vez, antes de
+        leer la BD, y se usa para `get` y `set`: si entretanto hay una
+        invalidación, lo leído queda bajo la generación anterior y no se
+        vuelve a servir.
+        """
+        gens = ".".join(
+            str(self.backend.counter(f"gen:{ns}")) for ns in (namespace, *depends_on)
+        )
+        return f"{namespace}:{gens}:{params_digest(params)}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self.backend.get(key)
+        return CachedResponse.from_bytes(raw) if raw is not None else None
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        self.backend.set(key, entry.to_bytes())
+
+    def delete(self, namespace: str, params: Dict[str, Any]) -> None:
+        self.backend.delete(self.key(namespace, params))
+
+    def invalidate(self, namespace: str) -> None:
+        self.invalidations += 1
+        self.backend.incr(f"gen:{namespace}")
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.backend.stats(), "invalidations": self.invalidations}
+
+
+def _build_backend():
+    kind = settings.CACHE_BACKEND
+    if kind == "none":
+        return NullCache()
+    if kind == "shared":
+        if not settings.CACHE_REDIS_URL:
+            return SharedCache(LocalKV(), settings.CACHE_TTL_SECONDS)
+        try:
+            import redis
+        except ImportError as exc:                       # dependencia opcional
+            raise RuntimeError("CACHE_REDIS_URL requiere el paquete `redis`") from exc
+        return SharedCache(redis.Redis.from_url(settings.CACHE_REDIS_URL), settings.CACHE_TTL_SECONDS)
+    return LRUCache(
+        settings.CACHE_MAX_ENTRIES, settings.CACHE_MAX_BYTES, settings.CACHE_TTL_SECONDS
+    )
+
+
+response_cache = ResponseCache(_build_backend())
+
+# totales de listados por firma de filtros (COUNT_STRATEGY=cached)
+count_cache = LRUCache(4096, 1024 * 1024, settings.COUNT_CACHE_TTL_SECONDS)
+
+
+# ───────── invalidación (la llaman las escrituras de crud) ────────────────
+def invalidate_item(item_id: Optional[int]) -> None:
+    """
+    Un ítem cambió: fuera todos los listados.  El detalle va por versión
+    del ítem en la clave; el de la versión anterior ya no se pide.
+    """
+    response_cache.invalidate("items")
+
+
+def invalidate_items(ids: Iterable[int]) -> None:
+    """Varios ítems a la vez (sincronización por lotes): una sola generación."""
+    response_cache.invalidate("items")
+
+
+def invalidate_categories() -> None:
+    """Nueva categoría: sólo afecta a los listados filtrados por categoría."""
+    response_cache.invalidate("categories")
+
+
+def invalidate_stats() -> None:
+    """Volcado de contadores: sólo cambian los listados order_by=popular."""
+    response_cache.invalidate("stats")
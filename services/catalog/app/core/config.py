@@ -1,3 +1,5 @@
+from typing import Any, Dict, List, Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,6 +9,109 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # ───── motor async (lecturas de /api/items y /api/categories) ────────
+    # asyncpg en Postgres, aiosqlite en SQLite; las escrituras siguen en el
+    # motor síncrono
+    DB_ASYNC: bool = False
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+
+    # ───── caché de respuestas (GET /api/items) ──────────────────────────
+    CACHE_BACKEND: Literal["memory", "shared", "none"] = "memory"
+    CACHE_TTL_SECONDS: int = 30
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    CACHE_REDIS_URL: Optional[str] = None      # shared sin URL → LocalKV
+
+    # ───── X-Total-Count de los listados ─────────────────────────────────
+    # exact → COUNT(*); cached → COUNT(*) reutilizado durante el TTL;
+    # estimated → estimación del planner si supera el umbral (sólo Postgres)
+    COUNT_STRATEGY: Literal["exact", "cached", "estimated"] = "exact"
+    COUNT_CACHE_TTL_SECONDS: int = 10
+    COUNT_ESTIMATE_THRESHOLD: int = 10_000
+
+    # ───── serialización de listados ─────────────────────────────────────
+    # true → filas de la BD a dicts y JSON directo (orjson si está instalado)
+    # sin revalidar con pydantic; false → ItemOut por ítem
+    FAST_SERIALIZATION: bool = True
+
+    # ───── imágenes: transición item_images → items.image_urls ───────────
+    # las lecturas usan la columna; mientras sea true también se escribe la
+    # tabla para poder volver a una versión anterior
+    IMAGES_DUAL_WRITE: bool = True
+
+    # ───── GET /api/items/batch ──────────────────────────────────────────
+    ITEM_BATCH_MAX: int = 200
+
+    # ───── importación masiva ────────────────────────────────────────────
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000              # el resto sólo se cuenta
+
+    # ───── GET /api/items/suggest ────────────────────────────────────────
+    SUGGEST_LIMIT_MAX: int = 20
+    # reconstrucción completa del índice; recoge las escrituras de otros
+    # workers (los eventos sólo llegan al proceso que escribe).  0 = nunca
+    SUGGEST_REBUILD_SECONDS: int = 300
+
+    # ───── GET /api/items/{id}/similar ───────────────────────────────────
+    SIMILAR_DIMS: int = 256                    # columnas de la matriz (float32)
+    SIMILAR_LIMIT_MAX: int = 50
+    # reconstrucción completa (recalcula el IDF y recoge otros workers);
+    # 0 = sólo la del arranque
+    SIMILAR_REBUILD_SECONDS: int = 900
+
+    # ───── índice en memoria de categorías (filtro categories=…) ───────────
+    # los filtros por categoría + disponibilidad se resuelven en memoria y la
+    # BD sólo recibe los ids; desactivado = EXISTS sobre item_categories
+    CATEGORY_INDEX: bool = False
+    # resincronización completa: recoge las escrituras de otros workers
+    CATEGORY_INDEX_RESYNC_SECONDS: int = 60
+
+    # ───── caché de ítems por worker (GET /api/items/{id}) ────────────────
+    # LFU con invalidación entre workers (LISTEN/NOTIFY en Postgres)
+    ITEM_CACHE_MAX_ENTRIES: int = 10_000       # 0 = desactivada
+    ITEM_CACHE_TTL_SECONDS: int = 600          # red de seguridad; la invalidación es por aviso
+    ITEM_CACHE_RECONNECT_SECONDS: int = 5      # espera tras perder el LISTEN
+
+    # ───── GET /api/items/stream (SSE) ─────────────────────────────────────
+    STREAM_REPLAY_SIZE: int = 5000             # cambios recientes para Last-Event-ID
+    STREAM_HEARTBEAT_SECONDS: int = 15         # comentario si no hay cambios (proxies)
+    STREAM_RETRY_MS: int = 3000                # espera del navegador antes de reconectar
+    STREAM_MAX_CLIENTS: int = 5000             # conexiones abiertas por worker
+    STREAM_IDS_MAX: int = 500                  # ids suscritos por conexión
+
+    # ───── items.available desde el servicio rentals ─────────────────────
+    # p. ej. http://rentals:8000/api; None = sin sincronizar
+    RENTALS_API_BASE: Optional[str] = None
+    AVAILABILITY_SYNC_SECONDS: int = 5
+    AVAILABILITY_SYNC_BATCH: int = 1000        # alquileres por petición al feed
+    AVAILABILITY_SYNC_MAX_BATCHES: int = 20    # por ronda; el resto, en la siguiente
+    AVAILABILITY_SYNC_TIMEOUT_SECONDS: float = 5.0
+
+    # ───── contadores de visitas / interés (order_by=popular) ─────────────
+    STATS_FLUSH_SECONDS: int = 10
+    STATS_FLUSH_MAX_ROWS: int = 5000           # ítems por UPDATE; el resto, al siguiente
+    STATS_FLUSH_TIMEOUT_MS: int = 2000         # statement_timeout del volcado (Postgres)
+    STATS_MAX_PENDING: int = 100_000           # ítems distintos en memoria; más se descartan
+    STATS_INTEREST_WEIGHT: int = 10            # una consulta de alquiler = 10 visitas
+
+    # ───── precalentamiento al arrancar (/health/ready) ──────────────────
+    # /health/ready responde 503 hasta que termina o pasa el plazo; 0 = sin
+    # precalentar
+    WARMUP_DEADLINE_SECONDS: int = 30
+    # listados fijos, con los parámetros de GET /api/items ({} = portada)
+    WARMUP_LIST_PARAMS: List[Dict[str, Any]] = [{}]
+    WARMUP_TOP_QUERIES: int = 20               # + los más pedidos (query_frequencies)
+    WARMUP_TOP_ITEMS: int = 50                 # + detalle de los más populares
+
+    # ───── frecuencia de consultas (qué precalentar) ──────────────────────
+    QUERY_LOG_FLUSH_SECONDS: int = 60
+    QUERY_LOG_WINDOW_DAYS: int = 7
+    QUERY_LOG_MAX_PENDING: int = 10_000        # combinaciones en memoria; más se descartan
+
+    # ───── GET /api/items/export ─────────────────────────────────────────
+    EXPORT_BATCH_SIZE: int = 500               # filas por viaje al cursor
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
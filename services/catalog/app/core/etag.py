@@ -0,0 +1,28 @@
+"""
+GET condicionales (ETag / If-None-Match).
+
+Los ETag se derivan de contadores de versión baratos de leer, de modo que
+un 304 se resuelve sin cargar entidades ni serializar nada.
+"""
+from __future__ import annotations
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: object) -> str:
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match usa comparación débil: W/"x" ≡ "x"
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
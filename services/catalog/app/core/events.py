@@ -0,0 +1,61 @@
+"""
+Eventos en proceso de las escrituras de ítems.
+
+`crud` publica ``ITEM_CHANGED`` después de cada commit con el estado
+anterior y el nuevo del ítem (None al crear / borrar); los índices en
+memoria (p. ej. el de autocompletado) se suscriben para actualizarse sin
+releer la BD.  Un suscriptor que falla se registra y no afecta a la
+escritura, que ya está confirmada.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+ITEM_CHANGED = "item_changed"
+# ítems que cambió otro worker (aviso por NOTIFY, ver crud/item_cache.py):
+# sólo llegan los ids, sin estado anterior ni nuevo
+REMOTE_ITEMS_CHANGED = "remote_items_changed"
+
+
+class ItemSnapshot(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    owner_username: str
+    price_per_h: float
+    available: Optional[bool]
+    category_ids: Tuple[int, ...]
+
+
+Handler = Callable[..., None]
+
+_subscribers: Dict[str, List[Handler]] = defaultdict(list)
+
+
+def subscribe(event: str, handler: Optional[Handler] = None):
+    """Registra `handler`; también se puede usar como decorador."""
+    if handler is None:
+        return lambda fn: subscribe(event, fn)
+    _subscribers[event].append(handler)
+    return handler
+
+
+def unsubscribe(event: str, handler: Handler) -> None:
+    if handler in _subscribers[event]:
+        _subscribers[event].remove(handler)
+
+
+def publish(event: str, **payload) -> None:
+    for handler in list(_subscribers[event]):
+        try:
+            handler(**payload)
+        except Exception:                        # noqa: BLE001
+            log.exception("suscriptor de %s falló", event)
+
+
+def item_changed(before: Optional[ItemSnapshot], after: Optional[ItemSnapshot]) -> None:
+    publish(ITEM_CHANGED, before=before, after=after)
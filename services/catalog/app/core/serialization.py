@@ -0,0 +1,32 @@
+"""
+JSON de respuestas a partir de dicts ya confiables (filas de la BD).
+
+Con ``orjson`` instalado se usa éste; si no, un `TypeAdapter` precompilado
+de pydantic-core, que serializa en Rust sin validar.  Ambos producen el
+mismo JSON compacto en UTF-8 que ``ItemOut.model_dump_json``.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from pydantic import TypeAdapter
+
+try:                                             # dependencia opcional
+    import orjson
+except ImportError:                              # pragma: no cover
+    orjson = None
+
+_ROW = TypeAdapter(Dict[str, Any])
+_ROWS = TypeAdapter(List[Dict[str, Any]])
+
+
+def dump_row(row: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row)
+    return _ROW.dump_json(row)
+
+
+def dump_rows(rows: List[Dict[str, Any]]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(rows)
+    return _ROWS.dump_json(rows)
@@ -1,19 +1,73 @@
-from .category import get_category, get_categories, create_category           # noqa: F401
+from .category import (                                                       # noqa: F401
+    category_registry,
+    get_category,
+    get_categories,
+    create_category,
+)
+from .category_index import category_index                                    # noqa: F401
+from .item_cache import item_cache                                            # noqa: F401
+from .changes import change_feed                                              # noqa: F401
+from .version import get_version, get_versions, get_item_version              # noqa: F401
+from .listing import check_listings, rebuild_listings, refresh_listings       # noqa: F401
+from .facets import get_facets                                                # noqa: F401
+from .suggest import suggest_index                                            # noqa: F401
+from .similar import get_similar, similar_index                               # noqa: F401
+from .stats import flush_stats, stats_buffer, top_item_ids                    # noqa: F401
+from .query_log import flush_query_log, query_log, top_queries                # noqa: F401
+from .availability import sync_availability, sync_stats                       # noqa: F401
+from .bulk import export_items, import_items, iter_rows as iter_import_rows   # noqa: F401
 from .item import (                                                           # noqa: F401
+    count_items,
+    iter_items,
     get_item,
+    get_item_row,
     get_items,
+    get_items_after,
+    get_items_by_ids,
     get_items_by_owner,
     create_item,
     update_item,
     delete_item,
 )
+from . import aio                                                             # noqa: F401
 
 __all__ = [
+    "aio",
+    "check_listings",
+    "rebuild_listings",
+    "refresh_listings",
+    "get_facets",
+    "suggest_index",
+    "category_index",
+    "item_cache",
+    "change_feed",
+    "sync_availability",
+    "sync_stats",
+    "get_similar",
+    "similar_index",
+    "flush_stats",
+    "stats_buffer",
+    "top_item_ids",
+    "flush_query_log",
+    "query_log",
+    "top_queries",
+    "export_items",
+    "import_items",
+    "iter_import_rows",
+    "get_version",
+    "get_versions",
+    "get_item_version",
+    "category_registry",
     "get_category",
     "get_categories",
     "create_category",
+    "count_items",
+    "iter_items",
     "get_item",
+    "get_item_row",
     "get_items",
+    "get_items_after",
+    "get_items_by_ids",
     "get_items_by_owner",
     "create_item",
     "update_item",
@@ -0,0 +1,32 @@
+"""
+Versiones async de funciones sueltas de crud (DB_ASYNC), para rutas que
+sólo hacen una consulta (api/categories.py).
+
+Cada función ejecuta la versión síncrona con `AsyncSession.run_sync`: la
+lógica es la misma y la E/S va por el driver async sobre el event loop,
+sin pasar por el threadpool.  Las rutas async de ítems no pasan por aquí:
+ejecutan el cuerpo compartido entero (`_list_response`, …) con un solo
+`run_sync`.
+"""
+from __future__ import annotations
+
+import functools
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import category, version
+
+T = TypeVar("T")
+
+
+def _async(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    @functools.wraps(fn)
+    async def wrapper(db: AsyncSession, *args: Any, **kwargs: Any) -> T:
+        return await db.run_sync(fn, *args, **kwargs)
+
+    return wrapper
+
+
+get_version = _async(version.get_version)
+get_category = _async(category.get_category)
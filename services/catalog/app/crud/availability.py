@@ -0,0 +1,212 @@
+"""
+`items.available` sincronizado con los alquileres (servicio rentals).
+
+Cada `AVAILABILITY_SYNC_SECONDS` una tarea de fondo llama a
+`sync_availability`, que lee el feed GET /api/rentals/changes desde la
+marca de agua guardada en `sync_watermarks` y aplica cada lote con, como
+mucho, dos UPDATE por conjuntos (``… SET available = true/false WHERE
+id = ANY(…)``).  El feed da el estado actual de cada ítem, no eventos:
+repetir un lote no cambia nada, y sólo se tocan (versión, read model,
+cachés, eventos) los ítems cuyo valor cambia de verdad.
+
+Cada lote pide la página al feed fuera de cualquier transacción y sólo
+después abre una corta: bloquea la fila de la marca (``FOR UPDATE SKIP
+LOCKED``), comprueba que sigue siendo la de la petición, aplica y avanza
+la marca en el mismo commit.  Con varios workers, si la fila está
+bloqueada o la marca ya avanzó, otro está sincronizando: se descarta la
+página y se salta la ronda.  La llamada HTTP nunca retiene el bloqueo.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import invalidate_items
+from app.core.config import settings
+from app.core.events import ItemSnapshot, item_changed
+from app.crud.item import id_in
+from app.crud.item_cache import notify_items
+from app.crud.listing import refresh_listings
+from app.crud.version import bump_version
+from app.models.models import Item, ItemListing, SyncWatermark
+
+SOURCE = "rentals"
+
+
+class SyncStats:
+    """Contadores y retraso para /api/metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = self.received = self.applied = self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_success: Optional[float] = None      # time.time()
+        self.source_at: Optional[datetime] = None      # hora del feed ya aplicada (UTC)
+        self.behind = False                            # quedaban lotes al acabar la ronda
+
+    def record_batch(self, received: int, applied: int, source_at: Optional[datetime]) -> None:
+        with self._lock:
+            self.batches += 1
+            self.received += received
+            self.applied += applied
+            if source_at is not None:
+                self.source_at = source_at
+
+    def record_round(self, behind: bool) -> None:
+        self.behind = behind
+        self.last_success = time.time()
+        self.last_error = None
+
+    def record_error(self, exc: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"
+
+    def lag_seconds(self) -> Optional[float]:
+        """
+        Antigüedad máxima de `available`: al día → desde la última ronda;
+        con lotes pendientes → desde la hora hasta la que llegaba el feed.
+        """
+        if self.last_success is None:
+            return None
+        if self.behind and self.source_at is not None:
+            source_ts = self.source_at.replace(tzinfo=timezone.utc).timestamp()
+            return round(max(time.time() - source_ts, 0.0), 3)
+        return round(time.time() - self.last_success, 3)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": int(bool(settings.RENTALS_API_BASE)),
+            "batches": self.batches,
+            "received": self.received,
+            "applied": self.applied,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "behind": int(self.behind),
+            "lag_seconds": self.lag_seconds(),
+            "source_at": self.source_at.isoformat() if self.source_at else None,
+        }
+
+
+sync_stats = SyncStats()
+
+
+# ───────── feed ──────────────────────────────────────────────────────────
+def fetch_changes(after: Optional[str], limit: int) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"limit": limit}
+    if after:
+        params["after"] = after
+    r = httpx.get(
+        f"{settings.RENTALS_API_BASE}/rentals/changes",
+        params=params,
+        timeout=settings.AVAILABILITY_SYNC_TIMEOUT_SECONDS,
+    )
+    r.raise_for_status()
+    return r.json()
+
+
+# ───────── aplicación ────────────────────────────────────────────────────
+def apply_availability(db: Session, changes: Dict[int, bool]) -> List[int]:
+    """
+    Un UPDATE por valor, sólo sobre las filas que cambian; devuelve sus ids.
+    Sin commit.
+    """
+    items = Item.__table__
+    changed: List[int] = []
+    for flag in (True, False):
+        ids = [item_id for item_id, available in changes.items() if available is flag]
+        if not ids:
+            continue
+        changed += db.scalars(
+            update(items)
+            .where(id_in(db, ids), items.c.available.is_distinct_from(flag))
+            .values(available=flag, version=items.c.version + 1)
+            .returning(items.c.id)
+        ).all()
+    return sorted(changed)
+
+
+def _snapshots(db: Session, ids: List[int]) -> List[ItemSnapshot]:
+    # del read model ya refrescado: incluye las categorías sin otra consulta
+    return [
+        ItemSnapshot(item_id, name, description, owner, price, available, tuple(cat_ids or ()))
+        for item_id, name, description, owner, price, available, cat_ids in db.execute(
+            select(
+                ItemListing.item_id,
+                ItemListing.name,
+                ItemListing.description,
+                ItemListing.owner_username,
+                ItemListing.price_per_h,
+                ItemListing.available,
+                ItemListing.category_ids,
+            ).where(ItemListing.item_id.in_(ids))
+        )
+    ]
+
+
+def _sync_batch(db: Session) -> Optional[bool]:
+    """Un lote del feed.  Devuelve si quedan más, o None si otro worker lo tiene."""
+    since = db.scalar(select(SyncWatermark.value).where(SyncWatermark.name == SOURCE))
+    db.rollback()                                # la petición HTTP, sin transacción abierta
+    page = fetch_changes(since, settings.AVAILABILITY_SYNC_BATCH)
+    changes = {int(c["item_id"]): bool(c["available"]) for c in page["items"]}
+
+    mark = db.scalars(
+        select(SyncWatermark)
+        .where(SyncWatermark.name == SOURCE)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if mark is None or mark.value != since:      # bloqueada o ya avanzada por otro worker
+        db.rollback()
+        return None
+
+    try:
+        changed = apply_availability(db, changes)
+        snapshots: List[ItemSnapshot] = []
+        if changed:
+            refresh_listings(db, changed)
+            bump_version(db, "items")
+            notify_items(db, changed)
+            snapshots = _snapshots(db, changed)
+        source_at = datetime.fromisoformat(page["watermark_at"]) if page["watermark_at"] else None
+        if page["watermark"]:
+            mark.value = page["watermark"]
+            mark.source_at = source_at
+        mark.synced_at = datetime.now(timezone.utc)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if changed:
+        invalidate_items(changed)
+        for after in snapshots:
+            item_changed(after._replace(available=not after.available), after)
+    sync_stats.record_batch(len(changes), len(changed), source_at)
+    return bool(page["has_more"])
+
+
+def sync_availability(db: Session) -> int:
+    """
+    Hasta `AVAILABILITY_SYNC_MAX_BATCHES` lotes, mientras el feed tenga más;
+    devuelve cuántos se procesaron.
+    """
+    batches = 0
+    try:
+        more = True
+        while more and batches < settings.AVAILABILITY_SYNC_MAX_BATCHES:
+            more = _sync_batch(db)
+            if more is None:                     # otro worker sincroniza esta ronda
+                return batches
+            batches += 1
+    except Exception as exc:
+        sync_stats.record_error(exc)
+        raise
+    sync_stats.record_round(behind=more)
+    return batches
@@ -0,0 +1,311 @@
+"""
+Importación / exportación masiva de ítems (CSV / NDJSON) en streaming.
+
+Importar: las filas se leen de una en una, se validan con las reglas de
+`ItemCreate` y se cargan por lotes: `COPY` en Postgres (psycopg2) y
+`INSERT` por lotes (executemany) en el resto.  La memoria depende del
+tamaño de lote, no del fichero; el informe de errores se recorta a
+`IMPORT_MAX_ERRORS`.
+
+Exportar: cursor de servidor y salida por trozos; el CSV usa las mismas
+columnas que la importación (más id, available y owner_username).
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import invalidate_item
+from app.core.config import settings
+from app.core.events import ItemSnapshot, item_changed
+from app.crud.category import category_registry
+from app.crud.item import iter_items
+from app.crud.item_cache import notify_items
+from app.crud.listing import refresh_listings
+from app.crud.stats import create_stats
+from app.crud.version import bump_version
+from app.models.models import Item, ItemImage, item_categories
+from app.schemas.item import ItemCreate, ItemImportError, ItemImportReport, ItemOut
+
+# columnas CSV: name, description, price_per_h, image_urls, categories
+# (listas separadas por "|")
+CSV_LIST_SEP = "|"
+
+EXPORT_CSV_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "price_per_h",
+    "available",
+    "owner_username",
+    "image_urls",
+    "categories",
+)
+
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]         # (nº fila, datos, error)
+
+
+# ───────── lectura incremental ────────────────────────────────────────────
+def iter_csv(stream: IO[str]) -> Iterator[ParsedRow]:
+    reader = csv.DictReader(stream)
+    for raw in reader:
+        data: dict = {k: v for k, v in raw.items() if k and v not in (None, "")}
+        for field in ("image_urls", "categories"):
+            if field in data:
+                data[field] = [p.strip() for p in data[field].split(CSV_LIST_SEP) if p.strip()]
+        yield reader.line_num, data, None
+
+
+def iter_ndjson(stream: IO[str]) -> Iterator[ParsedRow]:
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield line_no, None, f"JSON no válido: {exc}"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, "Se esperaba un objeto JSON"
+            continue
+        yield line_no, data, None
+
+
+def iter_rows(stream: IO[str], fmt: str) -> Iterator[ParsedRow]:
+    return iter_csv(stream) if fmt == "csv" else iter_ndjson(stream)
+
+
+# ───────── escritura por lotes ────────────────────────────────────────────
+def _copy(cursor, table: str, columns: Tuple[str, ...], rows: Iterable[tuple]) -> None:
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def _pg_array(values: Iterable[str]) -> str:
+    """Literal de array de Postgres ('{"a","b"}') para COPY."""
+    quoted = ('"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values)
+    return "{" + ",".join(quoted) + "}"
+
+
+def _insert_batch_copy(db: Session, batch: List[ItemCreate], owner: str) -> List[int]:
+    # ids reservados de la secuencia → se conocen antes del COPY
+    ids = list(
+        db.scalars(
+            select(func.nextval(func.pg_get_serial_sequence("items", "id"))).select_from(
+                func.generate_series(1, len(batch))
+            )
+        )
+    )
+    cursor = db.connection().connection.cursor()
+    try:
+        _copy(
+            cursor,
+            "items",
+            (
+                "id",
+                "name",
+                "description",
+                "price_per_h",
+                "image_url",
+                "image_urls",
+                "owner_username",
+                "available",
+                "version",
+            ),
+            (
+                (
+                    i,
+                    it.name,
+                    it.description,
+                    it.price_per_h,
+                    str(it.image_urls[0]),
+                    _pg_array(map(str, it.image_urls)),
+                    owner,
+                    True,
+                    1,
+                )
+                for i, it in zip(ids, batch)
+            ),
+        )
+        if settings.IMAGES_DUAL_WRITE:
+            _copy(
+                cursor,
+                "item_images",
+                ("item_id", "url"),
+                ((i, str(u)) for i, it in zip(ids, batch) for u in it.image_urls),
+            )
+        _copy(
+            cursor,
+            "item_categories",
+            ("item_id", "category_id"),
+            ((i, c) for i, it in zip(ids, batch) for c in it.categories or ()),
+        )
+    finally:
+        cursor.close()
+    return ids
+
+
+def _insert_batch_executemany(db: Session, batch: List[ItemCreate], owner: str) -> List[int]:
+    ids = list(
+        db.scalars(
+            insert(Item).returning(Item.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": it.name,
+                    "description": it.description,
+                    "price_per_h": it.price_per_h,
+                    "image_url": str(it.image_urls[0]),
+                    "image_urls": [str(u) for u in it.image_urls],
+                    "owner_username": owner,
+                    "available": True,
+                    "version": 1,
+                }
+                for it in batch
+            ],
+        )
+    )
+    if settings.IMAGES_DUAL_WRITE:
+        db.execute(
+            insert(ItemImage),
+            [{"item_id": i, "url": str(u)} for i, it in zip(ids, batch) for u in it.image_urls],
+        )
+    links = [
+        {"item_id": i, "category_id": c} for i, it in zip(ids, batch) for c in it.categories or ()
+    ]
+    if links:
+        db.execute(insert(item_categories), links)
+    return ids
+
+
+def _use_copy(db: Session) -> bool:
+    conn = db.connection()
+    return conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+
+
+def _flush(db: Session, batch: List[ItemCreate], owner: str) -> None:
+    if _use_copy(db):
+        ids = _insert_batch_copy(db, batch, owner)
+    else:
+        ids = _insert_batch_executemany(db, batch, owner)
+    refresh_listings(db, ids)
+    create_stats(db, ids)
+    bump_version(db, "items")
+    notify_items(db, ids)
+    db.commit()
+    for item_id, it in zip(ids, batch):
+        item_changed(
+            None,
+            ItemSnapshot(
+                item_id,
+                it.name,
+                it.description,
+                owner,
+                it.price_per_h,
+                True,
+                tuple(it.categories or ()),
+            ),
+        )
+
+
+# ───────── API pública ────────────────────────────────────────────────────
+def import_items(
+    db: Session,
+    rows: Iterable[ParsedRow],
+    owner_username: str,
+    batch_size: Optional[int] = None,
+) -> ItemImportReport:
+    """
+    Valida y carga `rows`; cada lote se confirma por separado, así que las
+    filas sin error quedan importadas aunque otras fallen.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    report = ItemImportReport()
+    batch: List[ItemCreate] = []
+
+    def _fail(row: int, error: str) -> None:
+        report.failed += 1
+        if len(report.errors) < settings.IMPORT_MAX_ERRORS:
+            report.errors.append(ItemImportError(row=row, error=error))
+
+    for row, data, error in rows:
+        if error is not None:
+            _fail(row, error)
+            continue
+        try:
+            item = ItemCreate.model_validate(data)
+            if item.categories:
+                item.categories = category_registry.validate(db, item.categories)
+        except ValidationError as exc:
+            msgs = (f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+            _fail(row, "; ".join(msgs))
+            continue
+        except ValueError as exc:
+            _fail(row, str(exc))
+            continue
+
+        batch.append(item)
+        if len(batch) >= batch_size:
+            _flush(db, batch, owner_username)
+            report.imported += len(batch)
+            batch = []
+
+    if batch:
+        _flush(db, batch, owner_username)
+        report.imported += len(batch)
+
+    if report.imported:
+        invalidate_item(None)
+    return report
+
+
+# ───────── exportación ────────────────────────────────────────────────────
+def _export_ndjson(db: Session, items: List[Item]) -> str:
+    return "".join(
+        ItemOut.from_item(it, category_registry.resolve(db, it.category_ids)).model_dump_json()
+        + "\n"
+        for it in items
+    )
+
+
+def _export_csv(items: List[Item]) -> str:
+    buf = io.StringIO()
+    csv.writer(buf).writerows(
+        (
+            it.id,
+            it.name,
+            it.description,
+            it.price_per_h,
+            it.available,
+            it.owner_username,
+            CSV_LIST_SEP.join(it.image_urls),
+            CSV_LIST_SEP.join(map(str, it.category_ids)),
+        )
+        for it in items
+    )
+    return buf.getvalue()
+
+
+def export_items(db: Session, fmt: str, **flt) -> Iterator[str]:
+    """Trozos de texto listos para un `StreamingResponse` (uno por lote)."""
+    batch_size = settings.EXPORT_BATCH_SIZE
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf).writerow(EXPORT_CSV_COLUMNS)
+        yield buf.getvalue()
+
+    batch: List[Item] = []
+    for item in iter_items(db, batch_size, **flt):
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield _export_csv(batch) if fmt == "csv" else _export_ndjson(db, batch)
+            batch = []
+    if batch:
+        yield _export_csv(batch) if fmt == "csv" else _export_ndjson(db, batch)
@@ -1,22 +1,111 @@
-from typing import List, Optional
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.core.cache import invalidate_categories
+from app.crud.version import bump_version, get_version
 from app.models.models import Category
-from app.schemas.category import CategoryCreate
+from app.schemas.category import CategoryCreate, CategoryOut
+
+
+# ───────── registro en memoria ────────────────────────────────────────────
+class CategorySnapshot(NamedTuple):
+    version: int
+    categories: Tuple[CategoryOut, ...]          # ordenadas por nombre
+    by_id: Dict[int, CategoryOut]
+    payloads: Dict[int, Dict[str, Any]]          # CategoryOut ya volcado (JSON rápido)
+
+
+class CategoryRegistry:
+    """
+    Copia en proceso de la tabla `categories`, etiquetada con la versión
+    de `catalog_versions`.  Se carga al arrancar y se recarga cuando la
+    versión cambia o aparece un id desconocido (categoría creada en otro
+    worker), así que validar y resolver ids no consulta la BD.
+    """
+
+    def __init__(self):
+        self._snapshot = CategorySnapshot(-1, (), {}, {})
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> CategorySnapshot:
+        # versión antes que filas: si se cuela una escritura, la próxima
+        # comprobación verá una versión mayor y recargará
+        version = get_version(db, "categories")
+        cats = tuple(
+            CategoryOut.model_validate(c)
+            for c in db.query(Category).order_by(Category.name)
+        )
+        snap = CategorySnapshot(
+            version, cats, {c.id: c for c in cats}, {c.id: c.model_dump() for c in cats}
+        )
+        with self._lock:
+            if snap.version >= self._snapshot.version:
+                self._snapshot = snap
+            return self._snapshot
+
+    def snapshot(self, db: Session) -> CategorySnapshot:
+        snap = self._snapshot
+        return snap if snap.version >= 0 else self.load(db)
+
+    def ensure(self, db: Session, version: int) -> CategorySnapshot:
+        """Recarga si `version` (ya leída por el llamante) es más nueva."""
+        snap = self._snapshot
+        return snap if snap.version >= version else self.load(db)
+
+    def resolve(self, db: Session, ids: Iterable[int]) -> List[CategoryOut]:
+        ids = list(ids)
+        snap = self.snapshot(db)
+        if any(i not in snap.by_id for i in ids):
+            snap = self.load(db)
+        return [snap.by_id[i] for i in ids if i in snap.by_id]
+
+    def resolve_payloads(self, db: Session, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Como `resolve`, pero dicts compartidos (sólo lectura) para serializar."""
+        ids = list(ids)
+        snap = self.snapshot(db)
+        if any(i not in snap.payloads for i in ids):
+            snap = self.load(db)
+        return [snap.payloads[i] for i in ids if i in snap.payloads]
+
+    def cached(self, cat_id: int) -> Optional[CategoryOut]:
+        """Categoría de la copia actual, sin tocar la BD (None si no está)."""
+        return self._snapshot.by_id.get(cat_id)
+
+    def validate(self, db: Session, ids: Iterable[int]) -> List[int]:
+        """Ids sin duplicados; ValueError si alguno no existe."""
+        ids = list(dict.fromkeys(ids))
+        snap = self.snapshot(db)
+        if any(i not in snap.by_id for i in ids):
+            snap = self.load(db)
+        missing = [i for i in ids if i not in snap.by_id]
+        if missing:
+            raise ValueError(f"Categorías inexistentes: {', '.join(map(str, missing))}")
+        return ids
+
+
+category_registry = CategoryRegistry()
 
 
-def get_category(db: Session, cat_id: int) -> Optional[Category]:
-    return db.query(Category).filter(Category.id == cat_id).first()
+# ───────── CRUD ───────────────────────────────────────────────────────────
+def get_category(db: Session, cat_id: int) -> Optional[CategoryOut]:
+    found = category_registry.resolve(db, [cat_id])
+    return found[0] if found else None
 
 
-def get_categories(db: Session) -> List[Category]:
-    return db.query(Category).order_by(Category.name).all()
+def get_categories(db: Session) -> List[CategoryOut]:
+    return list(category_registry.snapshot(db).categories)
 
 
 def create_category(db: Session, cat_in: CategoryCreate) -> Category:
     db_cat = Category(**cat_in.model_dump())
     db.add(db_cat)
+    bump_version(db, "categories")
     db.commit()
     db.refresh(db_cat)
-    return db_cat
\ No newline at end of file
+    category_registry.load(db)
+    invalidate_categories()
+    return db_cat
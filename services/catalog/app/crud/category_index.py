@@ -0,0 +1,217 @@
+"""
+Índice invertido en memoria para el filtro por categorías (CATEGORY_INDEX).
+
+Por categoría, un array NumPy ordenado con los ids de sus ítems; además
+los ids disponibles y no disponibles.  Un filtro ``categories`` (+
+``available``) se resuelve como operaciones de conjuntos (unión para
+``category_match=any``, intersección para ``all``) y la BD sólo recibe el
+conjunto de ids resultante para ordenar y paginar, en lugar de un EXISTS
+correlacionado por fila.
+
+* Incremental: suscrito a ``ITEM_CHANGED``; cada cambio sustituye los
+  arrays afectados por copias nuevas, así que las lecturas no bloquean.
+* Escrituras de otros workers: ``REMOTE_ITEMS_CHANGED`` (NOTIFY, ver
+  crud/item_cache.py) sólo trae los ids; se releen de la BD sus
+  categorías y disponibilidad.  Sin LISTEN activo no llegan: `tracks_remote`
+  es False y GET /api/items no cachea los listados servidos por el índice.
+* Resincronización completa cada `CATEGORY_INDEX_RESYNC_SECONDS`: corrige
+  lo que se haya perdido (avisos caídos, carreras con la relectura).
+"""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.events import ItemSnapshot
+from app.crud.item_cache import item_cache
+from app.models.database import SessionLocal, engine
+from app.models.models import Item, ItemCategory
+
+_EMPTY = np.empty(0, np.int64)
+
+
+def _with(ids: np.ndarray, item_id: int) -> np.ndarray:
+    i = np.searchsorted(ids, item_id)
+    if i < len(ids) and ids[i] == item_id:
+        return ids
+    return np.insert(ids, i, item_id)
+
+
+def _without(ids: np.ndarray, item_id: int) -> np.ndarray:
+    i = np.searchsorted(ids, item_id)
+    if i < len(ids) and ids[i] == item_id:
+        return np.delete(ids, i)
+    return ids
+
+
+class _State:
+    def __init__(self, by_category: Dict[int, np.ndarray], available: np.ndarray, unavailable: np.ndarray):
+        self.by_category = by_category
+        self.available = available
+        self.unavailable = unavailable            # available = false (NULL no está en ninguno)
+
+    def set_flag(self, item_id: int, flag: Optional[bool]) -> None:
+        self.available = (_with if flag is True else _without)(self.available, item_id)
+        self.unavailable = (_with if flag is False else _without)(self.unavailable, item_id)
+
+
+Change = Callable[[_State], None]
+
+
+class CategoryIndex:
+    def __init__(self):
+        self._state: Optional[_State] = None      # None hasta el primer build
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._replay: Optional[List[Change]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._state is not None
+
+    @property
+    def tracks_remote(self) -> bool:
+        """Ve las escrituras de otros workers (o sólo hay uno, SQLite)."""
+        return engine.dialect.name != "postgresql" or item_cache.listening
+
+    # ───────── construcción ──────────────────────────────────────────────
+    def build(self, db: Session) -> int:
+        """Resincronización completa (2 consultas); no bloquea las lecturas."""
+        with self._build_lock:
+            with self._lock:
+                self._replay = []
+            try:
+                links = np.array(
+                    db.execute(
+                        select(ItemCategory.category_id, ItemCategory.item_id).order_by(
+                            ItemCategory.category_id, ItemCategory.item_id
+                        )
+                    ).all(),
+                    dtype=np.int64,
+                ).reshape(-1, 2)
+                cat_ids, starts = np.unique(links[:, 0], return_index=True)
+                by_category = {
+                    int(c): ids
+                    for c, ids in zip(cat_ids, np.split(links[:, 1], starts[1:]))
+                }
+                flags = db.execute(select(Item.id, Item.available).order_by(Item.id)).all()
+                available = np.array([i for i, a in flags if a is True], np.int64)
+                unavailable = np.array([i for i, a in flags if a is False], np.int64)
+                state = _State(by_category, available, unavailable)
+            except BaseException:
+                with self._lock:
+                    self._replay = None
+                raise
+            with self._lock:
+                for change in self._replay:
+                    change(state)
+                self._replay = None
+                self._state = state
+            return len(flags)
+
+    # ───────── actualización incremental ─────────────────────────────────
+    @staticmethod
+    def _apply(state: _State, before: Optional[ItemSnapshot], after: Optional[ItemSnapshot]) -> None:
+        item_id = (after or before).id
+        old_cats = set(before.category_ids) if before else set()
+        new_cats = set(after.category_ids) if after else set()
+        for cat_id in old_cats - new_cats:
+            state.by_category[cat_id] = _without(state.by_category.get(cat_id, _EMPTY), item_id)
+        for cat_id in new_cats - old_cats:
+            state.by_category[cat_id] = _with(state.by_category.get(cat_id, _EMPTY), item_id)
+
+        state.set_flag(item_id, after.available if after else None)
+
+    @staticmethod
+    def _reset(state: _State, item_id: int, cats: FrozenSet[int], flag: Optional[bool]) -> None:
+        """Deja `item_id` sólo en `cats` (sin estado anterior: se mira en todas)."""
+        for cat_id, ids in list(state.by_category.items()):
+            if cat_id not in cats:
+                state.by_category[cat_id] = _without(ids, item_id)
+        for cat_id in cats:
+            state.by_category[cat_id] = _with(state.by_category.get(cat_id, _EMPTY), item_id)
+        state.set_flag(item_id, flag)
+
+    def _record(self, change: Change) -> None:
+        with self._lock:
+            if self._state is not None:
+                change(self._state)
+            if self._replay is not None:
+                self._replay.append(change)
+
+    def on_item_changed(self, before: Optional[ItemSnapshot], after: Optional[ItemSnapshot]) -> None:
+        self._record(lambda state: self._apply(state, before, after))
+
+    def on_remote_change(self, ids: List[int]) -> None:
+        """Otro worker cambió `ids` (o los borró): se releen de la BD."""
+        if self._state is None and self._replay is None:
+            return                                # el primer build ya los leerá
+        ids = list(dict.fromkeys(ids))
+        cats: Dict[int, Set[int]] = defaultdict(set)
+        with SessionLocal() as db:
+            flags = dict(db.execute(select(Item.id, Item.available).where(Item.id.in_(ids))).all())
+            for item_id, cat_id in db.execute(
+                select(ItemCategory.item_id, ItemCategory.category_id).where(
+                    ItemCategory.item_id.in_(ids)
+                )
+            ):
+                cats[item_id].add(cat_id)
+        # un ítem borrado no está en `flags`: sin categorías ni disponibilidad
+        current = [(i, frozenset(cats.get(i, ())), flags.get(i)) for i in ids]
+
+        def change(state: _State) -> None:
+            for item_id, item_cats, flag in current:
+                self._reset(state, item_id, item_cats, flag)
+
+        self._record(change)
+
+    # ───────── consulta ──────────────────────────────────────────────────
+    def filter_ids(
+        self, categories: List[int], match: Optional[str], available: Optional[bool]
+    ) -> Optional[np.ndarray]:
+        """
+        Ids (ordenados) con alguna (``match`` any / None) o todas (``all``)
+        las `categories`, filtrados por `available`.  None si el índice aún
+        no está cargado.
+        """
+        st = self._state
+        if st is None:
+            return None
+        sets = [st.by_category.get(c, _EMPTY) for c in dict.fromkeys(categories)]
+        if match == "all":
+            sets.sort(key=len)                     # de menor a mayor: se vacía antes
+            ids = sets[0]
+            for other in sets[1:]:
+                if not len(ids):
+                    break
+                ids = np.intersect1d(ids, other, assume_unique=True)
+        else:
+            ids = sets[0] if len(sets) == 1 else np.unique(np.concatenate(sets))
+        if available is True:
+            ids = np.intersect1d(ids, st.available, assume_unique=True)
+        elif available is False:
+            ids = np.intersect1d(ids, st.unavailable, assume_unique=True)
+        return ids
+
+    def stats(self) -> Dict[str, int]:
+        st = self._state
+        if st is None:
+            return {"loaded": 0}
+        return {
+            "loaded": 1,
+            "categories": len(st.by_category),
+            "links": int(sum(len(a) for a in st.by_category.values())),
+            "available": len(st.available),
+        }
+
+
+category_index = CategoryIndex()
+
+events.subscribe(events.ITEM_CHANGED, category_index.on_item_changed)
+events.subscribe(events.REMOTE_ITEMS_CHANGED, category_index.on_remote_change)
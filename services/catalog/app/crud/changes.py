@@ -0,0 +1,197 @@
+"""
+Feed de cambios de precio y disponibilidad para GET /api/items/stream (SSE).
+
+Las escrituras publican ``ITEM_CHANGED`` tras el commit; `change_feed`
+las convierte en deltas pequeños y los guarda en un buffer circular de
+`STREAM_REPLAY_SIZE` entradas:
+
+* ``create`` → id, price_per_h, available
+* ``update`` → id + sólo los campos que cambiaron (price_per_h, available);
+  los cambios de otros campos no generan evento
+* ``delete`` → id
+
+Los cambios que hace otro worker llegan sólo como ids
+(``REMOTE_ITEMS_CHANGED``, con la caché de ítems en Postgres); se leen de
+`item_listings` y se emiten como ``update`` con ambos campos (o
+``delete`` si ya no existe).
+
+Cada conexión es una corrutina que espera un `asyncio.Event` compartido:
+miles de clientes inactivos no cuestan hilos ni colas.  Los ids de evento
+son ``<época>-<n>``; con ``Last-Event-ID`` se reenvía lo que quede en el
+buffer y, si ya no está (u otra época: reinicio u otro worker), se manda
+``reset`` para que el cliente recargue.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core import events
+from app.core.config import settings
+from app.core.events import ItemSnapshot
+from app.models.database import SessionLocal
+from app.models.models import ItemListing
+
+_FIELDS = ("price_per_h", "available")
+
+
+class Change(NamedTuple):
+    seq: int
+    item_id: int
+    category_ids: FrozenSet[int]                 # antes ∪ después, para los filtros
+    data: str                                    # JSON del delta
+
+
+class ChangeFeed:
+    def __init__(self, size: int):
+        self.epoch = f"{time.time_ns():x}"
+        self._buffer: Deque[Change] = deque(maxlen=size)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.clients = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bucle de los clientes; se llama al arrancar."""
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+
+    # ───────── productores (hilos del threadpool / del LISTEN) ───────────
+    def _append(self, item_id: int, category_ids: FrozenSet[int], delta: dict) -> None:
+        data = json.dumps(delta, separators=(",", ":"))
+        with self._lock:
+            self._seq += 1
+            self._buffer.append(Change(self._seq, item_id, category_ids, data))
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        # un Event por ronda: los que esperaban el viejo despiertan todos
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
+    def on_item_changed(self, before: Optional[ItemSnapshot], after: Optional[ItemSnapshot]) -> None:
+        cats = frozenset(before.category_ids if before else ()) | frozenset(
+            after.category_ids if after else ()
+        )
+        if after is None:
+            delta = {"op": "delete", "id": before.id}
+        elif before is None:
+            delta = {"op": "create", "id": after.id, **{f: getattr(after, f) for f in _FIELDS}}
+        else:
+            changed = {f: getattr(after, f) for f in _FIELDS if getattr(before, f) != getattr(after, f)}
+            if not changed:
+                return
+            delta = {"op": "update", "id": after.id, **changed}
+        self._append((after or before).id, cats, delta)
+
+    def on_remote_change(self, ids: List[int]) -> None:
+        with SessionLocal() as db:
+            found = {
+                item_id: (price, available, cats)
+                for item_id, price, available, cats in db.execute(
+                    select(
+                        ItemListing.item_id,
+                        ItemListing.price_per_h,
+                        ItemListing.available,
+                        ItemListing.category_ids,
+                    ).where(ItemListing.item_id.in_(ids))
+                )
+            }
+        for item_id in dict.fromkeys(ids):
+            if item_id not in found:
+                self._append(item_id, frozenset(), {"op": "delete", "id": item_id})
+                continue
+            price, available, cats = found[item_id]
+            delta = {"op": "update", "id": item_id, "price_per_h": price, "available": available}
+            self._append(item_id, frozenset(cats or ()), delta)
+
+    # ───────── consumidores ──────────────────────────────────────────────
+    def _event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def _resume_seq(self, last_event_id: Optional[str]) -> Tuple[int, bool]:
+        """(último n entregado, hace falta reset)."""
+        with self._lock:
+            current = self._seq
+        if not last_event_id:
+            return current, False
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > current:
+            return current, True
+        return int(seq), False
+
+    def _since(self, seq: int) -> Tuple[List[Change], int, bool]:
+        """
+        (cambios posteriores a `seq`, último n, si faltan algunos porque el
+        buffer ya los descartó).
+        """
+        with self._lock:
+            out: List[Change] = []
+            for change in reversed(self._buffer):
+                if change.seq <= seq:
+                    break
+                out.append(change)
+            current = self._seq
+        lost = current > seq and (not out or out[-1].seq != seq + 1)
+        out.reverse()
+        return out, current, lost
+
+    async def stream(
+        self,
+        last_event_id: Optional[str],
+        ids: Optional[List[int]] = None,
+        categories: Optional[List[int]] = None,
+    ) -> AsyncIterator[str]:
+        """Frames SSE; sin `ids` ni `categories`, todos los cambios."""
+        if self._wakeup is None:
+            self.bind(asyncio.get_running_loop())
+        wanted_ids = frozenset(ids or ())
+        wanted_cats = frozenset(categories or ())
+
+        def wanted(change: Change) -> bool:
+            if not wanted_ids and not wanted_cats:
+                return True
+            return change.item_id in wanted_ids or not wanted_cats.isdisjoint(change.category_ids)
+
+        self.clients += 1
+        try:
+            seq, lost = self._resume_seq(last_event_id)
+            yield f"retry: {settings.STREAM_RETRY_MS}\n\n"
+            while True:
+                if lost:
+                    yield f"id: {self._event_id(seq)}\nevent: reset\ndata: {{}}\n\n"
+                wakeup = self._wakeup                # antes de leer: no se pierde un aviso
+                changes, current, lost = self._since(seq)
+                if lost:                             # cliente demasiado lento
+                    seq = current
+                    continue
+                for change in changes:
+                    if wanted(change):
+                        yield f"id: {self._event_id(change.seq)}\nevent: item\ndata: {change.data}\n\n"
+                if changes:
+                    seq = changes[-1].seq
+                    continue
+                try:
+                    await asyncio.wait_for(wakeup.wait(), settings.STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # sólo id: avanza Last-Event-ID aunque el filtro no deje pasar nada
+                    yield f": ping\nid: {self._event_id(seq)}\n\n"
+        finally:
+            self.clients -= 1
+
+    def stats(self):
+        return {"clients": self.clients, "seq": self._seq, "buffered": len(self._buffer)}
+
+
+change_feed = ChangeFeed(settings.STREAM_REPLAY_SIZE)
+
+events.subscribe(events.ITEM_CHANGED, change_feed.on_item_changed)
+events.subscribe(events.REMOTE_ITEMS_CHANGED, change_feed.on_remote_change)
@@ -0,0 +1,130 @@
+"""
+Facetas de la barra de filtros: ítems por categoría, disponibles / no
+disponibles e histograma de precios, todo sobre el conjunto filtrado.
+
+Una sola consulta: CTE con los ítems filtrados y tres GROUP BY unidos con
+UNION ALL (faceta, valor, nº, mín, máx).  El histograma sale ya agrupado
+por tramo (una fila por tramo no vacío, con el mínimo y el máximo de
+precio del conjunto); aquí sólo se rellenan los vacíos y los bordes, con
+la misma convención que ``np.histogram``.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Float, Integer, case, cast, func, literal, null, select, true, union_all
+from sqlalchemy.orm import Session
+
+from app.crud.category import category_registry
+from app.crud.item import _filters
+from app.models.models import Item, ItemCategory
+from app.schemas.item import AvailabilityFacet, CategoryFacet, ItemFacetsOut, PriceHistogram
+
+
+Bounds = Tuple[Optional[float], Optional[float]]
+
+
+def _bucket(db: Session, price, lo, hi, bins: int):
+    """
+    Tramo (0 … bins-1) de `price` en [lo, hi], como ``np.histogram``: el
+    máximo cae en el último; si lo = hi, todo va al tramo central.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # width_bucket: 1 … bins, y bins + 1 para price = hi
+        index = func.least(func.width_bucket(price, lo, hi, bins), bins) - 1
+    else:
+        # precio ≥ lo: CAST AS INTEGER trunca, que aquí es floor
+        index = func.min(cast((price - lo) * bins / (hi - lo), Integer), bins - 1)
+    return case((hi == lo, bins // 2), else_=index)
+
+
+def _facet_rows(db: Session, criteria, bins: int) -> Tuple[Dict[str, Dict[float, int]], Bounds]:
+    f = select(Item.id, Item.available, Item.price_per_h).where(*criteria).cte("f")
+    no_bounds = (cast(null(), Float), cast(null(), Float))
+    by_category = (
+        select(
+            literal("category"), cast(ItemCategory.category_id, Float), func.count(), *no_bounds
+        )
+        .select_from(f.join(ItemCategory, ItemCategory.item_id == f.c.id))
+        .group_by(ItemCategory.category_id)
+    )
+    by_available = select(
+        literal("available"), cast(case((f.c.available, 1), else_=0), Float), func.count(), *no_bounds
+    ).group_by(f.c.available)
+
+    price = cast(f.c.price_per_h, Float)
+    b = select(func.min(price).label("lo"), func.max(price).label("hi")).cte("b")
+    # el tramo en una subconsulta: agrupar por la expresión repetiría sus parámetros
+    p = (
+        select(_bucket(db, price, b.c.lo, b.c.hi, bins).label("bucket"), b.c.lo, b.c.hi)
+        .select_from(f.join(b, true()))
+        .subquery("p")
+    )
+    by_price = select(
+        literal("price"), cast(p.c.bucket, Float), func.count(), p.c.lo, p.c.hi
+    ).group_by(p.c.bucket, p.c.lo, p.c.hi)
+
+    out: Dict[str, Dict[float, int]] = {"category": {}, "available": {}, "price": {}}
+    bounds: Bounds = (None, None)
+    for facet, value, n, lo, hi in db.execute(union_all(by_category, by_available, by_price)):
+        out[facet][value] = out[facet].get(value, 0) + n
+        if facet == "price":
+            bounds = (lo, hi)
+    return out, bounds
+
+
+def _histogram(buckets: Dict[float, int], bounds: Bounds, bins: int) -> PriceHistogram:
+    lo, hi = bounds
+    if not buckets:
+        return PriceHistogram(min=None, max=None, edges=[], counts=[])
+    # mismo rango que np.histogram cuando todos los precios coinciden
+    edges = np.linspace(lo, hi, bins + 1) if hi > lo else np.linspace(lo - 0.5, hi + 0.5, bins + 1)
+    counts = np.zeros(bins, np.int64)
+    for index, n in buckets.items():
+        counts[int(index)] += n
+    return PriceHistogram(
+        min=float(lo),
+        max=float(hi),
+        edges=edges.round(2).tolist(),
+        counts=counts.tolist(),
+    )
+
+
+def get_facets(
+    db: Session,
+    *,
+    bins: int,
+    name: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    available: Optional[bool],
+    categories: Optional[List[int]],
+    category_match: Optional[str] = None,
+) -> ItemFacetsOut:
+    criteria, _ = _filters(
+        db,
+        name=name,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        categories=categories,
+        category_match=category_match,
+    )
+    rows, bounds = _facet_rows(db, criteria, bins)
+
+    counts = {int(cat_id): n for cat_id, n in rows["category"].items()}
+    cats = [
+        CategoryFacet(id=c.id, name=c.name, count=counts[c.id])
+        for c in category_registry.resolve(db, counts)
+    ]
+    cats.sort(key=lambda c: (-c.count, c.name))
+
+    n_available = rows["available"].get(1.0, 0)
+    n_unavailable = rows["available"].get(0.0, 0)
+    return ItemFacetsOut(
+        total=n_available + n_unavailable,
+        categories=cats,
+        availability=AvailabilityFacet(available=n_available, unavailable=n_unavailable),
+        price=_histogram(rows["price"], bounds, bins),
+    )
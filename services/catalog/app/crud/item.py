@@ -1,41 +1,272 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+import base64
+import binascii
+import json
+import re
+from typing import Iterator, List, Optional, Tuple, Union
 
-from sqlalchemy import asc, desc, or_
-from sqlalchemy.orm import Session, joinedload
+import numpy as np
+from sqlalchemy import (
+    Integer,
+    any_,
+    asc,
+    bindparam,
+    cast,
+    column,
+    delete,
+    desc,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models.models import Category, Item, ItemImage
+from app.core.cache import (
+    count_cache,
+    invalidate_item,
+    normalize_params,
+    params_digest,
+)
+from app.core.config import settings
+from app.core.events import ItemSnapshot, item_changed
+from app.crud.category import category_registry
+from app.crud.category_index import category_index
+from app.crud.item_cache import notify_items
+from app.crud.listing import ItemRow, listing_rows, refresh_listings
+from app.crud.stats import create_stats, delete_stats
+from app.crud.suggest import fold
+from app.crud.version import bump_version
+from app.models.models import Item, ItemCategory, ItemImage, ItemListing, ItemStats
+from app.models.search import FTS_TABLE, FTS_VOCAB_TABLE, SEARCH_CONFIG
 from app.schemas.item import ItemCreate, ItemUpdate
 
+
 # ───────── helpers internos ───────────────────────────────────────────────
-def _get_categories_or_400(db: Session, ids: list[int]) -> list[Category]:
-    cats = db.query(Category).filter(Category.id.in_(ids)).all()
-    if len(cats) != len(ids):
-        missing = set(ids) - {c.id for c in cats}
-        raise ValueError(f"Categorías inexistentes: {', '.join(map(str, missing))}")
-    return cats
+def _snapshot(item: Item) -> ItemSnapshot:
+    return ItemSnapshot(
+        item.id,
+        item.name,
+        item.description,
+        item.owner_username,
+        item.price_per_h,
+        item.available,
+        tuple(item.category_ids),
+    )
+
+
+def _category_links_or_400(db: Session, ids: list[int]) -> list[ItemCategory]:
+    # validación contra el registro en memoria: sin SELECT a `categories`
+    return [ItemCategory(category_id=i) for i in category_registry.validate(db, ids)]
+
 
+_ORDER_COLUMNS = {
+    "price": Item.price_per_h,
+    "name": Item.name,
+    "id": Item.id,
+    "popular": ItemStats.popularity,
+}
 
-def _apply_order(q, order_by: str | None, order_dir: str | None):
-    mapping = {"price": Item.price_per_h, "name": Item.name, "id": Item.id}
+
+def _order_spec(order_by: str | None, order_dir: str | None) -> tuple[str, bool]:
+    """(clave de orden, ascendente?) – sin `order_by` se ordena por id asc."""
     if not order_by:
-        return q.order_by(Item.id)
-    col = mapping.get(order_by, Item.id)
-    return q.order_by(asc(col) if order_dir == "asc" else desc(col))
+        return "id", True
+    if order_by == "relevance":
+        return "relevance", order_dir == "asc"
+    key = order_by if order_by in _ORDER_COLUMNS else "id"
+    return key, order_dir == "asc"
+
+
+def _apply_order(q, order_by: str | None, order_dir: str | None, rank=None):
+    key, ascending = _order_spec(order_by, order_dir)
+    direction = asc if ascending else desc
+    if key == "relevance":
+        # sin término de búsqueda no hay relevancia → orden por id
+        if rank is None:
+            return q.order_by(Item.id)
+        return q.order_by(direction(rank), Item.id)
+    if key == "id":
+        return q.order_by(direction(Item.id))
+    if key == "popular":
+        # desempate por item_stats.item_id (= items.id): orden del índice
+        # (popularity, item_id), sin ordenar tras el JOIN
+        q = q.join(ItemStats, ItemStats.item_id == Item.id)
+        return q.order_by(direction(ItemStats.popularity), direction(ItemStats.item_id))
+    # `id` como desempate → orden total, necesario para paginar por cursor
+    return q.order_by(direction(_ORDER_COLUMNS[key]), direction(Item.id))
+
+
+# ───────── cursores (keyset pagination) ───────────────────────────────────
+# tipo JSON del valor de la columna de orden (bool es int en Python: aparte)
+_CURSOR_TYPES = {
+    "price": (int, float),
+    "popular": (int, float),
+    "name": (str,),
+    "id": (int,),
+}
+
+
+def _encode_cursor(key: str, ascending: bool, value, last_id: int) -> str:
+    payload = [key, "asc" if ascending else "desc", value, last_id]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, key: str, ascending: bool) -> tuple:
+    """Devuelve (valor, id) del último ítem visto. ValueError si no es válido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        c_key, c_dir, value, last_id = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Cursor no válido")
+    if c_key != key or c_dir != ("asc" if ascending else "desc"):
+        raise ValueError("El cursor no corresponde al orden solicitado")
+    if isinstance(last_id, bool) or not isinstance(last_id, int):
+        raise ValueError("Cursor no válido")
+    if isinstance(value, bool) or not isinstance(value, _CURSOR_TYPES[key]):
+        raise ValueError("Cursor no válido")
+    return value, last_id
+
+
+def _apply_seek(q, key: str, ascending: bool, value, last_id: int):
+    """WHERE (col, id) > (valor, id) – usa el índice en vez de OFFSET."""
+    if key == "id":
+        return q.filter(Item.id > last_id if ascending else Item.id < last_id)
+    row = tuple_(_ORDER_COLUMNS[key], Item.id)
+    bound = tuple_(value, last_id)
+    return q.filter(row > bound if ascending else row < bound)
+
+
+# ───────── búsqueda de texto ──────────────────────────────────────────────
+_fts = table(FTS_TABLE, column("rowid"))
+_fts_vocab = table(FTS_VOCAB_TABLE, column("term"), column("col"))
+
+# umbral de `<%` en pg_trgm (pg_trgm.word_similarity_threshold por defecto)
+_TYPO_THRESHOLD = 0.6
+
+
+def _trigrams(word: str) -> set[str]:
+    """Trigramas como pg_trgm: 'sol' → {'  s', ' so', 'sol', 'ol '}."""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _typo_terms(db: Session, token: str) -> List[str]:
+    """
+    Palabras de los nombres (vocabulario FTS5) parecidas a `token`: la
+    proporción de sus trigramas presentes, como `word_similarity` de Postgres.
+    """
+    wanted = _trigrams(fold(token))
+    terms = db.scalars(
+        select(_fts_vocab.c.term).where(
+            _fts_vocab.c.col == "name",
+            func.length(_fts_vocab.c.term).between(len(token) - 2, len(token) + 2),
+        )
+    )
+    return [t for t in terms if len(wanted & _trigrams(t)) / len(wanted) >= _TYPO_THRESHOLD]
+
+
+def _fts_query(term: str, typos=None) -> str | None:
+    """
+    'taladro bos' → '"taladro"* "bos"*' (AND de prefijos, sin sintaxis FTS5).
+    Con `typos(token)` cada token admite además esas palabras en el nombre:
+    '("taldro"* OR name:"taladro") AND "bos"*'.
+    """
+    tokens = re.findall(r"\w+", term)
+    if not tokens:
+        return None
+    parts = []
+    for t in tokens:
+        alts = [f'"{t}"*'] + [f'name:"{w}"' for w in (typos(t) if typos else ()) if w != t]
+        parts.append(alts[0] if len(alts) == 1 else f"({' OR '.join(alts)})")
+    return " AND ".join(parts)
+
+
+def _search(db: Session, term: str):
+    """
+    (criterio WHERE, expresión de relevancia) para `term`, o (None, None).
+
+    Postgres: tsvector con `es_unaccent` + trigramas sobre el nombre para
+    erratas.  SQLite: FTS5 con prefijos (misma semántica sin acentos); las
+    erratas se resuelven antes contra el vocabulario de los nombres con la
+    misma medida de trigramas, por palabra en lugar de sobre el término
+    entero.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        ts_query = func.websearch_to_tsquery(cast(literal(SEARCH_CONFIG), REGCONFIG), term)
+        needle = func.catalog_unaccent(func.lower(term))
+        haystack = func.catalog_unaccent(func.lower(Item.name))
+        criterion = or_(Item.search_vector.op("@@")(ts_query), needle.op("<%")(haystack))
+        rank = func.ts_rank_cd(Item.search_vector, ts_query) + func.word_similarity(needle, haystack)
+        return criterion, rank
+
+    match = _fts_query(term, lambda token: _typo_terms(db, token))
+    if match is None:
+        return None, None
+    fts_match = literal_column(FTS_TABLE).op("MATCH")(match)
+    criterion = Item.id.in_(select(_fts.c.rowid).where(fts_match))
+    # bm25(): más negativo = más relevante
+    rank = -(
+        select(func.bm25(literal_column(FTS_TABLE)))
+        .where(fts_match, _fts.c.rowid == Item.id)
+        .scalar_subquery()
+    )
+    return criterion, rank
 
 
 # ───────── lectura ────────────────────────────────────────────────────────
+# categorías en lote (SELECT … WHERE item_id IN (…)) en vez de JOINs; las
+# imágenes van en la propia fila (`items.image_urls`)
+_ITEM_LOAD = (selectinload(Item.category_links),)
+
+
 def get_item(db: Session, item_id: int) -> Optional[Item]:
-    return (
-        db.query(Item)
-        .options(joinedload(Item.categories), joinedload(Item.images))
-        .filter(Item.id == item_id)
-        .first()
-    )
+    return db.query(Item).options(*_ITEM_LOAD).filter(Item.id == item_id).first()
 
 
-def _build_query(
+def _load_items(db: Session, ids: List[int]) -> List[Item]:
+    """Entidades completas para `ids`, en ese mismo orden."""
+    if not ids:
+        return []
+    by_id = {i.id: i for i in db.query(Item).options(*_ITEM_LOAD).filter(Item.id.in_(ids))}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+# ───────── filas planas (FAST_SERIALIZATION) ─────────────────────────────
+# desde el read model `item_listings`: una consulta, una tabla
+def _load_rows(db: Session, ids: List[int]) -> List[ItemRow]:
+    """ItemRow de `ids`, en ese mismo orden."""
+    if not ids:
+        return []
+    by_id = {r["id"]: r for r in listing_rows(db, ItemListing.item_id.in_(ids))}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def get_item_row(db: Session, item_id: int) -> Optional[ItemRow]:
+    found = listing_rows(db, ItemListing.item_id == item_id)
+    return found[0] if found else None
+
+
+def _load(db: Session, ids: List[int], rows: bool) -> List[Item] | List[ItemRow]:
+    return _load_rows(db, ids) if rows else _load_items(db, ids)
+
+
+def get_items_by_ids(db: Session, ids: List[int], rows: bool = False) -> List[Item] | List[ItemRow]:
+    """Un único `IN (…)` (+ relaciones en lote); conserva el orden de `ids`."""
+    return _load(db, ids, rows)
+
+
+def _filters(
     db: Session,
     *,
     name: Optional[str],
@@ -43,24 +274,154 @@ def _build_query(
     max_price: Optional[float],
     available: Optional[bool],
     categories: Optional[List[int]],
-    order_by: Optional[str],
-    order_dir: Optional[str],
+    category_match: Optional[str] = None,
 ):
-    q = db.query(Item).options(joinedload(Item.categories), joinedload(Item.images))
+    """
+    (criterios WHERE sobre `items`, expresión de relevancia o None).
 
+    `category_match`: ``all`` exige todas las `categories`; None / ``any``,
+    alguna.
+    """
+    criteria = []
+    rank = None
     if name:
-        pattern = f"%{name}%"
-        q = q.filter(or_(Item.name.ilike(pattern), Item.description.ilike(pattern)))
+        criterion, rank = _search(db, name)
+        if criterion is not None:
+            criteria.append(criterion)
     if min_price is not None:
-        q = q.filter(Item.price_per_h >= min_price)
+        criteria.append(Item.price_per_h >= min_price)
     if max_price is not None:
-        q = q.filter(Item.price_per_h <= max_price)
+        criteria.append(Item.price_per_h <= max_price)
+
+    ids = _indexed_ids(categories, category_match, available)
+    if ids is not None:
+        # categorías + disponibilidad resueltas en memoria: sólo el conjunto de ids
+        criteria.append(id_in(db, ids))
+        return criteria, rank
     if available is not None:
-        q = q.filter(Item.available == available)
-    if categories:
-        q = q.filter(Item.categories.any(Category.id.in_(categories)))
+        criteria.append(Item.available == available)
+    if categories and category_match == "all":
+        criteria.extend(
+            Item.category_links.any(ItemCategory.category_id == c) for c in set(categories)
+        )
+    elif categories:
+        criteria.append(Item.category_links.any(ItemCategory.category_id.in_(categories)))
+    return criteria, rank
+
 
-    return _apply_order(q, order_by, order_dir)
+def _indexed_ids(
+    categories: Optional[List[int]], category_match: Optional[str], available: Optional[bool]
+) -> Optional[np.ndarray]:
+    """Ids que cumplen el filtro de categorías, si CATEGORY_INDEX está cargado."""
+    if not categories or not settings.CATEGORY_INDEX:
+        return None
+    return category_index.filter_ids(categories, category_match, available)
+
+
+def id_in(db: Session, ids: np.ndarray | List[int]):
+    """``items.id = ANY(…)`` para un conjunto de ids de cualquier tamaño."""
+    if not len(ids):
+        return Item.id.in_([])
+    values = ids.tolist() if isinstance(ids, np.ndarray) else [int(i) for i in ids]
+    if db.get_bind().dialect.name == "postgresql":
+        # un único parámetro array: misma sentencia preparada sea cual sea el tamaño
+        return Item.id == any_(bindparam("id_set", values, type_=ARRAY(Integer)))
+    # SQLite limita los parámetros por sentencia: la lista viaja como un texto JSON
+    each = func.json_each(json.dumps(values)).table_valued("value")
+    return Item.id.in_(select(each.c.value))
+
+
+def _build_query(
+    db: Session,
+    *,
+    name: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    available: Optional[bool],
+    categories: Optional[List[int]],
+    category_match: Optional[str] = None,
+    order_by: Optional[str],
+    order_dir: Optional[str],
+):
+    """SELECT items.id filtrado y ordenado (sin JOINs: LIMIT cuenta ítems)."""
+    criteria, rank = _filters(
+        db,
+        name=name,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        categories=categories,
+        category_match=category_match,
+    )
+    return _apply_order(select(Item.id).where(*criteria), order_by, order_dir, rank)
+
+
+def _count(db: Session, **flt) -> int:
+    criteria, _ = _filters(db, **flt)
+    return db.scalar(select(func.count()).select_from(Item).where(*criteria))
+
+
+def _explain_sql(dialect, criteria) -> Tuple[str, Union[dict, tuple]]:
+    """
+    EXPLAIN del SELECT filtrado, como SQL del driver + parámetros.
+    `render_postcompile`: los IN expandibles (``categories``) se reescriben
+    aquí con un parámetro por valor; si no, quedan como ``[POSTCOMPILE_…]``.
+    Con drivers posicionales (asyncpg: ``$1, $2…``) los parámetros van en
+    tupla, en el orden de `positiontup`; con psycopg2, dict por nombre.
+    """
+    compiled = select(Item.id).where(*criteria).compile(
+        dialect=dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    return "EXPLAIN (FORMAT JSON) " + str(compiled), params
+
+
+def _estimate_count(db: Session, **flt) -> Optional[int]:
+    """Estimación del planner de Postgres (None si no hay o no es Postgres)."""
+    conn = db.connection()
+    if conn.dialect.name != "postgresql":
+        return None
+    criteria, _ = _filters(db, **flt)
+    if not criteria:
+        # reltuples = -1 mientras la tabla no se haya analizado
+        estimate = db.scalar(text("SELECT reltuples FROM pg_class WHERE oid = 'items'::regclass"))
+        return int(estimate) if estimate is not None and estimate >= 0 else None
+
+    plan = conn.exec_driver_sql(*_explain_sql(conn.dialect, criteria)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_items(db: Session, **flt) -> Tuple[int, str]:
+    """
+    (total, método) según `COUNT_STRATEGY`; método ∈ exact | cached | estimated.
+
+    `estimated` sólo se usa por encima de `COUNT_ESTIMATE_THRESHOLD`: por
+    debajo el COUNT exacto ya es barato.  Si sólo se filtra por categorías
+    (y disponibilidad) y CATEGORY_INDEX está cargado, el total exacto sale
+    del índice sin consultar la BD.
+    """
+    if not flt.get("name") and flt.get("min_price") is None and flt.get("max_price") is None:
+        ids = _indexed_ids(flt.get("categories"), flt.get("category_match"), flt.get("available"))
+        if ids is not None:
+            return len(ids), "exact"
+    strategy = settings.COUNT_STRATEGY
+    if strategy == "estimated":
+        estimate = _estimate_count(db, **flt)
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+            return estimate, "estimated"
+    elif strategy == "cached":
+        key = "count:" + params_digest(normalize_params(**flt))
+        hit = count_cache.get(key)
+        if hit is not None:
+            return int(hit), "cached"
+        total = _count(db, **flt)
+        count_cache.set(key, str(total).encode())
+        return total, "exact"
+    return _count(db, **flt), "exact"
 
 
 def get_items(
@@ -73,9 +434,57 @@ def get_items(
     max_price: Optional[float],
     available: Optional[bool],
     categories: Optional[List[int]],
+    category_match: Optional[str] = None,
     order_by: Optional[str],
     order_dir: Optional[str],
-) -> Tuple[List[Item], int]:
+    rows: bool = False,
+) -> Tuple[List[Item] | List[ItemRow], int, str]:
+    """
+    (página, total, método de conteo) – ver `count_items`.
+
+    `rows=True` devuelve dicts listos para serializar en vez de entidades.
+    """
+    flt = dict(
+        name=name,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        categories=categories,
+        category_match=category_match,
+    )
+    total, method = count_items(db, **flt)
+    q = _build_query(db, order_by=order_by, order_dir=order_dir, **flt)
+    ids = list(db.scalars(q.offset(skip).limit(limit)))
+    return _load(db, ids, rows), total, method
+
+
+def get_items_after(
+    db: Session,
+    limit: int,
+    cursor: Optional[str],
+    *,
+    name: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    available: Optional[bool],
+    categories: Optional[List[int]],
+    category_match: Optional[str] = None,
+    order_by: Optional[str],
+    order_dir: Optional[str],
+    rows: bool = False,
+) -> Tuple[List[Item] | List[ItemRow], Optional[str]]:
+    """
+    Paginación por cursor: devuelve la página que sigue a `cursor`
+    (o la primera si está vacío) y el cursor de la siguiente, o None.
+
+    No calcula el total: el coste es el mismo en la página 1 que en la 5 000.
+    """
+    key, ascending = _order_spec(order_by, order_dir)
+    if key == "relevance":
+        raise ValueError("El orden por relevancia no admite paginación por cursor")
+    if key == "popular":
+        # los contadores cambian entre páginas: el cursor saltaría o repetiría ítems
+        raise ValueError("El orden por popularidad no admite paginación por cursor")
     q = _build_query(
         db,
         name=name,
@@ -83,63 +492,192 @@ def get_items(
         max_price=max_price,
         available=available,
         categories=categories,
+        category_match=category_match,
         order_by=order_by,
         order_dir=order_dir,
     )
-    total = q.count()
-    items = q.offset(skip).limit(limit).all()
-    return items, total
+    if cursor:
+        value, last_id = _decode_cursor(cursor, key, ascending)
+        q = _apply_seek(q, key, ascending, value, last_id)
+
+    # el cursor sale de la propia consulta de ids, no de los ítems cargados:
+    # uno borrado entre las dos consultas no falta para construirlo
+    page = db.execute(q.add_columns(_ORDER_COLUMNS[key]).limit(limit + 1)).all()
+    has_more = len(page) > limit
+    page = page[:limit]
+    items = _load(db, [item_id for item_id, _ in page], rows)
+    if not has_more:
+        return items, None
+    last_id, value = page[-1]
+    return items, _encode_cursor(key, ascending, value, last_id)
 
 
-def get_items_by_owner(db: Session, owner: str) -> List[Item]:
+def iter_items(
+    db: Session,
+    batch_size: int,
+    *,
+    name: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    available: Optional[bool],
+    categories: Optional[List[int]],
+    category_match: Optional[str] = None,
+    order_by: Optional[str],
+    order_dir: Optional[str],
+) -> Iterator[Item]:
+    """
+    Todos los ítems filtrados, leídos con cursor de servidor (`yield_per`):
+    se materializan `batch_size` filas cada vez, con sus relaciones en lote.
+    """
+    criteria, rank = _filters(
+        db,
+        name=name,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        categories=categories,
+        category_match=category_match,
+    )
+    stmt = _apply_order(select(Item).options(*_ITEM_LOAD).where(*criteria), order_by, order_dir, rank)
+    yield from db.scalars(stmt.execution_options(yield_per=batch_size))
+
+
+def get_items_by_owner(db: Session, owner: str, rows: bool = False) -> List[Item] | List[ItemRow]:
+    if rows:
+        return listing_rows(
+            db, ItemListing.owner_username == owner, order_by=ItemListing.item_id
+        )
     return (
         db.query(Item)
-        .options(joinedload(Item.categories), joinedload(Item.images))
+        .options(*_ITEM_LOAD)
         .filter(Item.owner_username == owner)
+        .order_by(Item.id)
         .all()
     )
 
 
 # ───────── escritura ──────────────────────────────────────────────────────
 def create_item(db: Session, item_in: ItemCreate, owner_username: str) -> Item:
-    main = str(item_in.image_urls[0])
-
+    urls = [str(u) for u in item_in.image_urls]
     db_item = Item(
         name=item_in.name,
         description=item_in.description,
         price_per_h=item_in.price_per_h,
-        image_url=main,
+        image_url=urls[0],
+        image_urls=urls,
         owner_username=owner_username,
     )
 
     if item_in.categories:
-        db_item.categories = _get_categories_or_400(db, item_in.categories)
+        db_item.category_links = _category_links_or_400(db, item_in.categories)
 
-    db_item.images = [ItemImage(url=str(u)) for u in item_in.image_urls]
+    if settings.IMAGES_DUAL_WRITE:
+        db_item.images = [ItemImage(url=u) for u in urls]
 
     db.add(db_item)
+    db.flush()
+    refresh_listings(db, [db_item.id])
+    create_stats(db, [db_item.id])
+    bump_version(db, "items")
+    notify_items(db, [db_item.id])
     db.commit()
     db.refresh(db_item)
+    invalidate_item(None)
+    item_changed(None, _snapshot(db_item))
     return db_item
 
 
+def _sync_category_links(db: Session, db_item: Item, ids: List[int]) -> bool:
+    """Añade / quita sólo los vínculos que cambian. True si hubo cambios."""
+    wanted = set(category_registry.validate(db, ids))
+    current = {link.category_id for link in db_item.category_links}
+    if wanted == current:
+        return False
+    kept = [link for link in db_item.category_links if link.category_id in wanted]
+    added = [ItemCategory(category_id=i) for i in wanted - current]
+    # los que faltan se borran (delete-orphan); mismo orden que la relación
+    db_item.category_links = sorted(kept + added, key=lambda link: link.category_id)
+    return True
+
+
+def _sync_images(db: Session, item_id: int, old: List[str], urls: List[str]) -> None:
+    """
+    Dual-write de `item_images` sin cargar la relación: el orden lo da el
+    id, así que se conserva el prefijo común con las URLs anteriores y sólo
+    se reemplaza lo que viene detrás.  Sin commit.
+    """
+    n = 0
+    while n < min(len(old), len(urls)) and old[n] == urls[n]:
+        n += 1
+    images = ItemImage.__table__
+    tail = select(images.c.id).where(images.c.item_id == item_id).order_by(images.c.id).offset(n)
+    db.execute(delete(images).where(images.c.id.in_(tail)))
+    if n < len(urls):
+        db.execute(insert(images), [{"item_id": item_id, "url": u} for u in urls[n:]])
+
+
 def update_item(db: Session, db_item: Item, item_in: ItemUpdate) -> Item:
+    """
+    Sólo escribe lo que cambia: columnas distintas, vínculos de categoría e
+    imágenes añadidos / quitados.  Si no cambia nada no toca la BD (ni la
+    versión).  El estado devuelto ya es el nuevo, sin SELECT posterior.
+    """
+    before = _snapshot(db_item)
     data = item_in.model_dump(exclude_unset=True, exclude={"categories", "image_urls"})
-    for k, v in data.items():
-        setattr(db_item, k, v)
+    values = {k: v for k, v in data.items() if getattr(db_item, k) != v}
 
-    if item_in.categories is not None:
-        db_item.categories = _get_categories_or_400(db, item_in.categories)
+    links_changed = item_in.categories is not None and _sync_category_links(
+        db, db_item, item_in.categories
+    )
 
     if item_in.image_urls is not None:
-        db_item.image_url = str(item_in.image_urls[0])
-        db_item.images = [ItemImage(url=str(u)) for u in item_in.image_urls]
+        urls = [str(u) for u in item_in.image_urls]
+        old_urls = list(db_item.image_urls)
+        if urls != old_urls:
+            values.update(image_url=urls[0], image_urls=urls)
+            if settings.IMAGES_DUAL_WRITE:
+                _sync_images(db, db_item.id, old_urls, urls)
 
-    db.commit()
-    db.refresh(db_item)
+    if not values and not links_changed:
+        return db_item
+
+    # columnas + versión en un solo UPDATE … RETURNING; los valores se fijan
+    # como confirmados en la entidad para no releerla
+    items = Item.__table__
+    version = db.scalar(
+        update(items)
+        .where(items.c.id == db_item.id)
+        .values(**values, version=items.c.version + 1)
+        .returning(items.c.version)
+    )
+    for k, v in {**values, "version": version}.items():
+        set_committed_value(db_item, k, v)
+
+    db.flush()
+    refresh_listings(db, [db_item.id])
+    bump_version(db, "items")
+    notify_items(db, [db_item.id])
+    # sólo este commit sin expirar: la entidad ya tiene los valores
+    # confirmados (set_committed_value) y se devuelve sin releerla
+    expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+    invalidate_item(db_item.id)
+    item_changed(before, _snapshot(db_item))
     return db_item
 
 
 def delete_item(db: Session, db_item: Item) -> None:
+    item_id = db_item.id
+    before = _snapshot(db_item)
     db.delete(db_item)
-    db.commit()
\ No newline at end of file
+    db.flush()
+    refresh_listings(db, [item_id])
+    delete_stats(db, [item_id])
+    bump_version(db, "items")
+    notify_items(db, [item_id])
+    db.commit()
+    invalidate_item(item_id)
+    item_changed(before, None)
@@ -0,0 +1,193 @@
+"""
+Caché de ítems por worker (GET /api/items/{id}) con invalidación entre
+workers.
+
+Cada worker guarda en un LFU (`ITEM_CACHE_MAX_ENTRIES`) la versión y el
+cuerpo JSON del detalle; un acierto no toca la BD.  Para que un PATCH
+atendido por otro worker no deje datos viejos:
+
+* Postgres: las escrituras de ítems (alta, importación, PATCH, DELETE,
+  sincronización de disponibilidad) hacen ``pg_notify`` dentro de su
+  transacción (se entrega sólo si hay commit) y cada worker escucha el
+  canal con una conexión dedicada (``LISTEN``) en un hilo.
+* SQLite / tests: sólo hay un proceso; basta el bus en proceso
+  (``ITEM_CHANGED``), al que la caché también está suscrita.
+
+Si la conexión de escucha se cae, la caché se vacía y no se usa hasta
+reconectar: mientras tanto se perderían avisos.
+
+Los avisos de otros workers se republican en el bus como
+``REMOTE_ITEMS_CHANGED`` (p. ej. para GET /api/items/stream y el índice
+de categorías).
+"""
+from __future__ import annotations
+
+import logging
+import select
+import threading
+import uuid
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.cache import LFUCache
+from app.core.config import settings
+from app.core.events import ItemSnapshot
+from app.models.database import engine
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "catalog_item_changed"
+_NOTIFY_CHUNK = 1000                             # ids por aviso (payload < 8000 bytes)
+# origen de los avisos: los propios ya se vieron por el bus en proceso
+_ORIGIN = uuid.uuid4().hex[:12]
+
+Entry = Tuple[int, bytes]                        # (versión del ítem, cuerpo JSON)
+
+
+def _is_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def notify_items(db: Session, ids: Iterable[int]) -> None:
+    """Aviso a los demás workers; se llama antes del commit.  Sin commit."""
+    if settings.ITEM_CACHE_MAX_ENTRIES <= 0 or db.get_bind().dialect.name != "postgresql":
+        return
+    ids = list(ids)
+    for i in range(0, len(ids), _NOTIFY_CHUNK):
+        payload = _ORIGIN + ":" + ",".join(str(int(x)) for x in ids[i : i + _NOTIFY_CHUNK])
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+
+class ItemCache:
+    def __init__(self):
+        self._lfu = LFUCache(settings.ITEM_CACHE_MAX_ENTRIES, settings.ITEM_CACHE_TTL_SECONDS)
+        self._lock = threading.Lock()
+        self._generation = 0                     # sube con cada invalidación
+        self._listener: Optional[_Listener] = None
+        # en Postgres, sólo con el LISTEN activo; sin él no hay avisos
+        self.listening = False
+        self.notifications = 0
+
+    @property
+    def usable(self) -> bool:
+        return self._lfu.max_entries > 0 and self.listening
+
+    # ───────── lectura / relleno ─────────────────────────────────────────
+    def get(self, item_id: int) -> Optional[Entry]:
+        return self._lfu.get(item_id) if self.usable else None
+
+    def token(self) -> int:
+        """Se toma antes de leer la BD; ver `set`."""
+        return self._generation
+
+    def set(self, item_id: int, entry: Entry, token: int) -> None:
+        """
+        Guarda `entry` salvo que haya habido alguna invalidación desde
+        `token`: lo leído podría ser anterior a esa escritura.
+        """
+        if not self.usable:
+            return
+        with self._lock:
+            if token == self._generation:
+                self._lfu.set(item_id, entry)
+
+    # ───────── invalidación ──────────────────────────────────────────────
+    def invalidate(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            self._generation += 1
+            for item_id in ids:
+                self._lfu.delete(item_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._lfu.clear()
+
+    def on_item_changed(self, before: Optional[ItemSnapshot], after: Optional[ItemSnapshot]) -> None:
+        self.invalidate([(after or before).id])
+
+    # ───────── ciclo de vida ─────────────────────────────────────────────
+    def start(self) -> None:
+        if self._lfu.max_entries <= 0:
+            return
+        if not _is_postgres():
+            self.listening = True                # un solo proceso: basta el bus
+            return
+        if engine.dialect.driver != "psycopg2":
+            log.warning("caché de ítems desactivada: LISTEN requiere psycopg2")
+            return
+        self._listener = _Listener(self)
+        self._listener.start()
+
+    def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self.listening = False
+
+    def stats(self):
+        return {
+            **self._lfu.stats(),
+            "listening": int(self.listening),
+            "notifications": self.notifications,
+        }
+
+
+class _Listener(threading.Thread):
+    """LISTEN en una conexión propia (fuera del pool); reconecta si cae."""
+
+    def __init__(self, cache: ItemCache):
+        super().__init__(name="item-cache-listener", daemon=True)
+        self.cache = cache
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception:                    # noqa: BLE001
+                log.warning("caché de ítems: se perdió el LISTEN", exc_info=True)
+            self.cache.listening = False
+            self.cache.clear()
+            self._stopped.wait(settings.ITEM_CACHE_RECONNECT_SECONDS)
+
+    def _listen(self) -> None:
+        raw = engine.raw_connection()
+        raw.detach()                             # no vuelve al pool
+        conn = raw.driver_connection
+        try:
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {CHANNEL}")
+            # lo cacheado antes del LISTEN pudo perderse avisos
+            self.cache.clear()
+            self.cache.listening = True
+            while not self._stopped.is_set():
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                ids: List[int] = []
+                remote: List[int] = []
+                while conn.notifies:
+                    origin, _, payload = conn.notifies.pop(0).payload.partition(":")
+                    note_ids = [int(x) for x in payload.split(",") if x]
+                    ids.extend(note_ids)
+                    if origin != _ORIGIN:
+                        remote.extend(note_ids)
+                if ids:
+                    self.cache.notifications += 1
+                    self.cache.invalidate(ids)
+                if remote:
+                    events.publish(events.REMOTE_ITEMS_CHANGED, ids=remote)
+        finally:
+            conn.close()
+
+
+item_cache = ItemCache()
+
+events.subscribe(events.ITEM_CHANGED, item_cache.on_item_changed)
@@ -0,0 +1,198 @@
+"""
+Read model `item_listings`: una fila por ítem con imágenes y categorías
+ya resueltas, con la forma de ItemOut.
+
+* Escritura: `refresh_listings` recalcula las filas de unos ids a partir
+  de las tablas base; lo llaman las escrituras de `crud` antes del commit,
+  así que el read model cambia en la misma transacción que el ítem.
+* Lectura: `listing_rows` → una sola consulta a una sola tabla.
+* Mantenimiento: `rebuild_listings` y `check_listings` (ver app/cli.py).
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.crud.category import category_registry
+from app.models.models import Item, ItemCategory, ItemListing
+
+# ítem como dict con la forma de ItemOut: mismas claves y orden, así que
+# el JSON sale idéntico sin pasar por pydantic (datos de la BD, sin revalidar)
+ItemRow = Dict[str, Any]
+
+
+# ───────── desde las tablas base ──────────────────────────────────────────
+_BASE_COLUMNS = (
+    Item.id,
+    Item.name,
+    Item.description,
+    Item.price_per_h,
+    Item.available,
+    Item.owner_username,
+    Item.image_url,
+    Item.image_urls,
+)
+
+
+def base_rows(db: Session, ids: List[int]) -> Dict[int, ItemRow]:
+    """ItemRow de `ids` desde items + item_categories (2 consultas)."""
+    by_id: Dict[int, ItemRow] = {}
+    if not ids:
+        return by_id
+    for id_, name, description, price, available, owner, image_url, image_urls in db.execute(
+        select(*_BASE_COLUMNS).where(Item.id.in_(ids)).order_by(Item.id)
+    ):
+        by_id[id_] = {
+            "name": name,
+            "description": description,
+            "price_per_h": price,
+            "id": id_,
+            "available": available,
+            "owner_username": owner,
+            "categories": [],
+            "image_urls": list(image_urls),
+            "image_url": image_url,
+        }
+    found = list(by_id)
+    cat_ids: Dict[int, List[int]] = {i: [] for i in found}
+    for item_id, cat_id in db.execute(
+        select(ItemCategory.item_id, ItemCategory.category_id)
+        .where(ItemCategory.item_id.in_(found))
+        .order_by(ItemCategory.category_id)
+    ):
+        cat_ids[item_id].append(cat_id)
+    for id_, row in by_id.items():
+        row["categories"] = category_registry.resolve_payloads(db, cat_ids[id_])
+    return by_id
+
+
+def _listing_values(row: ItemRow) -> Dict[str, Any]:
+    return {
+        "item_id": row["id"],
+        "name": row["name"],
+        "description": row["description"],
+        "price_per_h": row["price_per_h"],
+        "available": row["available"],
+        "owner_username": row["owner_username"],
+        "image_url": row["image_url"],
+        "image_urls": row["image_urls"],
+        "category_ids": [c["id"] for c in row["categories"]],
+        "category_names": [c["name"] for c in row["categories"]],
+    }
+
+
+def refresh_listings(db: Session, ids: List[int]) -> None:
+    """
+    Recalcula (o borra, si el ítem ya no existe) las filas de `ids`.
+
+    Lee las tablas base, así que los cambios pendientes deben estar ya
+    volcados (`db.flush()`).  No hace commit.
+    """
+    if not ids:
+        return
+    rows = base_rows(db, ids)
+    db.execute(delete(ItemListing).where(ItemListing.item_id.in_(ids)))
+    if rows:
+        db.execute(insert(ItemListing), [_listing_values(r) for r in rows.values()])
+
+
+# ───────── lectura ────────────────────────────────────────────────────────
+_LISTING_COLUMNS = (
+    ItemListing.item_id,
+    ItemListing.name,
+    ItemListing.description,
+    ItemListing.price_per_h,
+    ItemListing.available,
+    ItemListing.owner_username,
+    ItemListing.image_url,
+    ItemListing.image_urls,
+    ItemListing.category_ids,
+    ItemListing.category_names,
+)
+
+
+def listing_rows(db: Session, *criteria, order_by=None) -> List[ItemRow]:
+    """ItemRow desde `item_listings` con una sola consulta."""
+    stmt = select(*_LISTING_COLUMNS).where(*criteria)
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    return [
+        {
+            "name": name,
+            "description": description,
+            "price_per_h": price,
+            "id": id_,
+            "available": available,
+            "owner_username": owner,
+            "categories": [{"name": n, "id": i} for i, n in zip(cat_ids, cat_names)],
+            "image_urls": image_urls,
+            "image_url": image_url,
+        }
+        for (
+            id_,
+            name,
+            description,
+            price,
+            available,
+            owner,
+            image_url,
+            image_urls,
+            cat_ids,
+            cat_names,
+        ) in db.execute(stmt)
+    ]
+
+
+# ───────── mantenimiento ──────────────────────────────────────────────────
+def _id_chunks(db: Session, column, batch_size: int):
+    last: Optional[int] = None
+    while True:
+        stmt = select(column).order_by(column).limit(batch_size)
+        if last is not None:
+            stmt = stmt.where(column > last)
+        ids = list(db.scalars(stmt))
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+def rebuild_listings(db: Session, batch_size: int = 1000) -> int:
+    """Regenera todo el read model por lotes de ids (commit por lote)."""
+    db.execute(
+        delete(ItemListing).where(ItemListing.item_id.not_in(select(Item.id)))
+    )
+    db.commit()
+    total = 0
+    for ids in _id_chunks(db, Item.id, batch_size):
+        refresh_listings(db, ids)
+        db.commit()
+        total += len(ids)
+    return total
+
+
+def check_listings(db: Session, batch_size: int = 1000) -> Dict[str, List[int]]:
+    """
+    Compara el read model con las tablas base.  Devuelve los ids
+    `missing` (sin fila), `stale` (fila distinta) y `orphaned` (fila de un
+    ítem que ya no existe).
+    """
+    report: Dict[str, List[int]] = {"missing": [], "stale": [], "orphaned": []}
+    for ids in _id_chunks(db, Item.id, batch_size):
+        expected = base_rows(db, ids)
+        actual = {r["id"]: r for r in listing_rows(db, ItemListing.item_id.in_(ids))}
+        for id_, row in expected.items():
+            if id_ not in actual:
+                report["missing"].append(id_)
+            elif actual[id_] != row:
+                report["stale"].append(id_)
+    report["orphaned"] = list(
+        db.scalars(
+            select(ItemListing.item_id)
+            .where(ItemListing.item_id.not_in(select(Item.id)))
+            .order_by(ItemListing.item_id)
+        )
+    )
+    return report
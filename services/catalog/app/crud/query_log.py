@@ -0,0 +1,97 @@
+"""
+Frecuencia de consultas de listados y facetas.
+
+Los endpoints suman en memoria (`query_log.record`) con la misma clave
+normalizada que usa la caché de respuestas; `flush_query_log` la vuelca
+cada `QUERY_LOG_FLUSH_SECONDS` a `query_frequencies` con un upsert por
+lote.  `top_queries` devuelve las combinaciones más pedidas en la ventana
+`QUERY_LOG_WINDOW_DAYS`: es lo que se precalienta al arrancar.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import params_digest
+from app.core.config import settings
+from app.models.models import QueryFrequency
+
+Params = Dict[str, Any]
+
+
+class QueryLog:
+    def __init__(self):
+        # (namespace, digest) → [params, veces]
+        self._pending: Dict[Tuple[str, str], List] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def record(self, namespace: str, params: Params) -> None:
+        key = (namespace, params_digest(params))
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                if len(self._pending) >= settings.QUERY_LOG_MAX_PENDING:
+                    self.dropped += 1
+                    return
+                # copia JSON: la clave no debe cambiar si el llamante muta `params`
+                entry = self._pending[key] = [json.loads(json.dumps(params, default=str)), 0]
+            entry[1] += 1
+
+    def take(self) -> Dict[Tuple[str, str], List]:
+        with self._lock:
+            taken, self._pending = self._pending, {}
+        return taken
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": len(self._pending), "dropped": self.dropped}
+
+
+query_log = QueryLog()
+
+
+def flush_query_log(db: Session) -> int:
+    """Upsert de lo acumulado (hits += n).  Devuelve cuántas combinaciones."""
+    taken = query_log.take()
+    if not taken:
+        return 0
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"namespace": ns, "digest": digest, "params": params, "hits": hits, "last_seen": now}
+        for (ns, digest), (params, hits) in sorted(taken.items())
+    ]
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(QueryFrequency)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[QueryFrequency.namespace, QueryFrequency.digest],
+        set_={
+            "hits": QueryFrequency.hits + stmt.excluded.hits,
+            "last_seen": stmt.excluded.last_seen,
+        },
+    )
+    # se pierden si falla: son estadísticas, no datos
+    db.execute(stmt, rows)
+    db.commit()
+    return len(rows)
+
+
+def top_queries(db: Session, namespace: str, limit: int) -> List[Params]:
+    """Parámetros de las `limit` combinaciones más pedidas en la ventana."""
+    if limit <= 0:
+        return []
+    since = datetime.now(timezone.utc) - timedelta(days=settings.QUERY_LOG_WINDOW_DAYS)
+    return list(
+        db.scalars(
+            select(QueryFrequency.params)
+            .where(QueryFrequency.namespace == namespace, QueryFrequency.last_seen >= since)
+            .order_by(QueryFrequency.hits.desc())
+            .limit(limit)
+        )
+    )
@@ -0,0 +1,280 @@
+"""
+Índice vectorial para GET /api/items/{id}/similar.
+
+Cada ítem es un vector TF-IDF de dimensión fija (`SIMILAR_DIMS`) por
+hashing de rasgos, sin vocabulario: palabras y trigramas del nombre,
+palabras de la descripción y categorías, con norma 1.  Las filas viven en
+una matriz NumPy float32 y una consulta es un producto matriz-vector
+(coseno) sobre los candidatos que pasan el prefiltro de categoría, precio
+y disponibilidad.
+
+* Reconstrucción (`build`): lee `item_listings` por lotes y monta un
+  estado nuevo sin tocar el actual, que se sustituye al terminar; las
+  consultas nunca la esperan.  Fija el IDF.
+* Incremental: suscrito a ``ITEM_CHANGED``.  Las escrituras de otros
+  workers entran con la reconstrucción periódica (`SIMILAR_REBUILD_SECONDS`).
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.config import settings
+from app.core.events import ItemSnapshot
+from app.crud.listing import ItemRow, _id_chunks, listing_rows
+from app.crud.suggest import fold
+from app.models.models import ItemListing
+
+_WORD = re.compile(r"\w+")
+
+# peso por campo: el nombre y las categorías pesan más que la descripción;
+# los trigramas del nombre acercan variantes ("taladro" / "taladros")
+_WEIGHTS = {"n": 2.0, "g": 0.5, "d": 1.0, "c": 3.0}
+
+Sparse = Tuple[np.ndarray, np.ndarray]           # (buckets, pesos con signo)
+
+
+@lru_cache(maxsize=1 << 17)
+def _hash(feature: str) -> int:
+    return zlib.crc32(feature.encode())
+
+
+@lru_cache(maxsize=1 << 16)
+def _name_features(word: str) -> Tuple[str, ...]:
+    padded = f"#{word}#"
+    return ("n:" + word, *("g:" + padded[i : i + 3] for i in range(len(padded) - 2)))
+
+
+def _features(doc: ItemSnapshot) -> Counter:
+    feats: Counter = Counter()
+    for word in _WORD.findall(fold(doc.name)):
+        feats.update(_name_features(word))
+    feats.update("d:" + w for w in _WORD.findall(fold(doc.description or "")) if len(w) > 2)
+    feats.update(f"c:{cat_id}" for cat_id in doc.category_ids)
+    return feats
+
+
+def _sparse(doc: ItemSnapshot, dims: int) -> Sparse:
+    feats = _features(doc)
+    hashes = np.fromiter((_hash(f) for f in feats), np.uint32, len(feats))
+    weights = np.fromiter(
+        (_WEIGHTS[f[0]] * (1 + math.log(tf)) for f, tf in feats.items()), np.float32, len(feats)
+    )
+    # hashing con signo: las colisiones se cancelan en media en lugar de sumar
+    signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+    return (hashes % dims).astype(np.intp), weights * signs
+
+
+def _doc(row: ItemRow) -> ItemSnapshot:
+    return ItemSnapshot(
+        row["id"],
+        row["name"],
+        row["description"],
+        row["owner_username"],
+        row["price_per_h"],
+        row["available"],
+        tuple(c["id"] for c in row["categories"]),
+    )
+
+
+def _vector(sparse: Sparse, idf: np.ndarray) -> np.ndarray:
+    buckets, weights = sparse
+    vec = np.bincount(buckets, weights * idf[buckets], minlength=len(idf)).astype(np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+class _State:
+    """
+    Matrices del índice.  Escrituras bajo el lock de SimilarIndex; las
+    lecturas no bloquean: una fila se rellena antes de contar en `size` y
+    al crecer se sustituyen los arrays enteros (nunca encogen).
+    """
+
+    def __init__(self, idf: np.ndarray, capacity: int):
+        dims = len(idf)
+        self.idf = idf
+        self.ids = np.zeros(capacity, np.int64)
+        self.vectors = np.zeros((capacity, dims), np.float32)
+        self.price = np.zeros(capacity, np.float32)
+        self.live = np.zeros(capacity, bool)     # existe y está disponible
+        self.cats = np.zeros((capacity, 16), bool)
+        self.row_of: Dict[int, int] = {}
+        self.col_of: Dict[int, int] = {}         # id de categoría → columna de `cats`
+        self.size = 0
+
+    def _grow_rows(self) -> None:
+        cap = len(self.ids) * 2
+        for name in ("ids", "vectors", "price", "live", "cats"):
+            old = getattr(self, name)
+            new = np.zeros((cap,) + old.shape[1:], old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def _col(self, cat_id: int) -> int:
+        col = self.col_of.get(cat_id)
+        if col is None:
+            col = len(self.col_of)
+            if col == self.cats.shape[1]:
+                cats = np.zeros((len(self.cats), col * 2), bool)
+                cats[:, :col] = self.cats
+                self.cats = cats
+            self.col_of[cat_id] = col
+        return col
+
+    def put(self, doc: ItemSnapshot, vec: np.ndarray) -> None:
+        row = self.row_of.get(doc.id)
+        new = row is None
+        if new:
+            if self.size == len(self.ids):
+                self._grow_rows()
+            row = self.size
+            self.ids[row] = doc.id
+        cols = [self._col(c) for c in doc.category_ids]
+        self.vectors[row] = vec
+        self.price[row] = doc.price_per_h
+        self.cats[row] = False
+        self.cats[row, cols] = True
+        self.live[row] = doc.available is not False
+        if new:
+            self.row_of[doc.id] = row
+            self.size += 1
+
+    def drop(self, item_id: int) -> None:
+        row = self.row_of.get(item_id)
+        if row is not None:
+            self.live[row] = False
+
+
+class SimilarIndex:
+    def __init__(self):
+        self._state = _State(np.ones(settings.SIMILAR_DIMS, np.float32), 1024)
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._replay: Optional[List[Tuple[Optional[ItemSnapshot], Optional[ItemSnapshot]]]] = None
+
+    # ───────── construcción ──────────────────────────────────────────────
+    def build(self, db: Session, batch_size: int = 1000) -> int:
+        """Reconstrucción completa desde `item_listings`; no bloquea consultas."""
+        def docs():
+            for ids in _id_chunks(db, ItemListing.item_id, batch_size):
+                yield from map(_doc, listing_rows(db, ItemListing.item_id.in_(ids)))
+
+        return self.build_from(docs())
+
+    def build_from(self, docs: Iterable[ItemSnapshot]) -> int:
+        with self._build_lock:
+            with self._lock:
+                self._replay = []                # eventos durante la construcción
+            try:
+                dims = settings.SIMILAR_DIMS
+                docs = list(docs)
+                sparse = [_sparse(d, dims) for d in docs]
+                df = np.zeros(dims, np.float32)
+                for buckets, _ in sparse:
+                    df[np.unique(buckets)] += 1
+                idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+
+                state = _State(idf, max(1024, len(docs)))
+                for doc, sp in zip(docs, sparse):
+                    state.put(doc, _vector(sp, idf))
+            except BaseException:
+                with self._lock:
+                    self._replay = None
+                raise
+            with self._lock:
+                for before, after in self._replay:
+                    self._apply(state, before, after)
+                self._replay = None
+                self._state = state
+            return state.size
+
+    # ───────── actualización incremental ─────────────────────────────────
+    @staticmethod
+    def _apply(state: _State, before: Optional[ItemSnapshot], after: Optional[ItemSnapshot]) -> None:
+        if after is None:
+            state.drop(before.id)
+        else:
+            state.put(after, _vector(_sparse(after, len(state.idf)), state.idf))
+
+    def on_item_changed(self, before: Optional[ItemSnapshot], after: Optional[ItemSnapshot]) -> None:
+        with self._lock:
+            self._apply(self._state, before, after)
+            if self._replay is not None:
+                self._replay.append((before, after))
+
+    # ───────── consulta ──────────────────────────────────────────────────
+    def similar(
+        self,
+        doc: ItemSnapshot,
+        limit: int,
+        same_category: bool = True,
+        price_ratio: Optional[float] = None,
+    ) -> List[int]:
+        """
+        Ids de los `limit` ítems más parecidos a `doc` (disponibles, sin él
+        mismo), de más a menos parecido.  `same_category`: comparte alguna
+        categoría con `doc`; `price_ratio`: precio en [p / r, p · r].
+        """
+        st = self._state
+        n = st.size                              # antes que los arrays (ver _State)
+        row = st.row_of.get(doc.id)
+        if row is not None and row < n:
+            vec = st.vectors[row].copy()
+        else:
+            vec = _vector(_sparse(doc, len(st.idf)), st.idf)
+
+        mask = st.live[:n].copy()
+        if row is not None and row < n:
+            mask[row] = False
+        if price_ratio:
+            price = st.price[:n]
+            mask &= (price >= doc.price_per_h / price_ratio) & (price <= doc.price_per_h * price_ratio)
+        if same_category and doc.category_ids:
+            cols = [st.col_of[c] for c in doc.category_ids if c in st.col_of]
+            mask &= st.cats[:n, cols].any(axis=1) if cols else False
+        candidates = np.flatnonzero(mask)
+        if not candidates.size:
+            return []
+
+        # pocos candidatos: sólo sus filas; muchos: la matriz entera sin copiar
+        if candidates.size * 4 < n:
+            scores = st.vectors[candidates] @ vec
+        else:
+            scores = (st.vectors[:n] @ vec)[candidates]
+        k = min(limit, candidates.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        top = top[scores[top] > 0]
+        return st.ids[candidates[top]].tolist()
+
+    def __len__(self) -> int:
+        return self._state.size
+
+
+similar_index = SimilarIndex()
+
+events.subscribe(events.ITEM_CHANGED, similar_index.on_item_changed)
+
+
+def get_similar(
+    db: Session,
+    item_id: int,
+    limit: int,
+    same_category: bool = True,
+    price_ratio: Optional[float] = None,
+) -> Optional[List[int]]:
+    """Ids parecidos a `item_id` (None si el ítem no existe)."""
+    rows = listing_rows(db, ItemListing.item_id == item_id)
+    if not rows:
+        return None
+    return similar_index.similar(_doc(rows[0]), limit, same_category, price_ratio)
@@ -0,0 +1,153 @@
+"""
+Contadores de visitas e interés de alquiler por ítem, con escritura diferida.
+
+GET /api/items/{id} y POST /api/items/{id}/interest sólo suman en memoria
+(`stats_buffer`); una tarea de fondo llama a `flush_stats` cada
+`STATS_FLUSH_SECONDS`, que vuelca los deltas acumulados con un único
+``UPDATE … FROM (VALUES …)`` sobre `item_stats` (la tabla por la que ordena
+``order_by=popular``).
+
+Acotado: cada volcado escribe como mucho `STATS_FLUSH_MAX_ROWS` ítems (el
+resto espera al siguiente) con `statement_timeout` en Postgres, y en
+memoria caben `STATS_MAX_PENDING` ítems distintos (lo que no cabe se
+descarta y se cuenta).  Lo pendiente se pierde si el proceso muere: son
+contadores aproximados.
+"""
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import invalidate_stats
+from app.core.config import settings
+from app.crud.version import bump_version
+from app.models.models import Item, ItemStats
+
+Delta = Tuple[int, int, int]                     # (item_id, visitas, interés)
+
+
+class StatsBuffer:
+    def __init__(self):
+        self._pending: Dict[int, List[int]] = {}  # item_id → [visitas, interés]
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def _add(self, item_id: int, views: int, interest: int) -> bool:
+        delta = self._pending.get(item_id)
+        if delta is None:
+            if len(self._pending) >= settings.STATS_MAX_PENDING:
+                self.dropped += 1
+                return False
+            delta = self._pending[item_id] = [0, 0]
+        delta[0] += views
+        delta[1] += interest
+        return True
+
+    def record_view(self, item_id: int) -> None:
+        with self._lock:
+            self._add(item_id, 1, 0)
+
+    def record_interest(self, item_id: int) -> None:
+        with self._lock:
+            self._add(item_id, 0, 1)
+
+    def take(self, limit: int) -> List[Delta]:
+        """Saca hasta `limit` ítems pendientes, ordenados por id."""
+        with self._lock:
+            if len(self._pending) <= limit:
+                taken, self._pending = self._pending, {}
+            else:
+                keys = list(itertools.islice(self._pending, limit))
+                taken = {k: self._pending.pop(k) for k in keys}
+        return sorted((k, v, i) for k, (v, i) in taken.items())
+
+    def restore(self, deltas: Iterable[Delta]) -> None:
+        """Devuelve deltas no escritos (volcado fallido)."""
+        with self._lock:
+            for item_id, views, interest in deltas:
+                self._add(item_id, views, interest)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": len(self._pending), "dropped": self.dropped}
+
+
+stats_buffer = StatsBuffer()
+
+
+# ───────── filas de item_stats (las crean / borran las escrituras) ───────
+def create_stats(db: Session, ids: List[int]) -> None:
+    """Fila a cero para ítems nuevos (el volcado sólo hace UPDATE).  Sin commit."""
+    if ids:
+        db.execute(
+            insert(ItemStats).from_select(["item_id"], select(Item.id).where(Item.id.in_(ids)))
+        )
+
+
+def delete_stats(db: Session, ids: List[int]) -> None:
+    # ON DELETE CASCADE en Postgres; SQLite no aplica claves foráneas por defecto
+    if ids:
+        db.execute(delete(ItemStats).where(ItemStats.item_id.in_(ids)))
+
+
+def top_item_ids(db: Session, limit: int) -> List[int]:
+    """Los `limit` ítems más populares (con alguna visita o interés)."""
+    return list(
+        db.scalars(
+            select(ItemStats.item_id)
+            .where(ItemStats.popularity > 0)
+            .order_by(ItemStats.popularity.desc(), ItemStats.item_id.desc())
+            .limit(limit)
+        )
+    )
+
+
+# ───────── volcado ───────────────────────────────────────────────────────
+def _update_sql(dialect: str, deltas: List[Delta]) -> str:
+    # enteros propios (no entrada del usuario): literales en vez de miles de
+    # parámetros
+    rows = ", ".join(f"({int(i)}, {int(v)}, {int(r)})" for i, v, r in deltas)
+    weight = int(settings.STATS_INTEREST_WEIGHT)
+    assign = (
+        "views = item_stats.views + d.views, "
+        "interest = item_stats.interest + d.interest, "
+        f"popularity = item_stats.popularity + d.views + {weight} * d.interest"
+    )
+    if dialect == "postgresql":
+        return (
+            f"UPDATE item_stats SET {assign} "
+            f"FROM (VALUES {rows}) AS d (item_id, views, interest) "
+            "WHERE item_stats.item_id = d.item_id"
+        )
+    # SQLite no admite alias de columnas en (VALUES …): mismos datos vía CTE
+    return (
+        f"WITH d (item_id, views, interest) AS (VALUES {rows}) "
+        f"UPDATE item_stats SET {assign} FROM d WHERE item_stats.item_id = d.item_id"
+    )
+
+
+def flush_stats(db: Session) -> int:
+    """
+    Un UPDATE con hasta `STATS_FLUSH_MAX_ROWS` ítems pendientes; devuelve
+    cuántos.  Si falla, los deltas vuelven al buffer para el siguiente.
+    """
+    deltas = stats_buffer.take(settings.STATS_FLUSH_MAX_ROWS)
+    if not deltas:
+        return 0
+    try:
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            db.execute(text(f"SET LOCAL statement_timeout = {int(settings.STATS_FLUSH_TIMEOUT_MS)}"))
+        # orden por id (ver `take`): dos workers bloquean filas en el mismo orden
+        db.execute(text(_update_sql(dialect, deltas)))
+        bump_version(db, "stats")
+        db.commit()
+    except Exception:
+        db.rollback()
+        stats_buffer.restore(deltas)
+        raise
+    invalidate_stats()
+    return len(deltas)
@@ -0,0 +1,172 @@
+"""
+Índice en memoria para el autocompletado (GET /api/items/suggest).
+
+Términos: nombres de ítem y de categoría, normalizados (minúsculas, sin
+tildes).  Cada término se indexa por todos sus comienzos de palabra
+("taladro percutor" → "taladro percutor", "percutor") en un array ordenado;
+un prefijo se resuelve con `bisect` y los k más populares con un heap.
+
+Popularidad: nº de ítems con ese nombre / en esa categoría.  Se construye
+al arrancar y se actualiza con los eventos ``ITEM_CHANGED`` de `crud`; las
+escrituras de otros workers entran con la reconstrucción periódica
+(`SUGGEST_REBUILD_SECONDS`).
+"""
+from __future__ import annotations
+
+import bisect
+import heapq
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.events import ItemSnapshot
+from app.crud.category import category_registry
+from app.models.models import Item, ItemCategory
+from app.schemas.item import Suggestion
+
+# prefijos de 1-2 letras casan con media tabla: su top-k se memoriza
+_CACHED_PREFIX_LEN = 2
+
+TermKey = Tuple[str, object]                     # ("item", nombre normalizado) | ("category", id)
+
+
+def fold(text: str) -> str:
+    """'Cámara  Réflex' → 'camara reflex'."""
+    if text.isascii():
+        return " ".join(text.casefold().split())
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def _word_starts(norm: str) -> List[str]:
+    words = norm.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class _Term:
+    __slots__ = ("kind", "text", "norm", "ref", "count")
+
+    def __init__(self, kind: str, text: str, norm: str, ref: Optional[int]):
+        self.kind = kind
+        self.text = text                         # forma mostrada (primera vista)
+        self.norm = norm
+        self.ref = ref                           # id de categoría
+        self.count = 0
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._terms: Dict[TermKey, _Term] = {}
+        self._keys: List[Tuple[str, TermKey]] = []        # ordenado
+        self._top: Dict[Tuple[str, int], List[_Term]] = {}
+        self._lock = threading.Lock()
+
+    # ───────── construcción ──────────────────────────────────────────────
+    def build(self, db: Session) -> int:
+        """Reconstrucción completa desde la BD (arranque / periódica)."""
+        names = Counter(db.scalars(select(Item.name)))
+        per_category = dict(
+            db.execute(
+                select(ItemCategory.category_id, func.count()).group_by(ItemCategory.category_id)
+            ).all()
+        )
+        terms: Dict[TermKey, _Term] = {}
+        for name, n in names.items():
+            norm = fold(name)
+            term = terms.setdefault(("item", norm), _Term("item", name, norm, None))
+            term.count += n
+        for cat in category_registry.snapshot(db).categories:
+            term = _Term("category", cat.name, fold(cat.name), cat.id)
+            term.count = per_category.get(cat.id, 0)
+            terms[("category", cat.id)] = term
+
+        keys = sorted((start, key) for key, t in terms.items() for start in _word_starts(t.norm))
+        with self._lock:
+            self._terms, self._keys, self._top = terms, keys, {}
+        return len(terms)
+
+    # ───────── actualización incremental ─────────────────────────────────
+    def _insert(self, key: TermKey, term: _Term) -> None:
+        self._terms[key] = term
+        for start in _word_starts(term.norm):
+            bisect.insort(self._keys, (start, key))
+
+    def _remove(self, key: TermKey) -> None:
+        term = self._terms.pop(key)
+        for start in _word_starts(term.norm):
+            i = bisect.bisect_left(self._keys, (start, key))
+            if i < len(self._keys) and self._keys[i] == (start, key):
+                del self._keys[i]
+
+    def _bump(self, key: TermKey, delta: int, text: str) -> None:
+        term = self._terms.get(key)
+        if term is None:
+            if delta <= 0:
+                return
+            term = _Term("item", text, key[1], None)
+            self._insert(key, term)
+        term.count += delta
+        # un nombre desaparece con su último ítem (las categorías se quedan)
+        if term.count <= 0:
+            self._remove(key)
+
+    def _apply(self, snap: ItemSnapshot, delta: int) -> None:
+        self._bump(("item", fold(snap.name)), delta, snap.name)
+        for cat_id in snap.category_ids:
+            key = ("category", cat_id)
+            if key not in self._terms:
+                # categoría creada después del último build: el registro ya la tiene
+                cat = category_registry.cached(cat_id)
+                if cat is None:
+                    continue
+                self._insert(key, _Term("category", cat.name, fold(cat.name), cat.id))
+            self._terms[key].count += delta
+
+    def on_item_changed(self, before: Optional[ItemSnapshot], after: Optional[ItemSnapshot]) -> None:
+        with self._lock:
+            if before is not None:
+                self._apply(before, -1)
+            if after is not None:
+                self._apply(after, +1)
+            self._top = {}
+
+    # ───────── consulta ──────────────────────────────────────────────────
+    def _matches(self, prefix: str) -> Iterable[_Term]:
+        seen = set()
+        i = bisect.bisect_left(self._keys, (prefix,))
+        keys, terms = self._keys, self._terms
+        while i < len(keys) and keys[i][0].startswith(prefix):
+            key = keys[i][1]
+            if key not in seen:
+                seen.add(key)
+                yield terms[key]
+            i += 1
+
+    def suggest(self, q: str, limit: int) -> List[Suggestion]:
+        prefix = fold(q)
+        if not prefix:
+            return []
+        with self._lock:
+            cache_key = (prefix, limit)
+            top = self._top.get(cache_key)
+            if top is None:
+                top = heapq.nlargest(limit, self._matches(prefix), key=lambda t: (t.count, -len(t.norm)))
+                if len(prefix) <= _CACHED_PREFIX_LEN:
+                    self._top[cache_key] = top
+            return [
+                Suggestion(text=t.text, kind=t.kind, category_id=t.ref, count=t.count) for t in top
+            ]
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+
+suggest_index = SuggestIndex()
+
+events.subscribe(events.ITEM_CHANGED, suggest_index.on_item_changed)
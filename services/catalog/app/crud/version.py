@@ -0,0 +1,29 @@
+from typing import Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.models import CatalogVersion, Item
+
+
+def get_version(db: Session, name: str) -> int:
+    return db.scalar(select(CatalogVersion.version).where(CatalogVersion.name == name)) or 0
+
+
+def get_versions(db: Session) -> Dict[str, int]:
+    """Todas las versiones en una sola consulta."""
+    return dict(db.execute(select(CatalogVersion.name, CatalogVersion.version)).all())
+
+
+def bump_version(db: Session, name: str) -> None:
+    """Se llama dentro de la transacción de escritura, antes del commit."""
+    db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.name == name)
+        .values(version=CatalogVersion.version + 1)
+    )
+
+
+def get_item_version(db: Session, item_id: int) -> Optional[int]:
+    """Versión del ítem sin cargar la entidad (None si no existe)."""
+    return db.scalar(select(Item.version).where(Item.id == item_id))
@@ -3,7 +3,7 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
 
-from app.models.database import SessionLocal
+from app.models.database import AsyncSessionLocal, SessionLocal
 from app.core.config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="dummy")  # no lo usamos, solo valida header
@@ -17,6 +17,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """AsyncSession para los endpoints async (sólo con DB_ASYNC=true)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_current_username(token: str = Depends(oauth2_scheme)) -> str:
     """Devuelve `sub` del JWT emitido por Auth."""
     cred_exc = HTTPException(
@@ -1,10 +1,18 @@
 # services/catalog/app/main.py
+import asyncio
+import logging
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 
-from app.api import categories, items
-from app.models.database import Base, engine
+from app import crud
+from app.api import categories, health, items, metrics, warmup
+from app.core.config import settings
+from app.models.database import Base, SessionLocal, async_engine, engine
 import app.models.models                         #  noqa: F401
 
+log = logging.getLogger(__name__)
+
 app = FastAPI(
     title="rental-mvp – Catalog Service",
     docs_url="/docs",
@@ -15,6 +23,105 @@ app = FastAPI(
 @app.on_event("startup")
 def _init_db() -> None:
     Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        crud.category_registry.load(db)
+        crud.suggest_index.build(db)
+        if settings.CATEGORY_INDEX:
+            crud.category_index.build(db)
+
+
+def _rebuild(index) -> None:
+    with SessionLocal() as db:
+        index.build(db)
+
+
+def _flush_stats() -> None:
+    with SessionLocal() as db:
+        crud.flush_stats(db)
+
+
+def _flush_query_log() -> None:
+    with SessionLocal() as db:
+        crud.flush_query_log(db)
+
+
+def _sync_availability() -> None:
+    with SessionLocal() as db:
+        crud.sync_availability(db)
+
+
+async def _periodic(seconds: int, fn, *args, run_now: bool = False) -> None:
+    """`fn(*args)` en el threadpool cada `seconds` (0 = sólo si `run_now`)."""
+    while True:
+        if not run_now:
+            if seconds <= 0:
+                return
+            await asyncio.sleep(seconds)
+        run_now = False
+        try:
+            await run_in_threadpool(fn, *args)
+        except Exception:                        # noqa: BLE001
+            log.exception("tarea periódica %s falló", getattr(fn, "__name__", fn))
+
+
+_background: list = []
+
+
+@app.on_event("startup")
+async def _start_background() -> None:
+    # /health/ready en 503 hasta que termine (o pase el plazo)
+    warmup.warmup_state.start()
+    crud.item_cache.start()
+    crud.change_feed.bind(asyncio.get_running_loop())
+    _background.append(asyncio.create_task(run_in_threadpool(warmup.run_warmup)))
+    _background.append(
+        asyncio.create_task(_periodic(settings.SUGGEST_REBUILD_SECONDS, _rebuild, crud.suggest_index))
+    )
+    # el índice de parecidos se construye en segundo plano: no retrasa el arranque
+    _background.append(
+        asyncio.create_task(
+            _periodic(settings.SIMILAR_REBUILD_SECONDS, _rebuild, crud.similar_index, run_now=True)
+        )
+    )
+    if settings.CATEGORY_INDEX:
+        _background.append(
+            asyncio.create_task(
+                _periodic(settings.CATEGORY_INDEX_RESYNC_SECONDS, _rebuild, crud.category_index)
+            )
+        )
+    if settings.RENTALS_API_BASE:
+        _background.append(
+            asyncio.create_task(
+                _periodic(settings.AVAILABILITY_SYNC_SECONDS, _sync_availability, run_now=True)
+            )
+        )
+    _background.append(asyncio.create_task(_periodic(settings.STATS_FLUSH_SECONDS, _flush_stats)))
+    _background.append(
+        asyncio.create_task(_periodic(settings.QUERY_LOG_FLUSH_SECONDS, _flush_query_log))
+    )
+
+
+@app.on_event("shutdown")
+async def _close_async_db() -> None:
+    for task in _background:
+        task.cancel()
+    crud.item_cache.stop()
+    # último volcado de contadores (lo que no quepa en él se pierde)
+    for flush in (_flush_stats, _flush_query_log):
+        try:
+            await run_in_threadpool(flush)
+        except Exception:                        # noqa: BLE001
+            log.exception("volcado final %s falló", flush.__name__)
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+# DB_ASYNC: las lecturas async van primero y ganan a sus gemelas síncronas
+if settings.DB_ASYNC:
+    app.include_router(categories.async_router, prefix="/api/categories", tags=["categories"])
+    app.include_router(items.async_router,      prefix="/api/items",      tags=["items"])
 
 app.include_router(categories.router, prefix="/api/categories", tags=["categories"])
 app.include_router(items.router,      prefix="/api/items",      tags=["items"])
+app.include_router(metrics.router,    prefix="/api/metrics",    tags=["metrics"])
+app.include_router(health.router,     prefix="/health",         tags=["health"])
@@ -1,2 +1,13 @@
 # importa modelos para que Alembic los detecte
-from .models import Category, Item, ItemImage  # noqa: F401
\ No newline at end of file
+from .models import (  # noqa: F401
+    CatalogVersion,
+    Category,
+    Item,
+    ItemCategory,
+    ItemImage,
+    ItemListing,
+    ItemStats,
+    QueryFrequency,
+    SyncWatermark,
+)
+from . import search  # noqa: F401  (DDL del índice de búsqueda)
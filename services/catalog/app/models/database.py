@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -8,4 +10,40 @@ connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith(
 engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, echo=True)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+
+# ───────── motor async (DB_ASYNC) ─────────────────────────────────────────
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_url(url: str) -> str:
+    """Misma BD con el driver async: postgresql+asyncpg / sqlite+aiosqlite."""
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"DB_ASYNC no soporta {backend}")
+    return u.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def _build_async_engine():
+    url = async_url(settings.DATABASE_URL)
+    if url.startswith("sqlite"):
+        return create_async_engine(url, echo=True)
+    return create_async_engine(
+        url,
+        echo=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
+
+
+# sólo se crea (e importa el driver) si está activado
+async_engine = _build_async_engine() if settings.DB_ASYNC else None
+
+# expire_on_commit=False: tras el commit no hay lazy-load implícito en async
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
@@ -2,15 +2,23 @@ from __future__ import annotations
 
 from typing import List
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Boolean,
     Column,
+    DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    JSON,
     String,
     Table,
+    event,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from .database import Base
 
@@ -20,8 +28,33 @@ item_categories = Table(
     Base.metadata,
     Column("item_id", Integer, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True),
     Column("category_id", Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True),
+    # filtro por categoría: EXISTS (… WHERE category_id IN (…) AND item_id = items.id)
+    Index("ix_item_categories_category_id_item_id", "category_id", "item_id"),
 )
 
+
+class ItemCategory(Base):
+    """Fila de `item_categories`: basta el id; el nombre sale del registro en memoria."""
+
+    __table__ = item_categories
+
+
+class CatalogVersion(Base):
+    """Contador global por recurso ("items", "categories", "stats") → ETag de listados."""
+
+    __tablename__ = "catalog_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+event.listen(
+    CatalogVersion.__table__,
+    "after_create",
+    DDL("INSERT INTO catalog_versions (name, version) VALUES ('items', 0), ('categories', 0), ('stats', 0)"),
+)
+
+
 class ItemImage(Base):
     __tablename__ = "item_images"
 
@@ -38,7 +71,9 @@ class Category(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True, index=True, nullable=False)
 
-    items = relationship("Item", secondary=item_categories, back_populates="categories")
+    items = relationship(
+        "Item", secondary=item_categories, back_populates="categories", viewonly=True
+    )
 
 
 class Item(Base):
@@ -52,13 +87,35 @@ class Item(Base):
     # destacado (legacy)
     image_url = Column(String)
 
+    # URLs de imagen en orden (máx. 6): fuente de las lecturas.  Mientras
+    # dure la transición también se escribe `item_images` (IMAGES_DUAL_WRITE)
+    image_urls = Column(
+        ARRAY(String).with_variant(JSON(), "sqlite"),
+        nullable=False,
+        default=list,
+    )
+
     # ← vínculo al propietario (micro-servicio auth)
     owner_username = Column(String, index=True, nullable=False)
 
     available = Column(Boolean, default=True)
 
-    # relaciones
-    categories = relationship("Category", secondary=item_categories, back_populates="items")
+    # se incrementa en cada escritura → ETag del ítem
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # búsqueda de texto (trigger en Postgres; en SQLite se usa FTS5)
+    search_vector = deferred(Column(TSVECTOR().with_variant(String, "sqlite")))
+
+    # relaciones (los vínculos se escriben vía `category_links`)
+    categories = relationship(
+        "Category", secondary=item_categories, back_populates="items", viewonly=True
+    )
+    category_links = relationship(
+        "ItemCategory",
+        cascade="all, delete-orphan",
+        order_by="ItemCategory.category_id",
+    )
+    # legacy: sólo escritura durante la transición a `image_urls`
     images = relationship(
         "ItemImage",
         back_populates="item",
@@ -66,7 +123,107 @@ class Item(Base):
         order_by="ItemImage.id",
     )
 
-    # helper
+    __table_args__ = (
+        # keyset pagination: (clave de orden, id) → WHERE (col, id) > (…)
+        Index("ix_items_price_per_h_id", "price_per_h", "id"),
+        Index("ix_items_name_id", "name", "id"),
+        # filtro `available` (+ rango de precio) ordenado por precio / id
+        Index("ix_items_available_price_per_h_id", "available", "price_per_h", "id"),
+        Index("ix_items_available_id", "available", "id"),
+        # listado público habitual: sólo disponibles, por nombre (parcial;
+        # la condición es la que genera `Item.available == True`)
+        Index(
+            "ix_items_name_id_available",
+            "name",
+            "id",
+            postgresql_where=text("available = true"),
+            sqlite_where=text("available = 1"),
+        ),
+    )
+
+    # helpers
     @property
-    def image_urls(self) -> List[str]:
-        return [img.url for img in self.images]
\ No newline at end of file
+    def category_ids(self) -> List[int]:
+        return [link.category_id for link in self.category_links]
+
+
+class ItemListing(Base):
+    """
+    Read model de listados: una fila por ítem con las URLs de imagen y las
+    categorías ya resueltas, para leer sin JOINs.  Lo mantienen las
+    escrituras de `crud` en la misma transacción (ver crud/listing.py).
+    """
+
+    __tablename__ = "item_listings"
+
+    item_id = Column(Integer, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String, nullable=False)
+    description = Column(String)
+    price_per_h = Column(Float, nullable=False)
+    available = Column(Boolean)
+    owner_username = Column(String, index=True, nullable=False)
+    image_url = Column(String)
+    # JSON (no JSONB): conserva el orden de las listas tal cual se escriben
+    image_urls = Column(JSON, nullable=False)
+    category_ids = Column(JSON, nullable=False)
+    category_names = Column(JSON, nullable=False)
+
+
+class ItemStats(Base):
+    """
+    Contadores por ítem para ``order_by=popular``.  Una fila por ítem
+    (creada con él); sólo la actualiza el volcado diferido de crud/stats.py.
+    """
+
+    __tablename__ = "item_stats"
+
+    item_id = Column(Integer, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True)
+    views = Column(BigInteger, nullable=False, default=0, server_default="0")
+    interest = Column(BigInteger, nullable=False, default=0, server_default="0")
+    # views + STATS_INTEREST_WEIGHT · interest, mantenido por el volcado
+    popularity = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # order_by=popular: recorrido del índice + LIMIT
+        Index("ix_item_stats_popularity_item_id", "popularity", "item_id"),
+    )
+
+
+class QueryFrequency(Base):
+    """
+    Veces que se ha pedido cada combinación de parámetros de los listados
+    y facetas (clave normalizada de la caché).  De aquí sale qué
+    precalentar al arrancar (ver app/api/warmup.py).
+    """
+
+    __tablename__ = "query_frequencies"
+
+    namespace = Column(String, primary_key=True)            # "items" | "facets"
+    digest = Column(String(40), primary_key=True)           # params_digest(params)
+    params = Column(JSON, nullable=False)
+    hits = Column(BigInteger, nullable=False, default=0, server_default="0")
+    last_seen = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("ix_query_frequencies_namespace_hits", "namespace", "hits"),)
+
+
+class SyncWatermark(Base):
+    """
+    Hasta dónde se ha procesado un feed de otro servicio (una fila por
+    origen; "rentals" → crud/availability.py).  La fila se bloquea durante
+    cada lote: un solo worker sincroniza a la vez.
+    """
+
+    __tablename__ = "sync_watermarks"
+
+    name = Column(String, primary_key=True)
+    value = Column(String, nullable=True)                   # opaca; la da el feed (None = desde el inicio)
+    source_at = Column(DateTime, nullable=True)             # hora del último cambio procesado (origen)
+    synced_at = Column(DateTime(timezone=True), nullable=True)
+
+
+event.listen(
+    SyncWatermark.__table__,
+    "after_create",
+    DDL("INSERT INTO sync_watermarks (name) VALUES ('rentals')"),
+)
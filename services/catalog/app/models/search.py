@@ -0,0 +1,97 @@
+"""
+Índice de búsqueda de texto para `items` (nombre + descripción).
+
+* Postgres → columna `search_vector` (tsvector, config `es_unaccent`)
+  mantenida por trigger, índice GIN y trigramas sobre el nombre para
+  tolerar erratas.
+* SQLite   → tabla virtual FTS5 (`items_fts`, contenido externo) con
+  `remove_diacritics`, para que los tests locales usen la misma ruta; su
+  vocabulario (`items_fts_vocab`, fts5vocab) sirve para las erratas.
+
+En producción el esquema lo crea Alembic (20250717_0004); estos DDL sólo
+se ejecutan cuando `create_all()` crea la tabla desde cero.
+"""
+from __future__ import annotations
+
+from sqlalchemy import DDL, event
+
+from .models import Item
+
+SEARCH_CONFIG = "es_unaccent"
+FTS_TABLE = "items_fts"
+FTS_VOCAB_TABLE = "items_fts_vocab"
+
+_POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # unaccent() no es IMMUTABLE → envoltorio para poder indexarlo
+    """
+    CREATE OR REPLACE FUNCTION catalog_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent', $1) $$
+    """,
+    """
+    DO $$ BEGIN
+        CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+        ALTER TEXT SEARCH CONFIGURATION es_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    EXCEPTION WHEN unique_violation THEN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION items_search_vector_update() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('es_unaccent', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('es_unaccent', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END $$
+    """,
+    """
+    CREATE TRIGGER items_search_vector_trg
+    BEFORE INSERT OR UPDATE OF name, description ON items
+    FOR EACH ROW EXECUTE FUNCTION items_search_vector_update()
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_items_search_vector ON items USING gin (search_vector)",
+    """
+    CREATE INDEX IF NOT EXISTS ix_items_name_trgm
+    ON items USING gin (catalog_unaccent(lower(name)) gin_trgm_ops)
+    """,
+]
+
+_SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='items', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_VOCAB_TABLE} USING fts5vocab({FTS_TABLE}, 'col')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE OF name, description ON items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+for _stmt in _POSTGRES_DDL:
+    event.listen(Item.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+for _stmt in _SQLITE_DDL:
+    event.listen(Item.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
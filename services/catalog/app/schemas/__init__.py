@@ -1,5 +1,17 @@
 from .category import CategoryCreate, CategoryOut
-from .item import ItemCreate, ItemUpdate, ItemOut
+from .item import (
+    AvailabilityFacet,
+    CategoryFacet,
+    ItemBatchOut,
+    ItemFacetsOut,
+    ItemCreate,
+    ItemImportError,
+    ItemImportReport,
+    ItemOut,
+    ItemUpdate,
+    PriceHistogram,
+    Suggestion,
+)
 
 __all__ = [
     "CategoryCreate",
@@ -7,4 +19,12 @@ __all__ = [
     "ItemCreate",
     "ItemUpdate",
     "ItemOut",
+    "ItemBatchOut",
+    "ItemImportError",
+    "ItemImportReport",
+    "ItemFacetsOut",
+    "CategoryFacet",
+    "AvailabilityFacet",
+    "PriceHistogram",
+    "Suggestion",
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # services/catalog/app/schemas/item.py
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, List, Literal, Optional
 
 from pydantic import (
     BaseModel,
@@ -59,3 +59,66 @@ class ItemOut(ItemBase):
     image_url: Optional[UrlStr] = None  # compat con versiones antiguas
 
     model_config = {"from_attributes": True}
+
+    @classmethod
+    def from_item(cls, item: Any, categories: List[CategoryOut]) -> "ItemOut":
+        """Desde el ORM, con las categorías ya resueltas (registro en memoria)."""
+        return cls(
+            id=item.id,
+            name=item.name,
+            description=item.description,
+            price_per_h=item.price_per_h,
+            available=item.available,
+            owner_username=item.owner_username,
+            categories=categories,
+            image_urls=item.image_urls,
+            image_url=item.image_url,
+        )
+
+
+class ItemBatchOut(BaseModel):
+    items: List[ItemOut]          # en el orden pedido
+    missing: List[int]            # ids que no existen
+
+
+class ItemImportError(BaseModel):
+    row: int                      # nº de línea en el fichero
+    error: str
+
+
+class ItemImportReport(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: List[ItemImportError] = []        # recortado a IMPORT_MAX_ERRORS
+
+
+class CategoryFacet(BaseModel):
+    id: int
+    name: str
+    count: int
+
+
+class AvailabilityFacet(BaseModel):
+    available: int
+    unavailable: int
+
+
+class PriceHistogram(BaseModel):
+    min: Optional[float]
+    max: Optional[float]
+    edges: List[float]            # len(counts) + 1 límites
+    counts: List[int]
+
+
+class ItemFacetsOut(BaseModel):
+    total: int
+    categories: List[CategoryFacet]           # de más a menos ítems
+    availability: AvailabilityFacet
+    price: PriceHistogram
+
+
+class Suggestion(BaseModel):
+    text: str
+    kind: Literal["item", "category"]
+    category_id: Optional[int] = None         # sólo kind == "category"
+    count: int                                # ítems con ese nombre / en esa categoría
@@ -0,0 +1,23 @@
+"""Composite indexes for keyset pagination
+
+Revision ID: 20250716_0003
+Revises: 20250714_0002
+Create Date: 2025‑07‑16 12:00:00
+"""
+from alembic import op
+
+revision = "20250716_0003"
+down_revision = "20250714_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # WHERE (price_per_h, id) > (:v, :id) ORDER BY price_per_h, id
+    op.create_index("ix_items_price_per_h_id", "items", ["price_per_h", "id"])
+    op.create_index("ix_items_name_id", "items", ["name", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_name_id", table_name="items")
+    op.drop_index("ix_items_price_per_h_id", table_name="items")
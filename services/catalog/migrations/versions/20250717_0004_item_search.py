@@ -0,0 +1,82 @@
+"""Full-text search on items (tsvector + unaccent + trigram)
+
+Revision ID: 20250717_0004
+Revises: 20250716_0003
+Create Date: 2025‑07‑17 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250717_0004"
+down_revision = "20250716_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # unaccent() es STABLE → envoltorio IMMUTABLE para poder indexarlo
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION catalog_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent', $1) $$
+        """
+    )
+
+    # "electronica" ≡ "Electrónica"
+    op.execute("CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish)")
+    op.execute(
+        """
+        ALTER TEXT SEARCH CONFIGURATION es_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem
+        """
+    )
+
+    op.add_column("items", sa.Column("search_vector", postgresql.TSVECTOR()))
+
+    op.execute(
+        """
+        CREATE FUNCTION items_search_vector_update() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('es_unaccent', coalesce(NEW.name, '')), 'A') ||
+                setweight(to_tsvector('es_unaccent', coalesce(NEW.description, '')), 'B');
+            RETURN NEW;
+        END $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER items_search_vector_trg
+        BEFORE INSERT OR UPDATE OF name, description ON items
+        FOR EACH ROW EXECUTE FUNCTION items_search_vector_update()
+        """
+    )
+
+    # back-fill de las filas existentes (dispara el trigger)
+    op.execute("UPDATE items SET name = name")
+
+    op.create_index(
+        "ix_items_search_vector", "items", ["search_vector"], postgresql_using="gin"
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_items_name_trgm
+        ON items USING gin (catalog_unaccent(lower(name)) gin_trgm_ops)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_items_name_trgm")
+    op.drop_index("ix_items_search_vector", table_name="items")
+    op.execute("DROP TRIGGER IF EXISTS items_search_vector_trg ON items")
+    op.execute("DROP FUNCTION IF EXISTS items_search_vector_update()")
+    op.drop_column("items", "search_vector")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS es_unaccent")
+    op.execute("DROP FUNCTION IF EXISTS catalog_unaccent(text)")
@@ -0,0 +1,32 @@
+"""Item and catalog version counters (ETag)
+
+Revision ID: 20250718_0005
+Revises: 20250717_0004
+Create Date: 2025‑07‑18 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250718_0005"
+down_revision = "20250717_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "items",
+        sa.Column("version", sa.Integer, nullable=False, server_default=sa.text("1")),
+    )
+
+    versions = op.create_table(
+        "catalog_versions",
+        sa.Column("name", sa.String, primary_key=True),
+        sa.Column("version", sa.Integer, nullable=False, server_default=sa.text("0")),
+    )
+    op.bulk_insert(versions, [{"name": "items", "version": 0}, {"name": "categories", "version": 0}])
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_versions")
+    op.drop_column("items", "version")
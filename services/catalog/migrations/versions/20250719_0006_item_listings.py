@@ -0,0 +1,72 @@
+"""Denormalized item_listings read model
+
+Revision ID: 20250719_0006
+Revises: 20250718_0005
+Create Date: 2025‑07‑19 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250719_0006"
+down_revision = "20250718_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "item_listings",
+        sa.Column(
+            "item_id",
+            sa.Integer,
+            sa.ForeignKey("items.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("name", sa.String, nullable=False),
+        sa.Column("description", sa.String),
+        sa.Column("price_per_h", sa.Float, nullable=False),
+        sa.Column("available", sa.Boolean),
+        sa.Column("owner_username", sa.String, nullable=False),
+        sa.Column("image_url", sa.String),
+        sa.Column("image_urls", sa.JSON, nullable=False),
+        sa.Column("category_ids", sa.JSON, nullable=False),
+        sa.Column("category_names", sa.JSON, nullable=False),
+    )
+    op.create_index("ix_item_listings_owner_username", "item_listings", ["owner_username"])
+
+    # relleno inicial (mismo orden que crud/listing.py: imágenes por id,
+    # categorías por id)
+    op.execute(
+        """
+        INSERT INTO item_listings (
+            item_id, name, description, price_per_h, available,
+            owner_username, image_url, image_urls, category_ids, category_names
+        )
+        SELECT
+            i.id, i.name, i.description, i.price_per_h, i.available,
+            i.owner_username, i.image_url,
+            COALESCE(
+                (SELECT json_agg(im.url ORDER BY im.id)
+                   FROM item_images im WHERE im.item_id = i.id),
+                '[]'::json
+            ),
+            COALESCE(
+                (SELECT json_agg(c.id ORDER BY c.id)
+                   FROM item_categories ic JOIN categories c ON c.id = ic.category_id
+                  WHERE ic.item_id = i.id),
+                '[]'::json
+            ),
+            COALESCE(
+                (SELECT json_agg(c.name ORDER BY c.id)
+                   FROM item_categories ic JOIN categories c ON c.id = ic.category_id
+                  WHERE ic.item_id = i.id),
+                '[]'::json
+            )
+        FROM items i
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_item_listings_owner_username", table_name="item_listings")
+    op.drop_table("item_listings")
@@ -0,0 +1,50 @@
+"""Indexes for the listing filters (available / price / categories)
+
+Revision ID: 20250720_0007
+Revises: 20250719_0006
+Create Date: 2025‑07‑20 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250720_0007"
+down_revision = "20250719_0006"
+branch_labels = None
+depends_on = None
+
+# (nombre, tabla, columnas, condición parcial)
+INDEXES = [
+    # available = ? [AND price_per_h BETWEEN …] ORDER BY price_per_h, id
+    ("ix_items_available_price_per_h_id", "items", ["available", "price_per_h", "id"], None),
+    # available = ? ORDER BY id  /  COUNT(*) WHERE available = ?
+    ("ix_items_available_id", "items", ["available", "id"], None),
+    # listado público: sólo disponibles ORDER BY name, id
+    ("ix_items_name_id_available", "items", ["name", "id"], "available = true"),
+    # EXISTS (… WHERE category_id IN (…) AND item_id = items.id)
+    (
+        "ix_item_categories_category_id_item_id",
+        "item_categories",
+        ["category_id", "item_id"],
+        None,
+    ),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY: no bloquea escrituras en tablas grandes (fuera de transacción)
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,53 @@
+"""Ordered image URL array on items (item_images kept for dual-write)
+
+Revision ID: 20250721_0008
+Revises: 20250720_0007
+Create Date: 2025‑07‑21 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20250721_0008"
+down_revision = "20250720_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "items",
+        sa.Column(
+            "image_urls",
+            postgresql.ARRAY(sa.String),
+            nullable=False,
+            server_default=sa.text("'{}'"),
+        ),
+    )
+    # datos: mismo orden que la relación `Item.images` (por id)
+    op.execute(
+        """
+        UPDATE items i
+           SET image_urls = sub.urls
+          FROM (SELECT item_id, array_agg(url ORDER BY id) AS urls
+                  FROM item_images GROUP BY item_id) sub
+         WHERE sub.item_id = i.id
+        """
+    )
+    # `item_images` se mantiene (IMAGES_DUAL_WRITE) hasta que ninguna versión
+    # desplegada lo lea; se eliminará en una migración posterior
+
+
+def downgrade() -> None:
+    # las escrituras sin dual-write sólo están en la columna → de vuelta a la tabla
+    op.execute(
+        """
+        INSERT INTO item_images (item_id, url)
+        SELECT i.id, u.url
+          FROM items i
+          CROSS JOIN LATERAL unnest(i.image_urls) WITH ORDINALITY AS u(url, n)
+         WHERE NOT EXISTS (SELECT 1 FROM item_images im WHERE im.item_id = i.id)
+         ORDER BY i.id, u.n
+        """
+    )
+    op.drop_column("items", "image_urls")
@@ -0,0 +1,39 @@
+"""Item view / rental-interest counters (order_by=popular)
+
+Revision ID: 20250722_0009
+Revises: 20250721_0008
+Create Date: 2025‑07‑22 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250722_0009"
+down_revision = "20250721_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "item_stats",
+        sa.Column(
+            "item_id",
+            sa.Integer,
+            sa.ForeignKey("items.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("views", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+        sa.Column("interest", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+        sa.Column("popularity", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+    )
+    op.create_index("ix_item_stats_popularity_item_id", "item_stats", ["popularity", "item_id"])
+
+    # una fila por ítem: el volcado sólo hace UPDATE
+    op.execute("INSERT INTO item_stats (item_id) SELECT id FROM items")
+    op.execute("INSERT INTO catalog_versions (name, version) VALUES ('stats', 0)")
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM catalog_versions WHERE name = 'stats'")
+    op.drop_index("ix_item_stats_popularity_item_id", table_name="item_stats")
+    op.drop_table("item_stats")
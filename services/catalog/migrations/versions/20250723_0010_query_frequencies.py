@@ -0,0 +1,32 @@
+"""Recorded list/facet query frequencies (startup warmup)
+
+Revision ID: 20250723_0010
+Revises: 20250722_0009
+Create Date: 2025‑07‑23 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250723_0010"
+down_revision = "20250722_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "query_frequencies",
+        sa.Column("namespace", sa.String, primary_key=True),
+        sa.Column("digest", sa.String(40), primary_key=True),
+        sa.Column("params", sa.JSON, nullable=False),
+        sa.Column("hits", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+        sa.Column("last_seen", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_query_frequencies_namespace_hits", "query_frequencies", ["namespace", "hits"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_query_frequencies_namespace_hits", table_name="query_frequencies")
+    op.drop_table("query_frequencies")
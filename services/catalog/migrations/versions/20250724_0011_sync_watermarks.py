@@ -0,0 +1,28 @@
+"""Watermark of the rentals availability feed
+
+Revision ID: 20250724_0011
+Revises: 20250723_0010
+Create Date: 2025‑07‑24 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20250724_0011"
+down_revision = "20250723_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_watermarks",
+        sa.Column("name", sa.String, primary_key=True),
+        sa.Column("value", sa.String, nullable=True),
+        sa.Column("source_at", sa.DateTime, nullable=True),
+        sa.Column("synced_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("INSERT INTO sync_watermarks (name) VALUES ('rentals')")
+
+
+def downgrade() -> None:
+    op.drop_table("sync_watermarks")
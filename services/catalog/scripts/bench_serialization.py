@@ -0,0 +1,118 @@
+"""
+Micro-benchmark de serialización de listados: coste por ítem de una
+página de GET /api/items con FAST_SERIALIZATION desactivado (entidades ORM
+→ ItemOut → JSON) y activado (read model `item_listings` → dicts
+→ JSON).
+
+    cd services/catalog && python scripts/bench_serialization.py [--items 1000] [--rounds 20]
+
+Usa una BD SQLite temporal; mide sólo carga + serialización (sin HTTP).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_tmp = tempfile.mkdtemp(prefix="catalog-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/catalog.db"
+os.environ["CACHE_BACKEND"] = "none"
+os.environ.setdefault("SECRET_KEY", "bench")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import crud, schemas                                # noqa: E402
+from app.api.items import _ITEM_LIST, _out                   # noqa: E402
+from app.core.serialization import dump_rows, orjson         # noqa: E402
+from app.models.database import Base, SessionLocal, engine   # noqa: E402
+
+engine.echo = False
+
+_FILTERS = dict(
+    name=None,
+    min_price=None,
+    max_price=None,
+    available=None,
+    categories=None,
+    order_by=None,
+    order_dir=None,
+)
+
+
+def _seed(n_items: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        cat_ids = [
+            crud.create_category(db, schemas.CategoryCreate(name=f"cat-{i}")).id for i in range(8)
+        ]
+        rows = (
+            (
+                i,
+                {
+                    "name": f"Taladro percutor {i}",
+                    "description": "Bosch 800 W con maletín y juego de brocas",
+                    "price_per_h": 1 + i % 17,
+                    "image_urls": [f"/uploads/{i}-{k}.png" for k in range(3)],
+                    "categories": [cat_ids[i % 8], cat_ids[(i + 3) % 8]],
+                },
+                None,
+            )
+            for i in range(n_items)
+        )
+        crud.import_items(db, rows, owner_username="bench")
+
+
+def _best(fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--items", type=int, default=1000)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    _seed(args.items)
+    n = args.items
+    with SessionLocal() as db:
+        def load_entities():
+            db.expunge_all()
+            return crud.get_items(db, 0, n, rows=False, **_FILTERS)[0]
+
+        def load_rows():
+            return crud.get_items(db, 0, n, rows=True, **_FILTERS)[0]
+
+        entities = load_entities()
+        rows = load_rows()
+        assert _ITEM_LIST.dump_json([_out(db, i) for i in entities]) == dump_rows(rows)
+
+        results = {
+            "ItemOut + dump_json": (
+                _best(lambda: _ITEM_LIST.dump_json([_out(db, i) for i in entities]), args.rounds),
+                _best(
+                    lambda: _ITEM_LIST.dump_json([_out(db, i) for i in load_entities()]),
+                    args.rounds,
+                ),
+            ),
+            f"filas + {'orjson' if orjson else 'TypeAdapter'}": (
+                _best(lambda: dump_rows(rows), args.rounds),
+                _best(lambda: dump_rows(load_rows()), args.rounds),
+            ),
+        }
+
+    print(f"{n} ítems, mejor de {args.rounds} rondas (µs por ítem)")
+    print(f"{'modo':<24}{'serializar':>12}{'cargar + serializar':>22}")
+    for name, (ser, total) in results.items():
+        print(f"{name:<24}{ser / n * 1e6:>12.2f}{total / n * 1e6:>22.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
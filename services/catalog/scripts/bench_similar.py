@@ -0,0 +1,93 @@
+"""
+Micro-benchmark del índice de parecidos (GET /api/items/{id}/similar):
+tiempo de reconstrucción y latencia por consulta con N ítems sintéticos,
+con y sin prefiltro de categoría / precio.
+
+    cd services/catalog && python scripts/bench_similar.py [--items 100000] [--queries 500]
+
+Sólo el índice en memoria (sin BD ni HTTP).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings                          # noqa: E402
+from app.core.events import ItemSnapshot                      # noqa: E402
+from app.crud.similar import SimilarIndex                     # noqa: E402
+
+WORDS = (
+    "taladro percutor cámara réflex bicicleta montaña tienda campaña sierra "
+    "circular proyector kayak doble remolque escalera andamio hormigonera "
+    "altavoz mesa mezclas lijadora compresor generador barbacoa carpa"
+).split()
+DESCRIPTION = (
+    "con maletín batería cargador juego brocas trípode objetivo casco candado "
+    "bomba mochila cable alargador bolsa transporte manual instrucciones"
+).split()
+
+
+def _docs(n: int, n_categories: int):
+    rnd = random.Random(42)
+    for i in range(1, n + 1):
+        yield ItemSnapshot(
+            i,
+            " ".join(rnd.sample(WORDS, 3)) + f" {i}",
+            " ".join(rnd.choices(DESCRIPTION, k=12)),
+            "bench",
+            round(rnd.uniform(1, 500), 2),
+            rnd.random() > 0.2,
+            tuple(rnd.sample(range(1, n_categories + 1), 2)),
+        )
+
+
+def _ms(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.95)] * 1000
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--items", type=int, default=100_000)
+    ap.add_argument("--queries", type=int, default=500)
+    ap.add_argument("--categories", type=int, default=40)
+    args = ap.parse_args()
+
+    docs = list(_docs(args.items, args.categories))
+    index = SimilarIndex()
+    t0 = time.perf_counter()
+    index.build_from(docs)
+    print(
+        f"{args.items} ítems, {settings.SIMILAR_DIMS} dimensiones: "
+        f"reconstrucción {time.perf_counter() - t0:.1f}s"
+    )
+
+    rnd = random.Random(7)
+    cases = {
+        "sin prefiltro": dict(same_category=False),
+        "misma categoría": dict(same_category=True),
+        "categoría + precio ×2": dict(same_category=True, price_ratio=2.0),
+    }
+    print(f"{'consulta':<26}{'p50 ms':>9}{'p95 ms':>9}")
+    for label, kw in cases.items():
+        samples = []
+        for _ in range(args.queries):
+            doc = docs[rnd.randrange(len(docs))]
+            t0 = time.perf_counter()
+            index.similar(doc, 8, **kw)
+            samples.append(time.perf_counter() - t0)
+        p50, p95 = _ms(samples)
+        print(f"{label:<26}{p50:>9.2f}{p95:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
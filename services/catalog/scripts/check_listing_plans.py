@@ -0,0 +1,241 @@
+"""
+Regresión de planes de GET /api/items: siembra un catálogo grande, saca el
+plan de cada combinación filtro × orden (página de ids y COUNT) y falla
+(exit 1) si alguno recorre `items` o `item_categories` secuencialmente.
+
+    cd services/catalog && python scripts/check_listing_plans.py [--items 50000]
+    python scripts/check_listing_plans.py --database-url postgresql://…/catalog_bench
+
+Postgres: EXPLAIN (ANALYZE, FORMAT JSON) y se busca cualquier nodo
+"Seq Scan".  SQLite (por defecto, BD temporal): EXPLAIN QUERY PLAN y se
+busca "SCAN <tabla>" sin índice.  Con --database-url usar una BD
+desechable: se crean las tablas y se siembra si tiene menos ítems.
+
+También se comprueba el EXPLAIN de COUNT_STRATEGY=estimated con cada
+filtro: en Postgres se ejecuta con el engine síncrono y, si asyncpg está
+instalado, también como en DB_ASYNC (AsyncSession.run_sync sobre
+asyncpg).  En SQLite sólo se compila para psycopg2 (``%(name)s``) y
+asyncpg (``$n``) y se verifica que no quedan parámetros sin expandir
+(``POSTCOMPILE``) y que cada marcador tiene su valor.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+_ap.add_argument("--database-url")
+_ap.add_argument("--items", type=int, default=50_000)
+_ap.add_argument("--verbose", action="store_true", help="imprime los planes")
+ARGS = _ap.parse_args()
+
+os.environ["DATABASE_URL"] = ARGS.database_url or (
+    f"sqlite:///{tempfile.mkdtemp(prefix='catalog-plans-')}/catalog.db"
+)
+os.environ["CACHE_BACKEND"] = "none"
+os.environ.setdefault("SECRET_KEY", "plans")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, select, text                    # noqa: E402
+from sqlalchemy.dialects.postgresql import asyncpg, psycopg2  # noqa: E402
+
+from app import crud, schemas                                # noqa: E402
+from app.crud.item import _build_query, _estimate_count, _explain_sql, _filters  # noqa: E402
+from app.models.database import Base, SessionLocal, async_url, engine  # noqa: E402
+from app.models.models import Item                           # noqa: E402
+
+engine.echo = False
+
+N_CATEGORIES = 12
+PAGE = 20
+SCANNED_TABLES = ("items", "item_categories", "item_stats")
+
+FILTERS = {
+    "sin filtros": {},
+    "precio": {"min_price": 20, "max_price": 60},
+    "disponibles": {"available": True},
+    "no disponibles": {"available": False},
+    "disponibles + precio": {"available": True, "min_price": 20, "max_price": 60},
+    "categorías": {"categories": [1, 2]},
+    "categorías + disponibles": {"categories": [3], "available": True},
+    "texto": {"name": "taladro"},
+}
+ORDERS = [
+    (None, None),
+    ("price", "asc"),
+    ("price", "desc"),
+    ("name", "asc"),
+    ("id", "desc"),
+    ("popular", "desc"),
+]
+
+
+# ───────── datos ──────────────────────────────────────────────────────────
+def _seed(n_items: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        existing = db.scalar(select(func.count()).select_from(Item))
+        if existing >= n_items:
+            return
+        cat_ids = [c.id for c in crud.get_categories(db)]
+        for i in range(len(cat_ids), N_CATEGORIES):
+            cat_ids.append(crud.create_category(db, schemas.CategoryCreate(name=f"plan-{i}")).id)
+
+        rnd = random.Random(42)
+        words = ["taladro", "cámara", "bicicleta", "tienda", "sierra", "proyector", "kayak"]
+        rows = (
+            (
+                i,
+                {
+                    "name": f"{rnd.choice(words)} {rnd.choice(words)} {i}",
+                    "description": "generado por check_listing_plans",
+                    "price_per_h": round(rnd.uniform(1, 500), 2),
+                    "image_urls": [f"/uploads/plan-{i}.png"],
+                    "categories": rnd.sample(cat_ids, 2),
+                },
+                None,
+            )
+            for i in range(existing, n_items)
+        )
+        t0 = time.perf_counter()
+        crud.import_items(db, rows, owner_username="plans", batch_size=5000)
+        # un tercio no disponible: el filtro `available` es selectivo en ambos sentidos
+        db.execute(text("UPDATE items SET available = (id % 3 <> 0)"))
+        db.commit()
+        print(f"sembrados {n_items - existing} ítems en {time.perf_counter() - t0:.1f}s")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE" if engine.dialect.name == "postgresql" else "ANALYZE"))
+
+
+# ───────── planes ─────────────────────────────────────────────────────────
+def _sql(db, stmt) -> str:
+    return str(stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+
+
+def _pg_plan(db, sql: str):
+    """(nodos "Seq Scan" sobre tablas vigiladas, plan, ms)."""
+    raw = db.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    bad = []
+    stack = [plan["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in SCANNED_TABLES:
+            bad.append(f"Seq Scan on {node['Relation Name']}")
+        stack.extend(node.get("Plans", ()))
+    return bad, json.dumps(plan["Plan"], indent=1), plan["Execution Time"]
+
+
+_SQLITE_FULL_SCAN = re.compile(rf"^SCAN ({'|'.join(SCANNED_TABLES)})$")
+
+
+def _sqlite_plan(db, sql: str):
+    """(pasos "SCAN tabla" sin índice, plan, ms de ejecución)."""
+    steps = [r[3] for r in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    bad = [s for s in steps if _SQLITE_FULL_SCAN.match(s.strip())]
+    t0 = time.perf_counter()
+    db.execute(text(sql)).all()
+    return bad, "\n".join(steps), (time.perf_counter() - t0) * 1000
+
+
+_NAMED_PARAM = re.compile(r"%\((\w+)\)s")
+_POSITIONAL_PARAM = re.compile(r"\$(\d+)")
+
+
+def _params_error(dialect, criteria):
+    """Error al compilar el EXPLAIN para `dialect`, o None."""
+    sql, params = _explain_sql(dialect, criteria)
+    if "POSTCOMPILE" in sql:
+        return "parámetros sin expandir: " + sql
+    if dialect.positional:
+        if not isinstance(params, tuple):
+            return f"{dialect.driver}: parámetros por nombre con marcadores posicionales"
+        used = {int(n) for n in _POSITIONAL_PARAM.findall(sql)}
+        if used != set(range(1, len(params) + 1)):
+            return f"{dialect.driver}: marcadores {sorted(used)} con {len(params)} parámetros"
+        return None
+    missing = set(_NAMED_PARAM.findall(sql)) - set(params)
+    return f"{dialect.driver}: faltan parámetros {sorted(missing)}" if missing else None
+
+
+async def _estimate_async(flt):
+    """`_estimate_count` como en DB_ASYNC: AsyncSession.run_sync sobre asyncpg."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    aengine = create_async_engine(async_url(engine.url.render_as_string(hide_password=False)))
+    try:
+        async with AsyncSession(aengine) as adb:
+            return await adb.run_sync(lambda db: _estimate_count(db, **flt))
+    finally:
+        await aengine.dispose()
+
+
+def _check_estimate(db, flt, criteria):
+    """Error del EXPLAIN de `_estimate_count` con estos filtros, o None."""
+    try:
+        if engine.dialect.name == "postgresql":
+            _estimate_count(db, **flt)
+            try:
+                import asyncpg as _  # noqa: F401
+            except ImportError:
+                return None
+            asyncio.run(_estimate_async(flt))
+            return None
+        for dialect in (psycopg2.dialect(), asyncpg.dialect()):
+            error = _params_error(dialect, criteria)
+            if error:
+                return error
+    except Exception as exc:                     # noqa: BLE001
+        return f"{type(exc).__name__}: {exc}"
+    return None
+
+
+def main() -> int:
+    _seed(ARGS.items)
+    explain = _pg_plan if engine.dialect.name == "postgresql" else _sqlite_plan
+    failures = 0
+
+    print(f"{'filtro':<26}{'orden':<14}{'consulta':<8}{'ms':>9}")
+    with SessionLocal() as db:
+        for (label, flt), (order_by, order_dir) in itertools.product(FILTERS.items(), ORDERS):
+            full = {
+                "name": None,
+                "min_price": None,
+                "max_price": None,
+                "available": None,
+                "categories": None,
+                **flt,
+            }
+            page = _build_query(db, order_by=order_by, order_dir=order_dir, **full).limit(PAGE)
+            criteria, _ = _filters(db, **full)
+            queries = [("ids", page)]
+            if order_by is None:                 # el COUNT no depende del orden
+                queries.append(("count", select(func.count()).select_from(Item).where(*criteria)))
+                error = _check_estimate(db, full, criteria)
+                failures += bool(error)
+                print(f"{label:<26}{'':<14}{'estimate':<8}{'':>9}{'  ✗ ' + error if error else ''}")
+
+            for kind, stmt in queries:
+                bad, plan, ms = explain(db, _sql(db, stmt))
+                failures += bool(bad)
+                order = f"{order_by or 'id'} {order_dir or ''}".strip()
+                print(f"{label:<26}{order:<14}{kind:<8}{ms:>9.2f}{'  ✗ ' + ', '.join(bad) if bad else ''}")
+                if ARGS.verbose or bad:
+                    print("    " + plan.replace("\n", "\n    "))
+
+    print("✅  sin scans secuenciales" if not failures else f"❌  {failures} plan(es) con fallos")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Presupuesto de SQL por endpoint: número exacto de sentencias y de filas
+leídas en cada GET del catálogo.  Falla (exit 1) si alguno se desvía, para
+que no vuelvan los JOINs categorías × imágenes ni los N+1.
+
+    cd services/catalog && python scripts/check_query_budget.py
+
+Usa una BD SQLite temporal y la caché de respuestas desactivada.  Los
+presupuestos dependen de FAST_SERIALIZATION (read model o entidades ORM) y
+de CATEGORY_INDEX.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+_tmp = tempfile.mkdtemp(prefix="catalog-budget-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/catalog.db"
+os.environ["CACHE_BACKEND"] = "none"
+os.environ["RENTALS_API_BASE"] = ""              # sin la sincronización de fondo: contaría sentencias
+os.environ.setdefault("SECRET_KEY", "budget")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient                    # noqa: E402
+from jose import jwt                                         # noqa: E402
+from sqlalchemy import event                                 # noqa: E402
+
+from app.core.config import settings                         # noqa: E402
+from app.main import app                                     # noqa: E402
+from app.models.database import engine                       # noqa: E402
+
+N_ITEMS = 60
+IMAGES = 3
+CATS = 2
+PAGE = 20
+VERSIONS = 3                     # filas de catalog_versions
+# CATEGORY_INDEX: el total de "list filtered" sale del índice, sin COUNT
+INDEXED_COUNT = settings.CATEGORY_INDEX
+
+
+# ───────── contadores (sentencias + filas leídas del cursor DBAPI) ────────
+class _Stats:
+    statements = 0
+    rows = 0
+
+    @classmethod
+    def reset(cls):
+        cls.statements = cls.rows = 0
+
+
+class _CountingCursor(sqlite3.Cursor):
+    def fetchone(self):
+        row = super().fetchone()
+        _Stats.rows += row is not None
+        return row
+
+    def fetchmany(self, *args):
+        rows = super().fetchmany(*args)
+        _Stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        _Stats.rows += len(rows)
+        return rows
+
+
+class _CountingConnection(sqlite3.Connection):
+    def cursor(self, factory=_CountingCursor):
+        return super().cursor(factory)
+
+
+@event.listens_for(engine, "do_connect")
+def _use_counting_connection(dialect, conn_rec, cargs, cparams):
+    cparams["factory"] = _CountingConnection
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    _Stats.statements += 1
+
+
+engine.echo = False
+
+
+# ───────── presupuestos ───────────────────────────────────────────────────
+def _budgets(item_id: int):
+    if not settings.FAST_SERIALIZATION:
+        return _entity_budgets(item_id)
+    listing_rows = PAGE * (1 + 1)                    # ids + item_listings
+    return [
+        # (nombre, path, params, autenticado, sentencias, filas)
+        # versiones + count + ids + item_listings
+        ("list", "/api/items/", {"limit": PAGE}, False, 4, VERSIONS + 1 + listing_rows),
+        ("list deep", "/api/items/", {"limit": PAGE, "skip": 40}, False, 4, VERSIONS + 1 + listing_rows),
+        (
+            "list filtered",
+            "/api/items/",
+            {"limit": PAGE, "available": True, "categories": [1, 2], "order_by": "price"},
+            False,
+            4 - INDEXED_COUNT,
+            VERSIONS + (not INDEXED_COUNT) + listing_rows,
+        ),
+        # versiones + ids (limit + 1) + item_listings
+        ("list cursor", "/api/items/", {"limit": PAGE, "cursor": ""}, False, 3, VERSIONS + 1 + listing_rows),
+        # versión + item_listings
+        ("detail", f"/api/items/{item_id}", {}, False, 2, 1 + 1),
+        # item_listings
+        ("me", "/api/items/me", {}, True, 1, N_ITEMS),
+        # sólo la versión: las filas salen del registro en memoria
+        ("categories", "/api/categories/", {}, False, 1, 1),
+    ]
+
+
+def _entity_budgets(item_id: int):
+    """FAST_SERIALIZATION=false: entidades ORM con relaciones en lote."""
+    listing_rows = PAGE * (1 + 1 + CATS)             # ids + items + links
+    return [
+        # (nombre, path, params, autenticado, sentencias, filas)
+        # versiones + count + ids + items + links
+        ("list", "/api/items/", {"limit": PAGE}, False, 5, VERSIONS + 1 + listing_rows),
+        ("list deep", "/api/items/", {"limit": PAGE, "skip": 40}, False, 5, VERSIONS + 1 + listing_rows),
+        (
+            "list filtered",
+            "/api/items/",
+            {"limit": PAGE, "available": True, "categories": [1, 2], "order_by": "price"},
+            False,
+            5 - INDEXED_COUNT,
+            VERSIONS + (not INDEXED_COUNT) + listing_rows,
+        ),
+        # versiones + ids (limit + 1) + items + links
+        ("list cursor", "/api/items/", {"limit": PAGE, "cursor": ""}, False, 4, VERSIONS + 1 + listing_rows),
+        # versión + item + links
+        ("detail", f"/api/items/{item_id}", {}, False, 3, 1 + 1 + CATS),
+        # items + links
+        ("me", "/api/items/me", {}, True, 2, N_ITEMS * (1 + CATS)),
+        # sólo la versión: las filas salen del registro en memoria
+        ("categories", "/api/categories/", {}, False, 1, 1),
+    ]
+
+
+def main() -> int:
+    token = jwt.encode({"sub": "budget"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    auth = {"Authorization": f"Bearer {token}"}
+    failures = 0
+
+    with TestClient(app) as client:
+        cat_ids = [
+            client.post("/api/categories/", json={"name": f"cat-{i}"}, headers=auth).json()["id"]
+            for i in range(CATS + 1)
+        ]
+        item_ids = []
+        for i in range(N_ITEMS):
+            r = client.post(
+                "/api/items/",
+                json={
+                    "name": f"item {i}",
+                    "price_per_h": 1 + i % 9,
+                    "image_urls": [f"/uploads/{i}-{n}.png" for n in range(IMAGES)],
+                    "categories": cat_ids[i % 2 : i % 2 + CATS],
+                },
+                headers=auth,
+            )
+            r.raise_for_status()
+            item_ids.append(r.json()["id"])
+
+        print(f"{'endpoint':<16}{'sentencias':>12}{'filas':>10}")
+        for name, path, params, authed, want_stmts, want_rows in _budgets(item_ids[0]):
+            _Stats.reset()
+            r = client.get(path, params=params, headers=auth if authed else {})
+            r.raise_for_status()
+            ok = (_Stats.statements, _Stats.rows) == (want_stmts, want_rows)
+            failures += not ok
+            print(
+                f"{name:<16}{_Stats.statements:>7} / {want_stmts:<3}{_Stats.rows:>5} / {want_rows:<4}"
+                f"{'' if ok else '  ✗'}"
+            )
+
+    print("✅  presupuesto OK" if not failures else f"❌  {failures} endpoint(s) fuera de presupuesto")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
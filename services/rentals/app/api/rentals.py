@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
+from app.core.config import settings
 from app.deps import get_db, get_current_username
 
 router = APIRouter()
@@ -34,7 +35,32 @@ async def my_rentals(
     username: str = Depends(get_current_username),
 ):
     rentals = crud.get_rentals_by_user(db, username)
-    return [await _with_item(r) for r in rentals]
+    return await _with_items(rentals)
+
+
+# ────────────── feed de disponibilidad (lo consume el catálogo) ───────────
+@router.get("/changes", response_model=schemas.RentalChangesOut)
+def availability_changes(
+    after: Optional[str] = Query(None, description="`watermark` de la respuesta anterior"),
+    limit: int = Query(1000, ge=1, le=settings.CHANGES_LIMIT_MAX),
+    db: Session = Depends(get_db),
+):
+    """
+    Disponibilidad actual de los ítems cuyos alquileres se han creado,
+    cambiado, empezado o terminado desde `after` (sin `after`, desde el
+    principio).
+    """
+    try:
+        mark = crud.parse_watermark(after) if after else None
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
+    items, mark, has_more = crud.get_availability_changes(db, mark, limit)
+    return schemas.RentalChangesOut(
+        items=[schemas.AvailabilityChange(item_id=i, available=a) for i, a in items],
+        watermark=crud.format_watermark(mark),
+        watermark_at=mark[2],
+        has_more=has_more,
+    )
 
 
 # ────────────── devolución ────────────────────────────────────────────────
@@ -53,7 +79,7 @@ async def return_item(
 
 # ────────────── helper común ──────────────────────────────────────────────
 import httpx
-from app.core.config import settings
+from app.crud.rental import fetch_items
 from app.schemas.rental import ItemSnapshot
 
 
@@ -62,21 +88,29 @@ async def _with_item(rental) -> schemas.RentalOut:
     Añade el snapshot del item a la salida para que el front no
     necesite hacer otra llamada.
     """
-    url = f"{settings.CATALOG_API_BASE}/items/{rental.item_id}"
-    async with httpx.AsyncClient() as client:
-        item_json = {}
+    return (await _with_items([rental]))[0]
+
+
+async def _with_items(rentals) -> List[schemas.RentalOut]:
+    """Como `_with_item`, pero con una sola llamada batch al catálogo."""
+    items: dict[int, dict] = {}
+    if rentals:
         try:
-            r = await client.get(url, timeout=5.0)
-            if r.status_code == 200:
-                item_json = r.json()
+            items = await fetch_items([r.item_id for r in rentals])
         except httpx.HTTPError:
             pass
 
-    return schemas.RentalOut(
-        **rental.__dict__,
-        item=ItemSnapshot(**item_json) if item_json else ItemSnapshot(
-            id=rental.item_id,
-            name="Desconocido",
-            price_per_h=0,
-        ),
-    )
+    out = []
+    for rental in rentals:
+        item_json = items.get(rental.item_id)
+        out.append(
+            schemas.RentalOut(
+                **rental.__dict__,
+                item=ItemSnapshot(**item_json) if item_json else ItemSnapshot(
+                    id=rental.item_id,
+                    name="Desconocido",
+                    price_per_h=0,
+                ),
+            )
+        )
+    return out
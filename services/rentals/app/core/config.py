@@ -5,7 +5,10 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     SECRET_KEY: str
     CATALOG_API_BASE: str           # p. ej. http://catalog:8000/api
+    CATALOG_BATCH_SIZE: int = 200   # ≤ ITEM_BATCH_MAX del catálogo
     ALGORITHM: str = "HS256"
+    # GET /api/rentals/changes (sincronización de `available` en el catálogo)
+    CHANGES_LIMIT_MAX: int = 5000
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
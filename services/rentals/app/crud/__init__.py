@@ -1,12 +1,18 @@
 from .rental import (
     create_rental,
+    format_watermark,
+    get_availability_changes,
     get_rental,
     get_rentals_by_user,
     mark_returned,
+    parse_watermark,
 )
 __all__ = [
     "create_rental",
     "get_rental",
     "get_rentals_by_user",
     "mark_returned",
+    "format_watermark",
+    "get_availability_changes",
+    "parse_watermark",
 ]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import math
+from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
-from typing import List
+from typing import List, Optional, Tuple
 
 import httpx
+from sqlalchemy import and_, func, or_, select, text, tuple_
 from sqlalchemy.orm import Session
 
 from app.models.models import Rental, RentalStatus          # ← enum importado
@@ -25,6 +27,23 @@ async def _fetch_item(item_id: int) -> dict:
         return r.json()
 
 
+async def fetch_items(item_ids: list[int]) -> dict[int, dict]:
+    """
+    Varios ítems del **Catalog** con `GET /items/batch` (una llamada por
+    lote de `CATALOG_BATCH_SIZE`).  Los inexistentes no aparecen.
+    """
+    ids = list(dict.fromkeys(item_ids))
+    found: dict[int, dict] = {}
+    url = f"{settings.CATALOG_API_BASE}/items/batch"
+    async with httpx.AsyncClient() as client:
+        for i in range(0, len(ids), settings.CATALOG_BATCH_SIZE):
+            chunk = ids[i : i + settings.CATALOG_BATCH_SIZE]
+            r = await client.get(url, params={"ids": ",".join(map(str, chunk))}, timeout=5.0)
+            r.raise_for_status()
+            found.update({item["id"]: item for item in r.json()["items"]})
+    return found
+
+
 def _calc_deposit(hours: float, price: float) -> float:
     """
     Depósito = 120 % del coste estimado (redondeo a 2 decimales).
@@ -33,6 +52,28 @@ def _calc_deposit(hours: float, price: float) -> float:
     return float(raw.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
 
 
+def _active(item_ids):
+    """Alquileres sin devolver de `item_ids` (el ítem está ocupado)."""
+    return select(Rental.item_id).where(
+        Rental.item_id.in_(item_ids),
+        Rental.status != RentalStatus.returned,
+    )
+
+
+def _in_progress(item_ids, now: datetime):
+    """Alquileres de `item_ids` en curso a la hora `now` (sin devolver)."""
+    return select(Rental.item_id).where(
+        Rental.item_id.in_(item_ids),
+        Rental.status != RentalStatus.returned,
+        Rental.start_at <= now,
+        Rental.end_at > now,
+    )
+
+
+# espacio de pg_advisory_xact_lock(clave, item_id) para crear alquileres
+_RENT_LOCK = 0x52454E54                          # "RENT"
+
+
 # ───────── CRUD público ───────────────────────────────────────────────────
 async def create_rental(
     db: Session,
@@ -41,7 +82,13 @@ async def create_rental(
 ) -> Rental:
     item = await _fetch_item(rent_in.item_id)            # -- HTTP → Catalog
 
-    if not item["available"]:
+    # `available` del catálogo va unos segundos por detrás (ver
+    # get_availability_changes): la BD de alquileres tiene la última palabra.
+    # El bloqueo por ítem (hasta el commit) serializa comprobación e INSERT:
+    # dos peticiones simultáneas no pueden pasar ambas la comprobación
+    db.execute(select(func.pg_advisory_xact_lock(_RENT_LOCK, rent_in.item_id)))
+    if not item["available"] or db.scalar(_active([rent_in.item_id]).limit(1)) is not None:
+        db.rollback()
         raise ValueError("Ítem no disponible")
 
     hours = (rent_in.end_at - rent_in.start_at).total_seconds() / 3600
@@ -74,3 +121,85 @@ def mark_returned(db: Session, rental: Rental) -> Rental:
     db.commit()
     db.refresh(rental)
     return rental
+
+
+# ───────── feed de disponibilidad para el catálogo ───────────────────────
+# (change_xid, id) del último alquiler leído + hora de la última pasada
+# completa (None hasta terminar la primera)
+Watermark = Tuple[int, int, Optional[datetime]]
+
+# transacciones terminadas: todas las de xid menor que el xmin del snapshot
+_SNAPSHOT = text(
+    "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint, timezone('utc', now())"
+)
+
+
+def format_watermark(mark: Watermark) -> str:
+    xid, rental_id, clock = mark
+    return f"{xid},{rental_id},{clock.isoformat() if clock else ''}"
+
+
+def parse_watermark(raw: str) -> Optional[Watermark]:
+    parts = raw.split(",", 2)
+    if len(parts) == 2:
+        # marca antigua (updated_at,id): el feed es idempotente, se empieza de cero
+        return None
+    try:
+        xid, rental_id, clock = parts
+        return int(xid), int(rental_id), datetime.fromisoformat(clock) if clock else None
+    except ValueError:
+        raise ValueError("Marca de agua no válida") from None
+
+
+def get_availability_changes(
+    db: Session, after: Optional[Watermark], limit: int
+) -> Tuple[List[Tuple[int, bool]], Watermark, bool]:
+    """
+    Disponibilidad actual de los ítems con alquileres creados o cambiados
+    después de `after`, y —al terminar de leer esos cambios— de los que
+    tienen un alquiler que empezó o terminó desde la hora de la marca:
+    ([(item_id, disponible)], nueva marca, hay más).  Ocupado = un alquiler
+    sin devolver con ``start_at <= ahora < end_at``.
+
+    Devuelve el estado, no el evento: aplicar dos veces el mismo lote no
+    cambia nada.  Las filas se recorren por ``change_xid`` (la transacción
+    que las escribió) y sólo hasta el xmin del snapshot: las transacciones
+    anteriores ya terminaron, así que ninguna confirma después una fila
+    por detrás de la marca.  Una transacción larga retiene el feed, pero
+    no le hace perder filas.
+    """
+    after_xid, after_id, since = after or (0, 0, None)
+    horizon, now = db.execute(_SNAPSHOT).one()
+
+    q = select(Rental.id, Rental.item_id, Rental.change_xid).where(
+        Rental.change_xid < horizon,
+        tuple_(Rental.change_xid, Rental.id) > tuple_(after_xid, after_id),
+    )
+    rows = db.execute(q.order_by(Rental.change_xid, Rental.id).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    item_ids = {r.item_id for r in rows}
+    if rows:
+        after_xid, after_id = rows[-1].change_xid, rows[-1].id
+
+    if not has_more:
+        # pasada completa: también los que empezaron o terminaron por la hora
+        if since is not None:
+            crossed = or_(
+                and_(Rental.start_at > since, Rental.start_at <= now),
+                and_(Rental.end_at > since, Rental.end_at <= now),
+            )
+            item_ids.update(
+                db.scalars(
+                    select(Rental.item_id)
+                    .where(Rental.status != RentalStatus.returned, crossed)
+                    .distinct()
+                )
+            )
+        since = now
+
+    mark = (after_xid, after_id, since)
+    if not item_ids:
+        return [], mark, has_more
+    busy = set(db.scalars(_in_progress(sorted(item_ids), now).distinct()))
+    return [(i, i not in busy) for i in sorted(item_ids)], mark, has_more
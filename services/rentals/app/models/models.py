@@ -4,10 +4,13 @@ from __future__ import annotations
 import datetime
 import enum
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    FetchedValue,
     Float,
+    Index,
     Integer,
     String,
 )
@@ -44,3 +47,20 @@ class Rental(Base):
         nullable=False,
     )
     returned = Column(Boolean, default=False)
+
+    # transacción que escribió la fila por última vez (trigger, migración
+    # 0003): orden de commit para el feed GET /api/rentals/changes
+    change_xid = Column(
+        BigInteger,
+        nullable=False,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+
+    __table_args__ = (
+        # recorrido por (change_xid, id) > marca de agua
+        Index("ix_rentals_change_xid_id", "change_xid", "id"),
+        # alquileres que empiezan / terminan entre dos lecturas del feed
+        Index("ix_rentals_start_at", "start_at"),
+        Index("ix_rentals_end_at", "end_at"),
+    )
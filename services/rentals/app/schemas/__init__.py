@@ -1,2 +1,2 @@
-from .rental import RentalCreate, RentalOut
-__all__ = ["RentalCreate", "RentalOut"]
+from .rental import AvailabilityChange, RentalChangesOut, RentalCreate, RentalOut
+__all__ = ["AvailabilityChange", "RentalChangesOut", "RentalCreate", "RentalOut"]
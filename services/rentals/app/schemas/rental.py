@@ -34,3 +34,16 @@ class RentalOut(RentalCreate):
     status: Literal["pending", "confirmed", "returned"]
     renter_username: str
     item: ItemSnapshot
+
+
+# ───────── feed de disponibilidad (GET /api/rentals/changes) ─────────────
+class AvailabilityChange(BaseModel):
+    item_id: int
+    available: bool
+
+
+class RentalChangesOut(BaseModel):
+    items: list[AvailabilityChange]
+    watermark: str | None            # `after` de la siguiente llamada
+    watermark_at: datetime | None    # hora (UTC) hasta la que `available` está al día
+    has_more: bool
@@ -0,0 +1,36 @@
+"""rentals.updated_at – feed de cambios para el catálogo
+
+Revision ID: 20250724_0002
+Revises: 20250714_0001
+Create Date: 2025‑07‑24 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# ─────────── Meta ───────────
+revision: str = "20250724_0002"
+down_revision: str | None = "20250714_0001"
+branch_labels: tuple | None = None
+depends_on: tuple | None = None
+
+
+# ─────────── Upgrade ────────
+def upgrade() -> None:
+    # las filas existentes quedan con la hora de la migración: el catálogo
+    # las procesa todas en su primera sincronización
+    op.add_column(
+        "rentals",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index("ix_rentals_updated_at_id", "rentals", ["updated_at", "id"])
+
+
+# ─────────── Downgrade ──────
+def downgrade() -> None:
+    op.drop_index("ix_rentals_updated_at_id", table_name="rentals")
+    op.drop_column("rentals", "updated_at")
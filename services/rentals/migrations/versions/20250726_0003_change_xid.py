@@ -0,0 +1,64 @@
+"""rentals.change_xid – feed de cambios por orden de commit
+
+Sustituye a `updated_at` (0002): ``now()`` es la hora de *inicio* de la
+transacción, así que una que confirmaba tarde podía quedar detrás de una
+marca ya entregada.  Un trigger guarda el xid de la transacción que
+escribe la fila y el feed sólo lee hasta el xmin del snapshot.
+
+Revision ID: 20250726_0003
+Revises: 20250724_0002
+Create Date: 2025‑07‑26 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# ─────────── Meta ───────────
+revision: str = "20250726_0003"
+down_revision: str | None = "20250724_0002"
+branch_labels: tuple | None = None
+depends_on: tuple | None = None
+
+
+# ─────────── Upgrade ────────
+def upgrade() -> None:
+    # las filas existentes quedan con el xid de la migración: el catálogo
+    # las procesa todas en su primera sincronización
+    op.add_column("rentals", sa.Column("change_xid", sa.BigInteger(), nullable=True))
+    op.execute("UPDATE rentals SET change_xid = pg_current_xact_id()::text::bigint")
+    op.alter_column("rentals", "change_xid", nullable=False)
+    op.execute(
+        """
+        CREATE FUNCTION rentals_change_xid() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_xid := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER rentals_change_xid BEFORE INSERT OR UPDATE ON rentals "
+        "FOR EACH ROW EXECUTE FUNCTION rentals_change_xid()"
+    )
+    op.create_index("ix_rentals_change_xid_id", "rentals", ["change_xid", "id"])
+    op.create_index("ix_rentals_start_at", "rentals", ["start_at"])
+    op.create_index("ix_rentals_end_at", "rentals", ["end_at"])
+
+    op.drop_index("ix_rentals_updated_at_id", table_name="rentals")
+    op.drop_column("rentals", "updated_at")
+
+
+# ─────────── Downgrade ──────
+def downgrade() -> None:
+    op.add_column(
+        "rentals",
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_rentals_updated_at_id", "rentals", ["updated_at", "id"])
+
+    op.drop_index("ix_rentals_end_at", table_name="rentals")
+    op.drop_index("ix_rentals_start_at", table_name="rentals")
+    op.drop_index("ix_rentals_change_xid_id", table_name="rentals")
+    op.execute("DROP TRIGGER rentals_change_xid ON rentals")
+    op.execute("DROP FUNCTION rentals_change_xid()")
+    op.drop_column("rentals", "change_xid")